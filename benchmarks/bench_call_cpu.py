@@ -0,0 +1,132 @@
+"""
+Client CPU per call against the local stand-in server.
+
+In ``http`` mode the server runs in a subprocess, so ``time.process_time`` only counts the client:
+building the request, the HTTP stack, decoding and validation. In ``in-process`` mode the stand-in
+backend answers through ``InProcessTransport`` once per URL and its responses are then served from
+memory, so what remains is the client's own request path, without the HTTP stack. Results can be
+saved and compared like ``bench_suite.py``.
+
+    python benchmarks/bench_call_cpu.py --save before.json
+    python benchmarks/bench_call_cpu.py --compare before.json
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+import requests
+
+from nobipy import Nobitex
+from nobipy.testing import InProcessTransport, StandInBackend
+
+
+TOKEN = 'stand-in-token'
+
+ENDPOINTS = {
+    'orderbook': lambda client: client.orderbook('BTCIRT'),
+    'market_stats': lambda client: client.market_stats('btc', 'rls'),
+    'ohlc': lambda client: client.ohlc('BTCIRT', 60, 1600000000, 1600000600),
+    'order_status': lambda client: client.order_status(1),
+    'open_orders': lambda client: client.open_orders(),
+    'balance': lambda client: client.balance('rls'),
+    'create_order': lambda client: client.create_order('buy', 'limit', 'btc', 'rls', '0.01', 1_000_000_000),
+}
+
+
+class _MemoizedTransport(InProcessTransport):
+    def __init__(self, backend) -> None:
+        super().__init__(backend)
+        self.responses = {}
+
+    def send(self, method: str, url: str, **kwargs) -> requests.Response:
+        key = (method, url)
+        if key not in self.responses:
+            self.responses[key] = super().send(method, url, **kwargs)
+        cached = self.responses[key]
+        response = requests.Response()
+        response.status_code = cached.status_code
+        response.url = url
+        response.headers = cached.headers
+        response._content = cached.content
+        return response
+
+
+def _start_server() -> tuple:
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'nobipy.testing', '--port', '0', '--levels', '5', '--trades', '5', '--seed', '1'],
+        stdout=subprocess.PIPE, universal_newlines=True,
+    )
+    url = process.stdout.readline().strip()
+    if not url:
+        process.kill()
+        raise RuntimeError('stand-in server did not start')
+    return process, url
+
+
+def _measure(client: Nobitex, mode: str, number: int, repeat: int, results: dict) -> None:
+    client.create_order('buy', 'limit', 'btc', 'rls', '0.01', 1_000_000_000)
+    for name, call in ENDPOINTS.items():
+        for _ in range(50):
+            call(client)
+        best = None
+        for _ in range(repeat):
+            started = time.process_time()
+            for _ in range(number):
+                call(client)
+            elapsed = (time.process_time() - started) / number
+            best = elapsed if best is None else min(best, elapsed)
+        key = f'{name}/{mode}'
+        results[key] = best * 1e6
+        print(f'{key:<26} {results[key]:>10.1f}', flush=True)
+
+
+def run(modes: list, number: int, repeat: int) -> dict:
+    results = {}
+
+    if 'in-process' in modes:
+        backend = StandInBackend(levels=5, trades=5, seed=1)
+        _measure(Nobitex(TOKEN, transport=_MemoizedTransport(backend)), 'in-process', number, repeat, results)
+
+    if 'http' in modes:
+        process, url = _start_server()
+        try:
+            with Nobitex(TOKEN, base_url=url) as client:
+                _measure(client, 'http', number, repeat, results)
+        finally:
+            process.terminate()
+            process.wait()
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-n', '--number', type=int, default=1000, help='calls per repetition')
+    parser.add_argument('-r', '--repeat', type=int, default=5, help='repetitions, the best is kept')
+    parser.add_argument('-m', '--modes', nargs='+', choices=('in-process', 'http'), default=['in-process', 'http'])
+    parser.add_argument('--save', help='write results to this file')
+    parser.add_argument('--compare', help='compare against saved results')
+    args = parser.parse_args()
+
+    print(f'{"benchmark":<26} {"cpu us":>10}')
+    results = run(args.modes, args.number, args.repeat)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print()
+        print(f'{"benchmark":<26} {"cpu us":>10} {"base":>10} {"delta":>8}')
+        for key, value in results.items():
+            if key in baseline:
+                print(f'{key:<26} {value:>10.1f} {baseline[key]:>10.1f} {value / baseline[key] - 1:>+8.1%}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""
+Micro-benchmark: decode-twice (``response.json()`` in both validation and return) against the
+parse-once pipeline, for every installed decoder, over realistic payload sizes.
+
+    python benchmarks/bench_decode.py
+"""
+
+import json
+import random
+import timeit
+
+import requests
+
+from nobipy import Nobitex
+from nobipy.decoders import get_decoder
+
+
+def _orderbook(levels: int) -> dict:
+    mid = 1_500_000_000
+    return {
+        'status': 'ok',
+        'lastUpdate': 1650000000000,
+        'asks': [[str(mid + i * 10_000), f'{random.random():.6f}'] for i in range(levels)],
+        'bids': [[str(mid - i * 10_000), f'{random.random():.6f}'] for i in range(levels)],
+    }
+
+
+def _trades(count: int) -> dict:
+    return {
+        'status': 'ok',
+        'trades': [
+            {
+                'time': 1650000000000 - i * 1000,
+                'price': str(1_500_000_000 + random.randint(-100, 100) * 10_000),
+                'volume': f'{random.random():.6f}',
+                'type': random.choice(('buy', 'sell')),
+            }
+            for i in range(count)
+        ],
+    }
+
+
+def _global_stats(exchanges: int, currencies: int) -> dict:
+    return {
+        'status': 'ok',
+        'markets': {
+            f'exchange{e}': {f'coin{c}': f'{random.random() * 1000:.4f}' for c in range(currencies)}
+            for e in range(exchanges)
+        },
+    }
+
+
+PAYLOADS = {
+    'orderbook (50 levels)': _orderbook(50),
+    'orderbook (500 levels)': _orderbook(500),
+    'trades (500)': _trades(500),
+    'global_stats (10x200)': _global_stats(10, 200),
+}
+
+
+def _response(body: bytes) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response.url = 'http://localhost/'
+    response._content = body
+    response.encoding = 'utf-8'
+    return response
+
+
+def _decode_twice(response: requests.Response):
+    response.json()['status'].lower()
+    return response.json()
+
+
+def main():
+    decoders = {}
+    for name in ('json', 'simplejson', 'orjson', 'ujson'):
+        try:
+            decoders[name] = get_decoder(name)
+        except ImportError:
+            pass
+
+    print(f'{"payload":<24} {"size KiB":>9}  {"mode":<20} {"us/call":>10}')
+    for label, payload in PAYLOADS.items():
+        body = json.dumps(payload).encode()
+        response = _response(body)
+        number = max(20, 2_000_000 // len(body))
+
+        rows = [('decode twice', lambda: _decode_twice(response))]
+        for name, decoder in decoders.items():
+            rows.append((
+                f'once ({name})',
+                lambda decoder=decoder: Nobitex._raise_for_exception(response, 'bench', {}, decoder),
+            ))
+
+        for mode, fn in rows:
+            elapsed = min(timeit.repeat(fn, number=number, repeat=3)) / number
+            print(f'{label:<24} {len(body) / 1024:>9.1f}  {mode:<20} {elapsed * 1e6:>10.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""
+Throughput of the simulated exchange: orders per second placed directly on the engine, and through
+``Nobitex`` with the in-process transport (no socket, so the difference is the client's own cost).
+
+Order flow is a random mix of limit orders around a mid price (about half of them crossing), market
+orders and cancels, against seeded liquidity.
+
+    python benchmarks/bench_exchange.py
+"""
+
+import random
+import time
+
+from nobipy import Nobitex
+from nobipy.exceptions import InvalidResponseExceptions
+from nobipy.testing import InProcessTransport, SimulatedExchange
+
+
+MID = 1_000_000_000
+
+
+def _exchange() -> SimulatedExchange:
+    exchange = SimulatedExchange({'rls': 1e18, 'btc': 1e9})
+    exchange.seed_liquidity('btc', 'rls', MID, levels=50, step=0.0005, amount=5)
+    return exchange
+
+
+def _flow(count: int, seed: int = 1) -> list:
+    rng = random.Random(seed)
+    flow = []
+    for _ in range(count):
+        roll = rng.random()
+        side = rng.choice(('buy', 'sell'))
+        if roll < 0.85:
+            price = round(MID * rng.uniform(0.995, 1.005), -3)
+            flow.append(('limit', side, f'{rng.uniform(0.001, 0.5):.4f}', price))
+        elif roll < 0.95:
+            flow.append(('market', side, f'{rng.uniform(0.001, 0.1):.4f}', MID * (1.01 if side == 'buy' else 0.99)))
+        else:
+            flow.append(('cancel', None, None, None))
+    return flow
+
+
+def bench_engine(flow: list) -> float:
+    exchange = _exchange()
+    ids = []
+    started = time.perf_counter()
+    for execution, side, amount, price in flow:
+        if execution == 'cancel':
+            if ids:
+                exchange.cancel('default', ids.pop())
+            continue
+        order = exchange.place('default', side, execution, 'btc', 'rls', amount, price)['order']
+        if order['status'] == 'Active':
+            ids.append(order['id'])
+    return len(flow) / (time.perf_counter() - started)
+
+
+def bench_client(flow: list) -> float:
+    client = Nobitex('stand-in-token', transport=InProcessTransport(_exchange()))
+    ids = []
+    started = time.perf_counter()
+    for execution, side, amount, price in flow:
+        if execution == 'cancel':
+            if ids:
+                try:
+                    client.update_status(ids.pop(), 'cancel')
+                except InvalidResponseExceptions:
+                    pass  # filled in the meantime
+            continue
+        order = client.create_order(side, execution, 'btc', 'rls', amount, price)['order']
+        if order['status'] == 'Active':
+            ids.append(order['id'])
+    return len(flow) / (time.perf_counter() - started)
+
+
+def main():
+    flow = _flow(100_000)
+    print(f'{"path":<24} {"orders/s":>10}')
+    print(f'{"engine":<24} {bench_engine(flow):>10.0f}')
+    print(f'{"Nobitex in-process":<24} {bench_client(flow[:20_000]):>10.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+Micro-benchmark: per-call client overhead with metrics disabled and enabled.
+
+The transport is an in-process stub returning a prepared response, so the numbers are the client's
+own CPU time per call (request building, validation, decoding and metric recording).
+
+The cost of the disabled hooks is measured against a checkout without them: pass its ``src``
+directory as ``--baseline``, e.g. the commit before metrics were added in a worktree. Both sides then
+run ``trades`` with metrics disabled in alternating subprocesses, and the best runs are compared.
+
+    python benchmarks/bench_metrics.py
+    git worktree add /tmp/nobipy-base <commit> && python benchmarks/bench_metrics.py --baseline /tmp/nobipy-base/src
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import timeit
+
+import requests
+
+import nobipy
+from nobipy import Nobitex
+
+
+BODY = json.dumps({
+    'status': 'ok',
+    'trades': [
+        {'time': 1650000000000 - i, 'price': '1500000000', 'volume': '0.01', 'type': 'buy'} for i in range(10)
+    ],
+}).encode()
+
+
+class StubTransport:
+    def send(self, method: str, url: str, **kwargs) -> requests.Response:
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response._content = BODY
+        return response
+
+    def close(self) -> None:
+        pass
+
+
+def _per_call(client: Nobitex, number: int, repeat: int) -> float:
+    client.trades('BTCIRT')
+    return min(timeit.repeat(lambda: client.trades('BTCIRT'), number=number, repeat=repeat)) / number
+
+
+def _disabled_in(src: str, number: int, repeat: int) -> float:
+    # Seconds per call of a client without metrics, imported from ``src``.
+    output = subprocess.run(
+        [sys.executable, __file__, '--worker', '-n', str(number), '-r', str(repeat)],
+        env=dict(os.environ, PYTHONPATH=src), stdout=subprocess.PIPE, check=True, universal_newlines=True,
+    ).stdout
+    return float(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-n', '--number', type=int, default=50_000, help='calls per repetition')
+    parser.add_argument('-r', '--repeat', type=int, default=5, help='repetitions, the best is kept')
+    parser.add_argument('--baseline', help='src directory of a checkout without metrics')
+    parser.add_argument('--rounds', type=int, default=5, help='alternating subprocess rounds with --baseline')
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(_per_call(Nobitex(transport=StubTransport()), args.number, args.repeat))
+        return
+
+    # Not at the top: workers may import a baseline without metrics.
+    from nobipy import Metrics
+
+    clients = {
+        'metrics disabled': Nobitex(transport=StubTransport()),
+        'metrics enabled': Nobitex(transport=StubTransport(), metrics=Metrics()),
+    }
+
+    print(f'{"mode":<24} {"us/call":>10}')
+    results = {}
+    for mode, client in clients.items():
+        results[mode] = _per_call(client, args.number, args.repeat)
+        print(f'{mode:<24} {results[mode] * 1e6:>10.2f}')
+
+    delta = results['metrics enabled'] - results['metrics disabled']
+    print(f'enabled overhead: {delta * 1e6:+.2f} us/call ({delta / results["metrics disabled"] * 100:+.1f}%)')
+
+    if args.baseline:
+        current = os.path.dirname(os.path.dirname(os.path.abspath(nobipy.__file__)))
+        base, head = [], []
+        for _ in range(args.rounds):
+            base.append(_disabled_in(args.baseline, args.number, args.repeat))
+            head.append(_disabled_in(current, args.number, args.repeat))
+        base, head = min(base), min(head)
+        print(f'{"baseline (no metrics)":<24} {base * 1e6:>10.2f}')
+        print(f'{"metrics disabled":<24} {head * 1e6:>10.2f}')
+        print(f'disabled overhead: {(head - base) * 1e6:+.2f} us/call ({(head - base) / base * 100:+.1f}%)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""
+Memory benchmark: raw decoded dicts against materialized ``__slots__`` models.
+
+    python benchmarks/bench_models.py -n 50000
+"""
+
+import argparse
+import json
+import random
+import tracemalloc
+
+from nobipy.models import ModelList, Order, Trade
+
+
+def _trade(i: int) -> dict:
+    return {
+        'time': 1650000000000 - i * 1000,
+        'price': str(1_500_000_000 + random.randint(-100, 100) * 10_000),
+        'volume': f'{random.random():.6f}',
+        'type': random.choice(('buy', 'sell')),
+    }
+
+
+def _order(i: int) -> dict:
+    return {
+        'id': 1_000_000 + i, 'type': 'buy', 'execution': 'Limit', 'srcCurrency': 'Bitcoin',
+        'dstCurrency': '﷼', 'market': 'BTC-RLS', 'price': '1500000000', 'amount': '0.01',
+        'totalPrice': '15000000', 'matchedAmount': '0', 'unmatchedAmount': '0.01',
+        'averagePrice': '0', 'fee': '0', 'status': 'Active', 'partial': False,
+        'created_at': '2022-04-15T08:00:00.000000+00:00',
+    }
+
+
+def _measure(body: bytes, model=None) -> int:
+    tracemalloc.start()
+    items = json.loads(body)
+    if model is not None:
+        items = ModelList(items, model).materialize()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del items
+    return current
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-n', type=int, default=50_000)
+    args = parser.parse_args()
+
+    print(f'{"kind":<8} {"count":>8} {"dicts MiB":>10} {"models MiB":>11} {"ratio":>6}')
+    for label, factory, model in (('trades', _trade, Trade), ('orders', _order, Order)):
+        body = json.dumps([factory(i) for i in range(args.n)]).encode()
+        raw = _measure(body)
+        compact = _measure(body, model)
+        print(f'{label:<8} {args.n:>8} {raw / 2 ** 20:>10.2f} {compact / 2 ** 20:>11.2f} {raw / compact:>6.2f}')
+
+
+if __name__ == '__main__':
+    main()
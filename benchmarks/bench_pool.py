@@ -0,0 +1,60 @@
+"""
+Throughput of ``NobitexPool`` with many accounts against the simulated exchange behind the local
+stand-in server, for a growing number of threads.
+
+Every account holds a different rial balance, so each ``balance`` answer shows which token the
+request carried; any answer belonging to another account is counted as a mix-up.
+
+    python benchmarks/bench_pool.py --accounts 50 --latency 0.005
+"""
+
+import argparse
+import time
+
+from nobipy import NobitexPool
+from nobipy.testing import SimulatedExchange, StandInServer
+
+
+def _exchange(accounts: int) -> SimulatedExchange:
+    exchange = SimulatedExchange()
+    for i in range(accounts):
+        exchange.add_account(f'sub-{i}', f'token-{i}', {'rls': 1000 * (i + 1)})
+    return exchange
+
+
+def _measure(url: str, accounts: int, threads: int, calls: int) -> tuple:
+    tokens = {f'sub-{i}': f'token-{i}' for i in range(accounts)}
+    with NobitexPool(tokens, max_workers=threads, rate_limiter=False, base_url=url) as pool:
+        pool.map('balance', 'rls')
+        work = [(f'sub-{i % accounts}', 'balance', ('rls',)) for i in range(calls)]
+
+        started = time.perf_counter()
+        results = pool.run(work)
+        elapsed = time.perf_counter() - started
+
+    mixed = failed = 0
+    for (account_id, _, _), entry in zip(work, results):
+        if not entry.ok:
+            failed += 1
+        elif float(entry.result['balance']) != 1000 * (int(account_id.split('-')[1]) + 1):
+            mixed += 1
+    return calls / elapsed, mixed, failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-a', '--accounts', type=int, default=50, help='accounts')
+    parser.add_argument('-n', '--calls', type=int, default=2000, help='calls per thread count')
+    parser.add_argument('-t', '--threads', type=int, nargs='+', default=[1, 4, 16, 32], help='thread counts')
+    parser.add_argument('--latency', type=float, default=0.005, help='server delay per response in seconds')
+    args = parser.parse_args()
+
+    with StandInServer(_exchange(args.accounts), latency=args.latency) as server:
+        print(f'{"threads":>8} {"calls/s":>10} {"mixed":>6} {"failed":>6}')
+        for threads in args.threads:
+            rate, mixed, failed = _measure(server.url, args.accounts, threads, args.calls)
+            print(f'{threads:>8} {rate:>10.0f} {mixed:>6} {failed:>6}', flush=True)
+
+
+if __name__ == '__main__':
+    main()
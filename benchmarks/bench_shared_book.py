@@ -0,0 +1,69 @@
+"""
+Cost of getting the latest order book in a worker process: through the client (request, JSON decoding,
+array conversion) against ``SharedBook`` reading what a ``SharedBookPublisher`` wrote.
+
+The client side replays a recorded stand-in response with ``ReplayTransport``, so it pays no network
+time: the difference is the per-process decoding work that the publisher saves.
+
+    python benchmarks/bench_shared_book.py --levels 50
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from nobipy import Nobitex, RecordingTransport, ReplayTransport, SharedBook, SharedBookPublisher
+from nobipy.testing import InProcessTransport, StandInBackend
+
+
+def _timeit(fn, number: int, repeat: int) -> float:
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = (time.perf_counter() - started) / number
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-l', '--levels', type=int, default=50, help='order book levels per side')
+    parser.add_argument('-n', '--number', type=int, default=5000, help='reads per repetition')
+    parser.add_argument('-r', '--repeat', type=int, default=5, help='repetitions, the best is kept')
+    args = parser.parse_args()
+
+    backend = StandInBackend(levels=args.levels, trades=100, seed=1)
+    path = os.path.join(tempfile.mkdtemp(), 'orderbook.rec')
+    with Nobitex(transport=RecordingTransport(path, InProcessTransport(backend))) as client:
+        client.orderbook('BTCIRT')
+
+    rows = []
+    with Nobitex(transport=ReplayTransport(path)) as client:
+        rows.append(('client orderbook', _timeit(lambda: client.orderbook('BTCIRT'), args.number, args.repeat)))
+        rows.append((
+            'client orderbook_snapshot',
+            _timeit(lambda: client.orderbook_snapshot('BTCIRT'), args.number, args.repeat),
+        ))
+
+    publisher_client = Nobitex(transport=InProcessTransport(backend))
+    with SharedBookPublisher(publisher_client, ['BTCIRT'], prefix='nobipy-bench', levels=args.levels) as publisher:
+        publisher.poll()
+        with SharedBook('BTCIRT', prefix='nobipy-bench') as book:
+            rows.append(('shared snapshot', _timeit(book.snapshot, args.number, args.repeat)))
+            rows.append(('shared best', _timeit(book.best, args.number, args.repeat)))
+            rows.append(('shared latest_trades', _timeit(book.latest_trades, args.number, args.repeat)))
+        payload = publisher_client.orderbook('BTCIRT')
+        rows.append(('publish_book', _timeit(
+            lambda: publisher.publish_book('BTCIRT', payload), args.number, args.repeat,
+        )))
+
+    print(f'{"read":<28} {"us":>10}')
+    for name, value in rows:
+        print(f'{name:<28} {value:>10.2f}')
+
+
+if __name__ == '__main__':
+    main()
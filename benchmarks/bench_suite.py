@@ -0,0 +1,204 @@
+"""
+Client benchmark suite against the local stand-in server (``python -m nobipy.testing``).
+
+Reports throughput and p50/p99 latency per endpoint, concurrency level and transport mode. Results
+can be saved as a baseline and later runs compared against it; a run that is slower than the baseline
+by more than ``--threshold`` exits with status 1.
+
+    python benchmarks/bench_suite.py --save baseline.json
+    python benchmarks/bench_suite.py --compare baseline.json --threshold 0.15
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from nobipy import AsyncNobitex, Nobitex
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None
+
+
+TOKEN = 'stand-in-token'
+
+# name -> call, shared by the sync and async clients (the async one returns a coroutine)
+ENDPOINTS = {
+    'orderbook': lambda client: client.orderbook('BTCIRT'),
+    'trades': lambda client: client.trades('BTCIRT'),
+    'market_stats': lambda client: client.market_stats(['btc', 'eth', 'usdt'], 'rls'),
+    'ohlc': lambda client: client.ohlc('BTCIRT', 60, 1600000000, 1600029940),
+    'open_orders': lambda client: client.open_orders(),
+    'user_wallets': lambda client: client.user_wallets(),
+    'create_order': lambda client: client.create_order('buy', 'limit', 'btc', 'rls', '0.01', 1_000_000_000),
+}
+
+
+def _percentile(values: list, q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _summary(latencies: list, elapsed: float) -> dict:
+    return {
+        'requests': len(latencies),
+        'throughput': len(latencies) / elapsed,
+        'p50_ms': _percentile(latencies, 0.50) * 1000,
+        'p99_ms': _percentile(latencies, 0.99) * 1000,
+    }
+
+
+def _run_sync(client: Nobitex, call, concurrency: int, requests_count: int) -> dict:
+    per_worker = max(1, requests_count // concurrency)
+
+    def worker():
+        latencies = []
+        for _ in range(per_worker):
+            started = time.perf_counter()
+            call(client)
+            latencies.append(time.perf_counter() - started)
+        return latencies
+
+    for _ in range(min(concurrency, 8)):
+        call(client)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = [future.result() for future in [executor.submit(worker) for _ in range(concurrency)]]
+    elapsed = time.perf_counter() - started
+
+    return _summary([latency for latencies in results for latency in latencies], elapsed)
+
+
+async def _run_async(url: str, call, concurrency: int, requests_count: int) -> dict:
+    per_worker = max(1, requests_count // concurrency)
+
+    async with AsyncNobitex(TOKEN, base_url=url, max_concurrency=concurrency) as client:
+        async def worker():
+            latencies = []
+            for _ in range(per_worker):
+                started = time.perf_counter()
+                await call(client)
+                latencies.append(time.perf_counter() - started)
+            return latencies
+
+        await call(client)
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return _summary([latency for latencies in results for latency in latencies], elapsed)
+
+
+def _start_server(latency: float) -> tuple:
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'nobipy.testing', '--port', '0', '--latency', str(latency), '--seed', '1'],
+        stdout=subprocess.PIPE, universal_newlines=True,
+    )
+    url = process.stdout.readline().strip()
+    if not url:
+        process.kill()
+        raise RuntimeError('stand-in server did not start')
+    return process, url
+
+
+def run(args) -> dict:
+    process, url = _start_server(args.latency)
+    results = {}
+
+    modes = ['pooled', 'no-keepalive']
+    if aiohttp is not None:
+        modes.append('async')
+
+    try:
+        for mode in modes:
+            for concurrency in args.concurrency:
+                client = None
+                if mode != 'async':
+                    client = Nobitex(
+                        TOKEN, base_url=url, keep_alive=mode == 'pooled',
+                        pool_maxsize=max(10, concurrency),
+                    )
+                for name, call in ENDPOINTS.items():
+                    if args.endpoints and name not in args.endpoints:
+                        continue
+                    if mode == 'async':
+                        summary = asyncio.run(_run_async(url, call, concurrency, args.requests))
+                    else:
+                        summary = _run_sync(client, call, concurrency, args.requests)
+                    key = f'{name}/{mode}/c{concurrency}'
+                    results[key] = summary
+                    print(
+                        f'{name:<14} {mode:<13} {concurrency:>4} {summary["throughput"]:>10.0f} '
+                        f'{summary["p50_ms"]:>9.2f} {summary["p99_ms"]:>9.2f}',
+                        flush=True,
+                    )
+                if client is not None:
+                    client.close()
+    finally:
+        process.terminate()
+        process.wait()
+
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> bool:
+    print()
+    print(f'{"benchmark":<36} {"req/s":>9} {"base":>9} {"delta":>8}  {"p50 ms":>8} {"base":>8} {"delta":>8}')
+    regressed = False
+    for key, summary in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        throughput = summary['throughput'] / base['throughput'] - 1
+        p50 = summary['p50_ms'] / base['p50_ms'] - 1
+        flag = ''
+        if throughput < -threshold or p50 > threshold:
+            flag = '  REGRESSION'
+            regressed = True
+        print(
+            f'{key:<36} {summary["throughput"]:>9.0f} {base["throughput"]:>9.0f} {throughput:>+8.1%}  '
+            f'{summary["p50_ms"]:>8.2f} {base["p50_ms"]:>8.2f} {p50:>+8.1%}{flag}'
+        )
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-n', '--requests', type=int, default=2000, help='requests per benchmark')
+    parser.add_argument('-c', '--concurrency', type=int, nargs='+', default=[1, 8, 32])
+    parser.add_argument('-e', '--endpoints', nargs='+', choices=sorted(ENDPOINTS), help='endpoints to run')
+    parser.add_argument('--latency', type=float, default=0.0, help='stand-in server latency in seconds')
+    parser.add_argument('--save', help='write results as a baseline to this file')
+    parser.add_argument('--compare', help='compare against a saved baseline')
+    parser.add_argument('--threshold', type=float, default=0.10, help='tolerated relative slowdown')
+    args = parser.parse_args()
+
+    print(f'{"endpoint":<14} {"mode":<13} {"conc":>4} {"req/s":>10} {"p50 ms":>9} {"p99 ms":>9}')
+    results = run(args)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'latency': args.latency,
+                'results': results,
+            }, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
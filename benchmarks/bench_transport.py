@@ -0,0 +1,81 @@
+"""
+Compare per-call ``requests.get`` against the pooled ``HTTPTransport``.
+
+Runs against a local keep-alive HTTP server by default, or against any URL given with ``--url``
+(e.g. ``https://api.nobitex.ir/v2/orderbook/BTCIRT`` to include real TCP + TLS setup).
+
+    python benchmarks/bench_transport.py -n 500
+"""
+
+import argparse
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from nobipy import HTTPTransport
+
+
+BODY = b'{"status": "ok", "asks": [["1", "1"]], "bids": [["1", "1"]], "lastUpdate": 1}'
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+def _measure(fn, url: str, n: int):
+    samples = []
+    for _ in range(n):
+        start = time.perf_counter()
+        fn(url).content
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return statistics.mean(samples), samples[len(samples) // 2], samples[int(len(samples) * 0.99) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-n', type=int, default=300)
+    parser.add_argument('--url', default=None)
+    args = parser.parse_args()
+
+    server = None
+    url = args.url
+    if url is None:
+        server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f'http://127.0.0.1:{server.server_address[1]}/v2/orderbook/BTCIRT'
+
+    transport = HTTPTransport()
+
+    modes = {
+        'per-call requests.get': lambda u: requests.get(u, timeout=5),
+        'pooled HTTPTransport': lambda u: transport.send('GET', u, timeout=5),
+    }
+
+    print(f'{"mode":<24} {"mean ms":>10} {"p50 ms":>10} {"p99 ms":>10}')
+    for name, fn in modes.items():
+        fn(url)
+        mean, p50, p99 = _measure(fn, url, args.n)
+        print(f'{name:<24} {mean * 1e3:>10.3f} {p50 * 1e3:>10.3f} {p99 * 1e3:>10.3f}')
+
+    transport.close()
+    if server is not None:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -2,7 +2,7 @@ from distutils.core import setup
 
 setup(
     name='nobipy',
-    packages=['nobipy'],
+    packages=['nobipy', 'nobipy.testing'],
     version='0.0.1',
     license='MIT',
     description='Nobitex cryptocurrency exchange python sdk',
@@ -14,6 +14,11 @@ setup(
         'requests',
         'simplejson',
     ],
+    extras_require={
+        'async': ['aiohttp'],
+        'fast': ['orjson'],
+        'numpy': ['numpy'],
+    },
     classifiers=[
         'Operating System :: OS Independent',
         'Topic :: Software Development :: Build Tools',
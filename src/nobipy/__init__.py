@@ -1,6 +1,24 @@
 from .main import Nobitex, get_token
+from .async_main import AsyncNobitex
+from .pool import NobitexPool
+from .snapshot import OrderbookSnapshot
+from .local_orderbook import LocalOrderBook
+from .cache import ResponseCache
+from .ratelimit import RateLimiter, TokenBucket, SharedTokenBucket
+from .retry import RetryPolicy
+from .batch import BatchEntry, BatchResult
+from .history import Candles, OHLCDownloader
+from .candle_store import CandleStore
+from .tape import TradeRingBuffer, TradeTapeRecorder
+from .shared_book import SharedBook, SharedBookPublisher
+from .market_series import MarketSeries, MarketStatsSampler
+from .metrics import Metrics
+from .tracing import RequestTrace, Tracer
+from .transport import HTTPTransport
+from .recording import RecordingTransport, ReplayTransport
 from . import exceptions
 from . import const
+from . import models
 
 
 __version__ = "0.0.1"
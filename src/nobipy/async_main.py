@@ -0,0 +1,1088 @@
+import asyncio
+import json
+import time
+import typing as t
+from datetime import datetime
+from collections import namedtuple
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None
+
+from .exceptions import *
+from .const import *
+from .main import Nobitex, _context
+from .decoders import Decoder, get_decoder
+from .models import build_models
+from .cache import MISSING, ResponseCache
+from .ratelimit import RateLimiter
+from .retry import RetryPolicy
+from .singleflight import AsyncSingleFlight
+from .snapshot import OrderbookSnapshot
+from .pagination import aiter_records
+from .batch import BatchResult, run_batch_async
+from .metrics import Metrics
+from .tracing import RequestTrace, Tracer
+from .endpoints import ENDPOINTS, Endpoint
+
+
+__all__ = [
+    'AsyncNobitex',
+]
+
+
+_Response = namedtuple('_Response', ('status_code', 'url', 'content'))
+
+
+class AsyncNobitex:
+    def __init__(
+            self, token: str = None, timeout: int = 5, max_concurrency: int = 100,
+            pool_maxsize: int = 100, pool_maxsize_per_host: int = 0, keep_alive: bool = True,
+            session: 'aiohttp.ClientSession' = None, decoder: t.Union[str, Decoder] = 'auto',
+            models: bool = False, cache: t.Union[bool, ResponseCache] = None, coalesce: bool = False,
+            rate_limiter: t.Union[bool, RateLimiter] = None, retry: t.Union[bool, RetryPolicy] = None,
+            metrics: t.Union[bool, Metrics] = None, tracer: Tracer = None, base_url: str = BASE_URL,
+    ) -> None:
+        """
+        Initialize an asyncio Nobitex API object.
+
+        Requires the optional ``aiohttp`` dependency (``pip install nobipy[async]``).
+
+        :param token: Token (Can be obtained from get_token()) (optional)
+        :type token: str
+
+        :param timeout: Timeout (optional)
+        :type timeout: int
+
+        :param max_concurrency: Maximum number of requests in flight at once (optional)
+        :type max_concurrency: int
+
+        :param pool_maxsize: Maximum number of pooled connections, 0 for unlimited (optional)
+        :type pool_maxsize: int
+
+        :param pool_maxsize_per_host: Maximum number of pooled connections per host, 0 for unlimited (optional)
+        :type pool_maxsize_per_host: int
+
+        :param keep_alive: Whether to reuse connections between requests (optional)
+        :type keep_alive: bool
+
+        :param session: Shared session; the pool options above are ignored when given (optional)
+        :type session: aiohttp.ClientSession
+
+        :param decoder: JSON decoder name ('auto', 'json', 'simplejson', 'orjson', 'ujson') or callable (optional)
+        :type decoder: str | callable
+
+        :param models: Return orders, trades, wallets and market stats as typed models (optional)
+        :type models: bool
+
+        :param cache: Cache for public market-data responses; True uses a default ResponseCache (optional)
+        :type cache: bool | ResponseCache
+
+        :param coalesce: Share one in-flight request between concurrent identical public GETs (optional)
+        :type coalesce: bool
+
+        :param rate_limiter: Client-side rate limiter; True uses a default RateLimiter (optional)
+        :type rate_limiter: bool | RateLimiter
+
+        :param retry: Retry policy for idempotent endpoints; True uses a default RetryPolicy (optional)
+        :type retry: bool | RetryPolicy
+
+        :param metrics: Per-endpoint metrics; True uses a new Metrics (optional)
+        :type metrics: bool | Metrics
+
+        :param tracer: Per-request phase tracing; a shared session needs ``tracer.trace_config()`` for network
+            phases (optional)
+        :type tracer: Tracer
+
+        :param base_url: API root, e.g. a local stand-in server (optional)
+        :type base_url: str
+
+        :return: None
+        """
+
+        if aiohttp is None:
+            raise ImportError('AsyncNobitex requires aiohttp | Try "pip install nobipy[async]"')
+
+        self.__base_url = base_url.rstrip('/')
+        self.__token = token
+        self.__timeout = timeout
+        self.__headers, self.__auth_headers = Nobitex._build_headers(token)
+
+        self.__max_concurrency = max_concurrency
+        self.__pool_maxsize = pool_maxsize
+        self.__pool_maxsize_per_host = pool_maxsize_per_host
+        self.__keep_alive = keep_alive
+
+        self.__session = session
+        self.__owns_session = session is None
+        self.__semaphore: t.Optional[asyncio.Semaphore] = None
+        self.__decoder = get_decoder(decoder)
+        self.__models = models
+        self.__cache = ResponseCache() if cache is True else (cache or None)
+        self.__flight = AsyncSingleFlight() if coalesce else None
+        self.__rate_limiter = RateLimiter() if rate_limiter is True else (rate_limiter or None)
+        self.__retry = RetryPolicy() if retry is True else (retry or None)
+        self.__metrics = Metrics() if metrics is True else (metrics or None)
+        self.__tracer = tracer
+
+    def set_token(self, token: str) -> str:
+        """
+        Set token
+
+        :param token: Token
+        :type token: str
+
+        :return: Token
+        :rtype: str
+        """
+
+        self.__headers, self.__auth_headers = Nobitex._build_headers(token)
+        self.__token = token
+        return self.__token
+
+    @property
+    def base_url(self) -> str:
+        """
+        API root
+
+        :return: Base URL
+        :rtype: str
+        """
+
+        return self.__base_url
+
+    @property
+    def cache(self) -> t.Optional[ResponseCache]:
+        """
+        Response cache for public endpoints
+
+        :return: Cache
+        :rtype: ResponseCache | None
+        """
+
+        return self.__cache
+
+    @property
+    def rate_limiter(self) -> t.Optional[RateLimiter]:
+        """
+        Client-side rate limiter
+
+        :return: Rate limiter
+        :rtype: RateLimiter | None
+        """
+
+        return self.__rate_limiter
+
+    @property
+    def retry(self) -> t.Optional[RetryPolicy]:
+        """
+        Retry policy
+
+        :return: Retry policy
+        :rtype: RetryPolicy | None
+        """
+
+        return self.__retry
+
+    @property
+    def metrics(self) -> t.Optional[Metrics]:
+        """
+        Per-endpoint metrics
+
+        :return: Metrics
+        :rtype: Metrics | None
+        """
+
+        return self.__metrics
+
+    @property
+    def tracer(self) -> t.Optional[Tracer]:
+        """
+        Request phase tracer
+
+        :return: Tracer
+        :rtype: Tracer | None
+        """
+
+        return self.__tracer
+
+    def _get_session(self) -> 'aiohttp.ClientSession':
+        """
+        Get the pooled session, creating it on the running event loop if needed.
+
+        :return: Session
+        :rtype: aiohttp.ClientSession
+        """
+
+        if self.__session is None or self.__session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.__pool_maxsize,
+                limit_per_host=self.__pool_maxsize_per_host,
+                force_close=not self.__keep_alive,
+            )
+            self.__session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.__timeout),
+                trace_configs=[self.__tracer.trace_config()] if self.__tracer is not None else None,
+            )
+            self.__owns_session = True
+
+        if self.__semaphore is None:
+            self.__semaphore = asyncio.Semaphore(self.__max_concurrency)
+
+        return self.__session
+
+    async def close(self) -> None:
+        """
+        Close pooled connections
+
+        :return: None
+        """
+
+        if self.__owns_session and self.__session is not None and not self.__session.closed:
+            await self.__session.close()
+        self.__session = None
+
+    async def __aenter__(self) -> 'AsyncNobitex':
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+    async def _request(
+            self, method: str, url: str, auth: bool = False,
+            params: t.Dict = None, data: t.Dict = None, json_data: t.Dict = None,
+            func_name: str = '_request', trace: RequestTrace = None,
+    ) -> _Response:
+        """
+        Make a request to the Nobitex API.
+
+        :param method: HTTP method
+        :type method: str
+
+        :param url: URL
+        :type url: str
+
+        :param auth: Whether to use authentication (optional)
+        :type auth: bool
+
+        :param params: Query parameters (optional)
+        :type params: dict
+
+        :param data: Request body (optional)
+        :type data: dict
+
+        :param json_data: Request body (optional)
+        :type json_data: dict
+
+        :param func_name: Function name (optional)
+        :type func_name: str
+
+        :param trace: Trace receiving the network phases (optional)
+        :type trace: RequestTrace
+
+        :return: Response with the body already read
+        :rtype: _Response
+        """
+
+        if auth is True:
+            headers = self.__auth_headers
+            if headers is None:
+                raise InvalidTokenExceptions(
+                    func_name, 'No token | Try setting via "set_token" method',
+                    _context(func_name, method=method, url=url),
+                )
+        else:
+            headers = self.__headers
+
+        if method != 'GET' and method != 'POST':
+            method = method.upper()
+            if method not in ('GET', 'POST'):
+                raise NobitexExceptions(func_name, 'Invalid method', _context(func_name, method=method, url=url))
+
+        session = self._get_session()
+
+        rate_limiter = self.__rate_limiter
+        if rate_limiter is not None:
+            if trace is not None:
+                waiting = time.perf_counter()
+            await rate_limiter.acquire_async(func_name)
+            if trace is not None:
+                trace.add('rate_limit', time.perf_counter() - waiting)
+
+        metrics = self.__metrics
+        bytes_out = 0
+        if metrics is not None and json_data is not None:
+            # Serialize here, as aiohttp would, so the request size is known.
+            data, json_data = json.dumps(json_data).encode(), None
+            bytes_out = len(data)
+
+        try:
+            async with self.__semaphore:
+                if metrics is not None:
+                    started = time.perf_counter()
+                async with session.request(
+                        method, self.__base_url + url, headers=headers, params=params, json=json_data, data=data,
+                        trace_request_ctx=trace,
+                ) as response:
+                    if trace is not None:
+                        trace.status_code = response.status
+                        reading = time.perf_counter()
+                    content = await response.read()
+                    if trace is not None:
+                        trace.add('download', time.perf_counter() - reading)
+                    if metrics is not None:
+                        metrics.observe_response(
+                            func_name, response.status, time.perf_counter() - started, bytes_out, len(content),
+                        )
+                    if rate_limiter is not None:
+                        rate_limiter.feedback(func_name, response.status, response.headers.get('Retry-After'))
+                    return _Response(response.status, str(response.url), content)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise RequestsExceptions(func_name, e, _context(func_name, method=method, url=url)) from e
+
+    def _process_response(
+            self,
+            response: _Response,
+            func_name: str = '_process_response',
+            additional: t.Dict = None,
+            trace: RequestTrace = None,
+    ) -> t.Dict:
+        """
+        Process the response from the Nobitex API.
+
+        Uses the same error mapping as ``Nobitex._raise_for_exception`` and decodes the body once.
+
+        :param response: Response
+        :type response: _Response
+
+        :param func_name: Function name (optional)
+        :type func_name: str
+
+        :param additional: Arguments (optional)
+        :type additional: dict
+
+        :param trace: Trace receiving the decode and validation phases (optional)
+        :type trace: RequestTrace
+
+        :raises: NobitexAPIException
+
+        :return: Response
+        :rtype: dict
+        """
+
+        return Nobitex._raise_for_exception(response, func_name, additional, self.__decoder, trace)
+
+    async def _call(
+            self, method: str, url: str, auth: bool = False,
+            params: t.Dict = None, data: t.Dict = None, json_data: t.Dict = None,
+            func_name: str = '_call', additional: t.Dict = None,
+    ) -> t.Dict:
+        """
+        Make a request and return the validated, decoded response.
+
+        Failed attempts are retried according to the retry policy. Unauthenticated requests are served from the
+        response cache when one is configured, and concurrent identical unauthenticated GETs share one in-flight
+        request when coalescing is enabled.
+
+        :param method: HTTP method
+        :type method: str
+
+        :param url: URL
+        :type url: str
+
+        :param auth: Whether to use authentication (optional)
+        :type auth: bool
+
+        :param params: Query parameters (optional)
+        :type params: dict
+
+        :param data: Request body (optional)
+        :type data: dict
+
+        :param json_data: Request body (optional)
+        :type json_data: dict
+
+        :param func_name: Function name (optional)
+        :type func_name: str
+
+        :param additional: Arguments (optional)
+        :type additional: dict
+
+        :raises: NobitexAPIException
+
+        :return: Response
+        :rtype: dict
+        """
+
+        cache = self.__cache
+        cacheable = cache is not None and not auth and cache.cacheable(func_name)
+        coalesce = self.__flight is not None and not auth and method == 'GET'
+        key = ResponseCache.make_key(func_name, method, url, params, json_data) if cacheable or coalesce else None
+
+        metrics = self.__metrics
+        tracer = self.__tracer
+
+        async def fetch() -> t.Dict:
+            retry = self.__retry
+            started = time.monotonic()
+            attempt = 0
+            while True:
+                trace = tracer.start(func_name, method, url) if tracer is not None else None
+                try:
+                    response = await self._request(method, url, auth, params, data, json_data, func_name, trace)
+                    result = self._process_response(response, func_name, additional, trace)
+                    if trace is not None:
+                        tracer.finish(trace)
+                    break
+                except NobitexExceptions as e:
+                    if trace is not None:
+                        tracer.fail(trace, e)
+                    if metrics is not None:
+                        metrics.observe_error(func_name, e)
+                    attempt += 1
+                    delay = retry.next_delay(func_name, attempt, e, started) if retry is not None else None
+                    if delay is None:
+                        raise
+                    if metrics is not None:
+                        metrics.observe_retry(func_name)
+                    await asyncio.sleep(delay)
+            if cacheable:
+                cache.set(key, result)
+            return result
+
+        r_json = cache.get(key) if cacheable else MISSING
+        if cacheable and metrics is not None:
+            metrics.observe_cache(func_name, r_json is not MISSING)
+
+        if r_json is MISSING:
+            if coalesce:
+                r_json = await self.__flight.do(key, fetch)
+            else:
+                r_json = await fetch()
+
+        if self.__models:
+            return build_models(func_name, r_json, additional)
+        return r_json
+
+    async def _invoke(self, endpoint: Endpoint, arguments: t.Dict) -> t.Dict:
+        """
+        Call a declared endpoint.
+
+        :param endpoint: Endpoint declaration
+        :type endpoint: Endpoint
+
+        :param arguments: Method arguments by name; also attached to exceptions
+        :type arguments: dict
+
+        :raises: NobitexAPIException
+
+        :return: Response
+        :rtype: dict
+        """
+
+        path, params, json_data = endpoint.build(arguments)
+        return await self._call(endpoint.method, path, endpoint.auth, params, None, json_data, endpoint.name, arguments)
+
+    async def orderbook(self, symbol: str) -> t.Dict[str, t.List]:
+        """
+        Get orderbook
+
+        :param symbol: Symbol
+        :type symbol: str
+
+        :return: Orderbook
+        :rtype: dict
+        """
+
+        return await self._invoke(ENDPOINTS['orderbook'], {'symbol': symbol})
+
+    async def orderbook_snapshot(self, symbol: str) -> OrderbookSnapshot:
+        """
+        Get orderbook as a numpy-backed snapshot
+
+        :param symbol: Symbol
+        :type symbol: str
+
+        :return: Orderbook snapshot
+        :rtype: OrderbookSnapshot
+        """
+
+        return OrderbookSnapshot.from_payload(await self.orderbook(symbol), symbol=symbol.upper())
+
+    async def trades(self, symbol: str) -> t.Dict:
+        """
+        Get orderbook
+
+        :param symbol: Symbol
+        :type symbol: str
+
+        :return: Orderbook
+        :rtype: dict
+        """
+
+        return await self._invoke(ENDPOINTS['trades'], {'symbol': symbol})
+
+    async def orderbooks(
+            self, symbols: t.Iterable[str], max_concurrency: int = 8, return_exceptions: bool = False,
+    ) -> t.Dict[str, t.Dict]:
+        """
+        Get orderbook of several symbols concurrently
+
+        :param symbols: Symbols
+        :type symbols: iterable
+
+        :param max_concurrency: Maximum concurrent requests (optional)
+        :type max_concurrency: int
+
+        :param return_exceptions: Map failed symbols to their exception instead of raising (optional)
+        :type return_exceptions: bool
+
+        :return: Orderbooks by symbol
+        :rtype: dict
+        """
+
+        symbols = [symbol.upper() for symbol in symbols]
+        results = await run_batch_async(self.orderbook, symbols, max_concurrency)
+        return results.to_mapping(symbols, return_exceptions)
+
+    async def trades_many(
+            self, symbols: t.Iterable[str], max_concurrency: int = 8, return_exceptions: bool = False,
+    ) -> t.Dict[str, t.Dict]:
+        """
+        Get trades of several symbols concurrently
+
+        :param symbols: Symbols
+        :type symbols: iterable
+
+        :param max_concurrency: Maximum concurrent requests (optional)
+        :type max_concurrency: int
+
+        :param return_exceptions: Map failed symbols to their exception instead of raising (optional)
+        :type return_exceptions: bool
+
+        :return: Trades by symbol
+        :rtype: dict
+        """
+
+        symbols = [symbol.upper() for symbol in symbols]
+        results = await run_batch_async(self.trades, symbols, max_concurrency)
+        return results.to_mapping(symbols, return_exceptions)
+
+    async def market_stats(
+            self, src_currency: t.Union[str, t.List[str]], dst_currency: t.Union[str, DstCurrency, t.List[str]],
+            batch_size: int = 50, max_concurrency: int = 8,
+    ) -> t.Dict:
+        """
+        Get market stats
+
+        Lists of currencies are sent comma-separated, so one request covers every source/destination pair.
+        Source lists longer than ``batch_size`` are split into batches that are requested concurrently and
+        merged into a single "stats" mapping.
+
+        :param src_currency: Source currency or currencies
+        :type src_currency: str | list
+
+        :param dst_currency: Destination currency or currencies
+        :type dst_currency: str | DstCurrency | list
+
+        :param batch_size: Maximum source currencies per request (optional)
+        :type batch_size: int
+
+        :param max_concurrency: Maximum concurrent requests (optional)
+        :type max_concurrency: int
+
+        :return: Market stats
+        :rtype: dict
+        """
+
+        src_currencies = [src_currency] if isinstance(src_currency, str) else list(src_currency)
+        dst_currencies = [dst_currency] if isinstance(dst_currency, str) else list(dst_currency)
+        batches = [src_currencies[i:i + batch_size] for i in range(0, len(src_currencies), batch_size)]
+
+        if len(batches) == 1:
+            return await self._market_stats(batches[0], dst_currencies)
+
+        results = await run_batch_async(
+            lambda batch: self._market_stats(batch, dst_currencies), batches, max_concurrency,
+        )
+
+        stats = {}
+        for entry in results:
+            if not entry.ok:
+                raise entry.error
+            stats.update(entry.result.get('stats') or {})
+
+        return {'status': 'ok', 'stats': stats}
+
+    async def _market_stats(self, src_currencies: t.List[str], dst_currencies: t.List[str]) -> t.Dict:
+        return await self._invoke(
+            ENDPOINTS['market_stats'], {'src_currencies': src_currencies, 'dst_currencies': dst_currencies},
+        )
+
+    async def ohlc(self, symbol: str, resolution: Union[str, int, Resolution], from_date: int, to_data: int) -> t.Dict:
+        """
+        Get market OHLC data
+
+        :param symbol: Symbol
+        :type symbol: str
+
+        :param resolution: Resolution
+        :type resolution: str | int | Resolution
+
+        :param from_date: From date
+        :type from_date: int
+
+        :param to_data: To date
+        :type to_data: int
+
+        :return: OHLC data
+        :rtype: dict
+        """
+
+        return await self._invoke(ENDPOINTS['ohlc'], {
+            'symbol': symbol, 'resolution': resolution, 'from_date': from_date, 'to_data': to_data,
+        })
+
+    async def global_stats(self) -> t.Dict:
+        """
+        Get global stats
+
+        :return: Global stats
+        :rtype: dict
+        """
+
+        return await self._invoke(ENDPOINTS['global_stats'], {})
+
+    async def create_order(
+            self, side: Union[str, Side], execution: Union[str, ExecutionType],
+            src_currency: str, dst_currency: Union[str, DstCurrency],
+            amount: str, price: t.Union[int, float], stop_price: t.Union[int, float] = None,
+    ) -> t.Dict:
+        """
+        Place new order
+
+        :param side: Side ('buy', 'sell')
+        :type side: str | Side
+
+        :param execution: Execution type ('market', 'limit', 'stop_limit', 'stop_market')
+        :type execution: str | ExecutionType
+
+        :param src_currency: Source currency
+        :type src_currency: str
+
+        :param dst_currency: Destination currency
+        :type dst_currency: str | DstCurrency
+
+        :param amount: Amount
+        :type amount: str
+
+        :param price: Price
+        :type price: int or float
+
+        :param stop_price: Stop price
+        :type stop_price: int or float
+
+        :return: Order
+        :rtype: dict
+        """
+
+        if execution.lower() in ('stop_limit', 'stop_market'):
+            if stop_price is None:
+                raise InvalidInputExceptions(
+                    'create_order',
+                    'stop_price is required for stop_limit and stop_market orders'
+                )
+        else:
+            stop_price = None
+
+        return await self._invoke(ENDPOINTS['create_order'], {
+            'side': side, 'execution': execution, 'src_currency': src_currency, 'dst_currency': dst_currency,
+            'amount': amount, 'price': price, 'stop_price': stop_price,
+        })
+
+    async def order_status(self, order_id: int) -> t.Dict:
+        """
+        Get order status
+
+        :param order_id: Order ID
+        :type order_id: int
+
+        :return: Order status
+        :rtype: dict
+        """
+
+        return await self._invoke(ENDPOINTS['order_status'], {'order_id': order_id})
+
+    async def open_orders(
+            self, status: Union[OpenOrderStatus, str] = OpenOrderStatus.Open,
+            src_currency: str = None, dst_currency: Union[DstCurrency, str] = None, details: int = 1,
+            page: int = None, page_size: int = None,
+    ) -> t.Dict:
+        """
+        Get user open orders
+
+        :param status: Status
+        :type status: str or OpenOrderStatus
+
+        :param src_currency: Source currency
+        :type src_currency: str
+
+        :param dst_currency: Destination currency
+        :type dst_currency: str or DstCurrency
+
+        :param details: Details
+        :type details: int
+
+        :param page: Page number (optional)
+        :type page: int
+
+        :param page_size: Page size (optional)
+        :type page_size: int
+
+        :return: Open orders
+        :rtype: dict
+        """
+
+        return await self._invoke(ENDPOINTS['open_orders'], {
+            'status': status, 'src_currency': src_currency, 'dst_currency': dst_currency, 'details': details,
+            'page': page, 'page_size': page_size,
+        })
+
+    async def update_status(self, order_id: int, status: t.Union[str, UpdateOrderStatus]) -> t.Dict:
+        """
+        Update order status
+
+        :param order_id: Order ID
+        :type order_id: int
+
+        :param status: Order status
+        :type status: str | UpdateOrderStatus
+
+        :return: Order status
+        :rtype: dict
+        """
+
+        return await self._invoke(ENDPOINTS['update_status'], {'order_id': order_id, 'status': status})
+
+    async def create_orders(self, specs: t.List[t.Dict], max_concurrency: int = 8) -> BatchResult:
+        """
+        Place several orders concurrently
+
+        Each spec holds the keyword arguments of ``create_order``. A rejected order is reported in its
+        entry (typically as a ``CreateOrderException`` subclass) and does not stop the others.
+
+        :param specs: Order specs
+        :type specs: list
+
+        :param max_concurrency: Maximum concurrent requests (optional)
+        :type max_concurrency: int
+
+        :return: One entry per spec, in input order
+        :rtype: BatchResult
+        """
+
+        return await run_batch_async(lambda spec: self.create_order(**spec), specs, max_concurrency)
+
+    async def update_statuses(
+            self, order_ids: t.List[int], status: t.Union[str, UpdateOrderStatus] = UpdateOrderStatus.Cancel,
+            max_concurrency: int = 8,
+    ) -> BatchResult:
+        """
+        Update the status of several orders concurrently
+
+        :param order_ids: Order IDs
+        :type order_ids: list
+
+        :param status: Order status (optional)
+        :type status: str | UpdateOrderStatus
+
+        :param max_concurrency: Maximum concurrent requests (optional)
+        :type max_concurrency: int
+
+        :return: One entry per order ID, in input order
+        :rtype: BatchResult
+        """
+
+        return await run_batch_async(lambda order_id: self.update_status(order_id, status), order_ids, max_concurrency)
+
+    async def cancel_all_orders(
+            self, src_currency: str, dst_currency: t.Union[str, DstCurrency],
+            execution: t.Union[str, ExecutionType] = ExecutionType.Market, hours: float = None
+    ) -> t.Dict:
+        """
+        Cancel all orders
+
+        :param src_currency: Source currency
+        :type src_currency: str
+
+        :param dst_currency: Destination currency
+        :type dst_currency: str or DstCurrency
+
+        :param execution: Execution type
+        :type execution: str or ExecutionType
+
+        :param hours: Hours
+        :type hours: float
+
+        :return: Cancel all orders
+        :rtype: dict
+        """
+
+        return await self._invoke(ENDPOINTS['cancel_all_orders'], {
+            'src_currency': src_currency, 'dst_currency': dst_currency, 'execution': execution, 'hours': hours,
+        })
+
+    async def user_profile(self) -> t.Dict:
+        """
+        Get user info
+
+        :return: Get user info
+        :rtype: dict
+        """
+
+        return await self._invoke(ENDPOINTS['user_profile'], {})
+
+    async def generate_wallet_address(self, currency: str) -> t.Dict:
+        """
+        Generate wallet address
+
+        :param currency: Currency
+        :type currency: str
+
+        :return: Generate wallet address
+        :rtype: dict
+        """
+
+        return await self._invoke(ENDPOINTS['generate_wallet_address'], {'currency': currency})
+
+    async def add_bank_card(self, card_number: str, bank_name: str) -> t.Dict:
+        """
+        Add bank card
+
+        :param card_number: Card number
+        :type card_number: str
+
+        :param bank_name: Bank name
+        :type bank_name: str
+
+        :return: Add bank card
+        :rtype: dict
+        """
+
+        return await self._invoke(ENDPOINTS['add_bank_card'], {'card_number': card_number, 'bank_name': bank_name})
+
+    async def add_bank_account(self, card_number: str, shaba: str, bank_name: str) -> t.Dict:
+        """
+        Add bank card
+
+        :param card_number: Card number
+        :type card_number: str
+
+        :param shaba: Shaba
+        :type shaba: str
+
+        :param bank_name: Bank name
+        :type bank_name: str
+
+        :return: Add bank card
+        :rtype: dict
+        """
+
+        return await self._invoke(ENDPOINTS['add_bank_account'], {
+            'card_number': card_number, 'shaba': shaba, 'bank_name': bank_name,
+        })
+
+    async def user_limitations(self) -> t.Dict:
+        """
+        Get user limitations
+
+        :return: User limitations
+        :rtype: dict
+        """
+
+        return await self._invoke(ENDPOINTS['user_limitations'], {})
+
+    async def user_wallets(self, currencies: t.List = None) -> t.Dict:
+        """
+        Get user wallets
+
+        :param currencies: Currencies
+        :type currencies: list
+
+        :return: User wallets
+        :rtype: dict
+        """
+
+        if currencies is None:
+            return await self._invoke(ENDPOINTS['user_wallets'], {})
+        return await self._invoke(ENDPOINTS['user_wallets_v2'], {'currencies': currencies})
+
+    async def balance(self, currency: str) -> t.Dict:
+        """
+        Get user wallets
+
+        :param currency: Currency
+        :type currency: str
+
+        :return: User balance
+        :rtype: dict
+        """
+
+        return await self._invoke(ENDPOINTS['balance'], {'currency': currency})
+
+    async def transactions_list(self, wallet_id: int, page: int = None, page_size: int = None) -> t.Dict:
+        """
+        Get user wallets
+
+        :param wallet_id: Wallet id
+        :type wallet_id: int
+
+        :param page: Page number (optional)
+        :type page: int
+
+        :param page_size: Page size (optional)
+        :type page_size: int
+
+        :return: User transactions
+        :rtype: dict
+        """
+
+        return await self._invoke(ENDPOINTS['transactions_list'], {
+            'wallet_id': wallet_id, 'page': page, 'page_size': page_size,
+        })
+
+    async def deposits_list(self, wallet_id: int = 'all', page: int = None, page_size: int = None) -> t.Dict:
+        """
+        Get user wallets
+
+        :param wallet_id: Wallet id
+        :type wallet_id: int
+
+        :param page: Page number (optional)
+        :type page: int
+
+        :param page_size: Page size (optional)
+        :type page_size: int
+
+        :return: User transactions
+        :rtype: dict
+        """
+
+        return await self._invoke(ENDPOINTS['deposits_list'], {
+            'wallet_id': wallet_id, 'page': page, 'page_size': page_size,
+        })
+
+    async def iter_transactions(
+            self, wallet_id: int, page_size: int = 50, prefetch: bool = False,
+            since: t.Union[str, datetime] = None, since_id: int = None,
+    ) -> t.AsyncIterator[t.Dict]:
+        """
+        Iterate over wallet transactions, newest first, fetching pages on demand
+
+        :param wallet_id: Wallet id
+        :type wallet_id: int
+
+        :param page_size: Page size (optional)
+        :type page_size: int
+
+        :param prefetch: Request the next page in the background while the current one is consumed (optional)
+        :type prefetch: bool
+
+        :param since: Stop at the first record created at or before this time (optional)
+        :type since: str | datetime
+
+        :param since_id: Stop at the first record with an id at or below this one (optional)
+        :type since_id: int
+
+        :return: Transactions
+        :rtype: iterator
+        """
+
+        async def fetch_page(page: int) -> t.Dict:
+            return await self.transactions_list(wallet_id, page=page, page_size=page_size)
+
+        async for record in aiter_records(fetch_page, 'transactions', page_size, prefetch, since, since_id):
+            yield record
+
+    async def iter_deposits(
+            self, wallet_id: int = 'all', page_size: int = 50, prefetch: bool = False,
+            since: t.Union[str, datetime] = None, since_id: int = None,
+    ) -> t.AsyncIterator[t.Dict]:
+        """
+        Iterate over deposits, newest first, fetching pages on demand
+
+        :param wallet_id: Wallet id (optional)
+        :type wallet_id: int
+
+        :param page_size: Page size (optional)
+        :type page_size: int
+
+        :param prefetch: Request the next page in the background while the current one is consumed (optional)
+        :type prefetch: bool
+
+        :param since: Stop at the first record created at or before this time (optional)
+        :type since: str | datetime
+
+        :param since_id: Stop at the first record with an id at or below this one (optional)
+        :type since_id: int
+
+        :return: Deposits
+        :rtype: iterator
+        """
+
+        async def fetch_page(page: int) -> t.Dict:
+            return await self.deposits_list(wallet_id, page=page, page_size=page_size)
+
+        async for record in aiter_records(fetch_page, 'deposits', page_size, prefetch, since, since_id):
+            yield record
+
+    async def iter_orders(
+            self, status: Union[OpenOrderStatus, str] = OpenOrderStatus.All,
+            src_currency: str = None, dst_currency: Union[DstCurrency, str] = None, details: int = 1,
+            page_size: int = 50, prefetch: bool = False,
+            since: t.Union[str, datetime] = None, since_id: int = None,
+    ) -> t.AsyncIterator[t.Dict]:
+        """
+        Iterate over orders, newest first, fetching pages on demand
+
+        :param status: Status (optional)
+        :type status: str or OpenOrderStatus
+
+        :param src_currency: Source currency (optional)
+        :type src_currency: str
+
+        :param dst_currency: Destination currency (optional)
+        :type dst_currency: str or DstCurrency
+
+        :param details: Details (optional)
+        :type details: int
+
+        :param page_size: Page size (optional)
+        :type page_size: int
+
+        :param prefetch: Request the next page in the background while the current one is consumed (optional)
+        :type prefetch: bool
+
+        :param since: Stop at the first record created at or before this time (optional)
+        :type since: str | datetime
+
+        :param since_id: Stop at the first record with an id at or below this one (optional)
+        :type since_id: int
+
+        :return: Orders
+        :rtype: iterator
+        """
+
+        async def fetch_page(page: int) -> t.Dict:
+            return await self.open_orders(status, src_currency, dst_currency, details, page=page, page_size=page_size)
+
+        async for record in aiter_records(fetch_page, 'orders', page_size, prefetch, since, since_id):
+            yield record
+
+    def __str__(self):
+        return f'{self.__class__.__name__} | (token={self.__token})'
+
+    def __repr__(self):
+        return self.__str__()
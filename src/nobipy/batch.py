@@ -0,0 +1,160 @@
+import asyncio
+import typing as t
+from concurrent.futures import ThreadPoolExecutor
+
+
+__all__ = [
+    'BatchEntry',
+    'BatchResult',
+    'run_batch',
+    'run_batch_async',
+]
+
+
+class BatchEntry:
+    __slots__ = ('index', 'request', 'result', 'error')
+
+    def __init__(self, index: int, request: t.Any, result: t.Any = None, error: Exception = None) -> None:
+        """
+        Outcome of one item of a batch.
+
+        :param index: Position of the item in the input
+        :type index: int
+
+        :param request: Input item
+        :type request: any
+
+        :param result: Result when the call succeeded (optional)
+        :type result: any
+
+        :param error: Exception when the call failed, e.g. a ``CreateOrderException`` subclass (optional)
+        :type error: Exception
+
+        :return: None
+        """
+
+        self.index = index
+        self.request = request
+        self.result = result
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __str__(self):
+        outcome = f'result={self.result}' if self.ok else f'error={self.error!r}'
+        return f'{self.__class__.__name__} | (index={self.index}, {outcome})'
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class BatchResult(list):
+    """
+    Batch entries in input order.
+    """
+
+    @property
+    def succeeded(self) -> t.List[BatchEntry]:
+        return [entry for entry in self if entry.ok]
+
+    @property
+    def failed(self) -> t.List[BatchEntry]:
+        return [entry for entry in self if not entry.ok]
+
+    @property
+    def ok(self) -> bool:
+        return all(entry.ok for entry in self)
+
+    def to_mapping(self, keys: t.Iterable[t.Hashable], return_exceptions: bool = False) -> t.Dict:
+        """
+        Map each key to the result of the entry at the same position.
+
+        :param keys: Keys, one per entry
+        :type keys: iterable
+
+        :param return_exceptions: Map failed keys to their exception instead of raising the first one (optional)
+        :type return_exceptions: bool
+
+        :return: Results by key
+        :rtype: dict
+        """
+
+        mapping = {}
+        for key, entry in zip(keys, self):
+            if entry.ok:
+                mapping[key] = entry.result
+            elif return_exceptions:
+                mapping[key] = entry.error
+            else:
+                raise entry.error
+        return mapping
+
+
+def _run_one(fn: t.Callable, index: int, item: t.Any) -> BatchEntry:
+    try:
+        return BatchEntry(index, item, result=fn(item))
+    except Exception as e:
+        return BatchEntry(index, item, error=e)
+
+
+def run_batch(fn: t.Callable[[t.Any], t.Any], items: t.Iterable, max_workers: int = 8) -> BatchResult:
+    """
+    Call ``fn`` for every item concurrently on a thread pool.
+
+    A failing item is recorded in its entry and does not abort the rest of the batch.
+
+    :param fn: Function called with one item
+    :type fn: callable
+
+    :param items: Items
+    :type items: iterable
+
+    :param max_workers: Maximum concurrent calls (optional)
+    :type max_workers: int
+
+    :return: Entries in input order
+    :rtype: BatchResult
+    """
+
+    items = list(items)
+    if not items:
+        return BatchResult()
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        futures = [executor.submit(_run_one, fn, index, item) for index, item in enumerate(items)]
+        return BatchResult(future.result() for future in futures)
+
+
+async def run_batch_async(
+        fn: t.Callable[[t.Any], t.Awaitable], items: t.Iterable, max_concurrency: int = 8,
+) -> BatchResult:
+    """
+    Await ``fn(item)`` for every item concurrently on the running event loop.
+
+    A failing item is recorded in its entry and does not abort the rest of the batch.
+
+    :param fn: Coroutine function called with one item
+    :type fn: callable
+
+    :param items: Items
+    :type items: iterable
+
+    :param max_concurrency: Maximum concurrent calls (optional)
+    :type max_concurrency: int
+
+    :return: Entries in input order
+    :rtype: BatchResult
+    """
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run_one(index: int, item: t.Any) -> BatchEntry:
+        async with semaphore:
+            try:
+                return BatchEntry(index, item, result=await fn(item))
+            except Exception as e:
+                return BatchEntry(index, item, error=e)
+
+    return BatchResult(await asyncio.gather(*(run_one(index, item) for index, item in enumerate(items))))
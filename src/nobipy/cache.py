@@ -0,0 +1,196 @@
+import json
+import threading
+import time
+import typing as t
+from collections import OrderedDict
+
+from .endpoints import ENDPOINTS
+
+
+__all__ = [
+    'DEFAULT_TTL',
+    'ResponseCache',
+]
+
+
+# Seconds a decoded public response stays fresh, per endpoint, from the endpoint table. Endpoints missing
+# here are never cached.
+DEFAULT_TTL = {endpoint.name: endpoint.ttl for endpoint in ENDPOINTS.values() if endpoint.ttl}
+
+MISSING = object()
+
+
+class ResponseCache:
+    def __init__(
+            self, ttl: t.Dict[str, float] = None, maxsize: int = 1024,
+            clock: t.Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Thread-safe TTL + LRU cache for decoded public responses.
+
+        Entries are keyed by endpoint name and request parameters. The client only consults the cache
+        for unauthenticated requests, and cached payloads are shared between callers, so they must be
+        treated as read-only.
+
+        :param ttl: Seconds to keep a response, per endpoint name; defaults to ``DEFAULT_TTL`` (optional)
+        :type ttl: dict
+
+        :param maxsize: Maximum number of entries before the least recently used one is evicted (optional)
+        :type maxsize: int
+
+        :param clock: Monotonic clock (optional)
+        :type clock: callable
+
+        :return: None
+        """
+
+        self.ttl = dict(DEFAULT_TTL if ttl is None else ttl)
+        self.maxsize = maxsize
+
+        self.__clock = clock
+        self.__lock = threading.Lock()
+        self.__entries: 'OrderedDict[t.Tuple, t.Tuple[float, t.Any]]' = OrderedDict()
+        self.__hits: t.Dict[str, int] = {}
+        self.__misses: t.Dict[str, int] = {}
+
+    @staticmethod
+    def make_key(
+            endpoint: str, method: str, url: str, params: t.Any = None, json_data: t.Dict = None,
+    ) -> t.Tuple:
+        """
+        Build the cache key of a request.
+
+        :param endpoint: Endpoint (function) name
+        :type endpoint: str
+
+        :param method: HTTP method
+        :type method: str
+
+        :param url: URL
+        :type url: str
+
+        :param params: Query parameters (optional)
+        :type params: dict | tuple
+
+        :param json_data: Request body (optional)
+        :type json_data: dict
+
+        :return: Key
+        :rtype: tuple
+        """
+
+        return (
+            endpoint,
+            method.upper(),
+            url,
+            None if params is None else json.dumps(params, sort_keys=True, default=str),
+            None if json_data is None else json.dumps(json_data, sort_keys=True, default=str),
+        )
+
+    def cacheable(self, endpoint: str) -> bool:
+        """
+        Whether responses of an endpoint are cached.
+
+        :param endpoint: Endpoint (function) name
+        :type endpoint: str
+
+        :return: Cacheable
+        :rtype: bool
+        """
+
+        return self.ttl.get(endpoint, 0) > 0
+
+    def get(self, key: t.Tuple) -> t.Any:
+        """
+        Get a fresh entry.
+
+        :param key: Key from ``make_key``
+        :type key: tuple
+
+        :return: Cached payload, or ``MISSING``
+        """
+
+        endpoint = key[0]
+        now = self.__clock()
+
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self.__entries.move_to_end(key)
+                    self.__hits[endpoint] = self.__hits.get(endpoint, 0) + 1
+                    return entry[1]
+                del self.__entries[key]
+
+            self.__misses[endpoint] = self.__misses.get(endpoint, 0) + 1
+            return MISSING
+
+    def set(self, key: t.Tuple, value: t.Any) -> None:
+        """
+        Store an entry with the TTL of its endpoint.
+
+        :param key: Key from ``make_key``
+        :type key: tuple
+
+        :param value: Decoded payload
+        :type value: any
+
+        :return: None
+        """
+
+        ttl = self.ttl.get(key[0], 0)
+        if ttl <= 0:
+            return
+
+        expires = self.__clock() + ttl
+
+        with self.__lock:
+            self.__entries[key] = (expires, value)
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.maxsize:
+                self.__entries.popitem(last=False)
+
+    def invalidate(self, endpoint: str = None) -> int:
+        """
+        Drop cached entries.
+
+        :param endpoint: Only drop entries of this endpoint, all when omitted (optional)
+        :type endpoint: str
+
+        :return: Number of dropped entries
+        :rtype: int
+        """
+
+        with self.__lock:
+            if endpoint is None:
+                count = len(self.__entries)
+                self.__entries.clear()
+                return count
+
+            keys = [key for key in self.__entries if key[0] == endpoint]
+            for key in keys:
+                del self.__entries[key]
+            return len(keys)
+
+    def stats(self) -> t.Dict[str, t.Dict[str, int]]:
+        """
+        Hit and miss counters per endpoint.
+
+        :return: ``{endpoint: {'hits': int, 'misses': int}}``
+        :rtype: dict
+        """
+
+        with self.__lock:
+            return {
+                endpoint: {'hits': self.__hits.get(endpoint, 0), 'misses': self.__misses.get(endpoint, 0)}
+                for endpoint in set(self.__hits) | set(self.__misses)
+            }
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def __str__(self):
+        return f'{self.__class__.__name__} | (size={len(self.__entries)}, maxsize={self.maxsize})'
+
+    def __repr__(self):
+        return self.__str__()
@@ -0,0 +1,357 @@
+import json
+import os
+import shutil
+import threading
+import time
+import typing as t
+import uuid
+from contextlib import contextmanager
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+from .const import Resolution
+from .history import Candles, OHLCDownloader, resolution_seconds
+
+
+__all__ = [
+    'CandleStore',
+]
+
+
+_DTYPES = (
+    ('time', '<i8'),
+    ('open', '<f8'),
+    ('high', '<f8'),
+    ('low', '<f8'),
+    ('close', '<f8'),
+    ('volume', '<f8'),
+)
+
+
+def _merge_intervals(intervals: t.Iterable[t.Sequence[int]], step: int) -> t.List[t.List[int]]:
+    merged: t.List[t.List[int]] = []
+    for lo, hi in sorted(intervals):
+        if merged and lo <= merged[-1][1] + step:
+            merged[-1][1] = max(merged[-1][1], hi)
+        else:
+            merged.append([lo, hi])
+    return merged
+
+
+class CandleStore:
+    def __init__(self, root: str) -> None:
+        """
+        On-disk candle store keyed by symbol and resolution.
+
+        Every series is a directory of fixed-width column files (``int64`` time, ``float64`` prices and
+        volume) that are read through memory maps, so ``read`` returns zero-copy slices. Appends write
+        the time column last, which lets readers size a series by the time column alone without any
+        lock. Inserting older candles writes a new generation of the files and switches the ``CURRENT``
+        pointer atomically; readers holding the previous generation keep a valid mapping. Writers of
+        one series are serialized with ``fcntl.flock`` where available.
+
+        Requires the optional ``numpy`` dependency (``pip install nobipy[numpy]``).
+
+        :param root: Store directory
+        :type root: str
+
+        :return: None
+        """
+
+        if np is None:
+            raise ImportError('CandleStore requires numpy | Try "pip install nobipy[numpy]"')
+
+        self.root = root
+        self.__lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def _series(self, symbol: str, resolution: t.Union[str, int, Resolution]) -> str:
+        return os.path.join(self.root, symbol.upper(), str(resolution).upper())
+
+    @staticmethod
+    def _generation(series: str) -> t.Optional[str]:
+        try:
+            with open(os.path.join(series, 'CURRENT')) as f:
+                return os.path.join(series, f.read().strip())
+        except FileNotFoundError:
+            return None
+
+    @contextmanager
+    def _write_lock(self, series: str):
+        os.makedirs(series, exist_ok=True)
+        with self.__lock:
+            with open(os.path.join(series, '.lock'), 'a') as lock:
+                if fcntl is not None:
+                    fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+
+    @staticmethod
+    def _map(path: str, dtype: str, count: int) -> 'np.ndarray':
+        if count == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(path, dtype=dtype, mode='r', shape=(count,))
+
+    def read(
+            self, symbol: str, resolution: t.Union[str, int, Resolution], start: int = None, end: int = None,
+    ) -> Candles:
+        """
+        Read candles of ``[start, end]`` as zero-copy views of the memory-mapped columns.
+
+        :param symbol: Symbol
+        :type symbol: str
+
+        :param resolution: Resolution
+        :type resolution: str | int | Resolution
+
+        :param start: Start, epoch seconds (optional)
+        :type start: int
+
+        :param end: End, epoch seconds, inclusive (optional)
+        :type end: int
+
+        :return: Candles
+        :rtype: Candles
+        """
+
+        series = self._series(symbol, resolution)
+
+        while True:
+            generation = self._generation(series)
+            if generation is None:
+                return Candles.empty()
+            try:
+                count = os.path.getsize(os.path.join(generation, 'time')) // 8
+                columns = [self._map(os.path.join(generation, name), dtype, count) for name, dtype in _DTYPES]
+                break
+            except FileNotFoundError:
+                # A writer replaced the generation between reading CURRENT and opening its files.
+                continue
+
+        times = columns[0]
+        lo = 0 if start is None else int(np.searchsorted(times, start, side='left'))
+        hi = count if end is None else int(np.searchsorted(times, end, side='right'))
+        return Candles(*(column[lo:hi] for column in columns))
+
+    def coverage(self, symbol: str, resolution: t.Union[str, int, Resolution]) -> t.List[t.List[int]]:
+        """
+        Time ranges already synced, as merged ``[from, to]`` pairs.
+
+        :param symbol: Symbol
+        :type symbol: str
+
+        :param resolution: Resolution
+        :type resolution: str | int | Resolution
+
+        :return: Ranges
+        :rtype: list
+        """
+
+        try:
+            with open(os.path.join(self._series(symbol, resolution), 'coverage.json')) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return []
+
+    def gaps(
+            self, symbol: str, resolution: t.Union[str, int, Resolution], start: int, end: int,
+    ) -> t.List[t.Tuple[int, int]]:
+        """
+        Parts of ``[start, end]`` that are not covered locally.
+
+        Coverage is tracked separately from the stored candles, so ranges where the exchange has no
+        candles are not fetched again.
+
+        :param symbol: Symbol
+        :type symbol: str
+
+        :param resolution: Resolution
+        :type resolution: str | int | Resolution
+
+        :param start: Start, epoch seconds
+        :type start: int
+
+        :param end: End, epoch seconds, inclusive
+        :type end: int
+
+        :return: ``(from, to)`` pairs
+        :rtype: list
+        """
+
+        step = resolution_seconds(resolution)
+        start -= start % step
+
+        gaps = []
+        cursor = start
+        for lo, hi in self.coverage(symbol, resolution):
+            if hi < cursor:
+                continue
+            if lo > end:
+                break
+            if lo > cursor:
+                gaps.append((cursor, lo - 1))
+            cursor = max(cursor, (hi // step + 1) * step)
+        if cursor <= end:
+            gaps.append((cursor, end))
+        return gaps
+
+    def _write_generation(self, series: str, candles: Candles) -> None:
+        name = f'gen-{uuid.uuid4().hex}'
+        generation = os.path.join(series, name)
+        os.makedirs(generation)
+
+        for column, dtype in _DTYPES:
+            with open(os.path.join(generation, column), 'wb') as f:
+                np.ascontiguousarray(getattr(candles, column), dtype=dtype).tofile(f)
+                f.flush()
+                os.fsync(f.fileno())
+
+        previous = self._generation(series)
+        pointer = os.path.join(series, f'.CURRENT.{name}')
+        with open(pointer, 'w') as f:
+            f.write(name)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(pointer, os.path.join(series, 'CURRENT'))
+
+        if previous is not None:
+            shutil.rmtree(previous, ignore_errors=True)
+
+    @staticmethod
+    def _append(generation: str, candles: Candles) -> None:
+        # Time goes last: readers size the series by it.
+        for column, dtype in _DTYPES[1:] + _DTYPES[:1]:
+            with open(os.path.join(generation, column), 'ab') as f:
+                np.ascontiguousarray(getattr(candles, column), dtype=dtype).tofile(f)
+                f.flush()
+
+    @staticmethod
+    def _replace_last(generation: str, count: int, candles: Candles) -> None:
+        # Overwrite the newest stored candle (same timestamp) with the first of ``candles``. The time
+        # column is unchanged, so readers keep the same size.
+        for column, dtype in _DTYPES[1:]:
+            item = np.dtype(dtype).itemsize
+            with open(os.path.join(generation, column), 'r+b') as f:
+                f.seek((count - 1) * item)
+                np.ascontiguousarray(getattr(candles, column)[:1], dtype=dtype).tofile(f)
+                f.flush()
+
+    def write(self, symbol: str, resolution: t.Union[str, int, Resolution], candles: Candles) -> int:
+        """
+        Store candles, replacing stored candles with the same timestamps.
+
+        Candles newer than everything stored are appended in place, and a candle with the newest stored
+        timestamp (the candle that was still open at the previous sync) is overwritten in place. Anything
+        older writes a new generation.
+
+        :param symbol: Symbol
+        :type symbol: str
+
+        :param resolution: Resolution
+        :type resolution: str | int | Resolution
+
+        :param candles: Candles
+        :type candles: Candles
+
+        :return: Number of stored candles after the write
+        :rtype: int
+        """
+
+        series = self._series(symbol, resolution)
+        candles = candles.sorted() if len(candles) else candles
+
+        with self._write_lock(series):
+            current = self.read(symbol, resolution)
+            generation = self._generation(series)
+
+            if not len(candles):
+                return len(current)
+
+            if generation is not None and (not len(current) or candles.time[0] >= current.time[-1]):
+                if len(current) and candles.time[0] == current.time[-1]:
+                    self._replace_last(generation, len(current), candles)
+                    candles = Candles(*(getattr(candles, name)[1:] for name in Candles.__slots__))
+                if len(candles):
+                    self._append(generation, candles)
+            else:
+                self._write_generation(series, Candles.concatenate([current, candles]))
+
+            return len(self.read(symbol, resolution))
+
+    def _add_coverage(self, symbol: str, resolution: t.Union[str, int, Resolution], lo: int, hi: int) -> None:
+        series = self._series(symbol, resolution)
+        merged = _merge_intervals(self.coverage(symbol, resolution) + [[lo, hi]], resolution_seconds(resolution))
+
+        path = os.path.join(series, 'coverage.json')
+        tmp = f'{path}.{uuid.uuid4().hex}'
+        with open(tmp, 'w') as f:
+            json.dump(merged, f)
+        os.replace(tmp, path)
+
+    def sync(
+            self, client, symbol: str, resolution: t.Union[str, int, Resolution], start: int, end: int,
+            **downloader_options,
+    ) -> int:
+        """
+        Download only the parts of ``[start, end]`` that are missing locally and store them.
+
+        The candle still open at the time of the sync is stored but not marked as covered, so the next sync
+        fetches it again.
+
+        :param client: Client (``Nobitex``)
+        :type client: Nobitex
+
+        :param symbol: Symbol
+        :type symbol: str
+
+        :param resolution: Resolution
+        :type resolution: str | int | Resolution
+
+        :param start: Start, epoch seconds
+        :type start: int
+
+        :param end: End, epoch seconds, inclusive
+        :type end: int
+
+        :param downloader_options: Options of ``OHLCDownloader`` (optional)
+        :type downloader_options: dict
+
+        :return: Number of candles downloaded
+        :rtype: int
+        """
+
+        downloader = OHLCDownloader(client, **downloader_options)
+        downloaded = 0
+
+        step = resolution_seconds(resolution)
+        now = int(time.time())
+        last_closed = now - now % step - step
+
+        for lo, hi in self.gaps(symbol, resolution, start, end):
+            candles = downloader.download(symbol, resolution, lo, hi)
+            series = self._series(symbol, resolution)
+            self.write(symbol, resolution, candles)
+            covered = min(hi, last_closed)
+            if covered >= lo:
+                with self._write_lock(series):
+                    self._add_coverage(symbol, resolution, lo, covered)
+            downloaded += len(candles)
+
+        return downloaded
+
+    def __str__(self):
+        return f'{self.__class__.__name__} | (root={self.root})'
+
+    def __repr__(self):
+        return self.__str__()
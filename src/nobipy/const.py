@@ -1,4 +1,5 @@
 __all__ = [
+    'BASE_URL',
     'Resolution',
     'OpenOrderStatus',
     'UpdateOrderStatus',
@@ -7,16 +8,30 @@ __all__ = [
     'DstCurrency',
     'ExecutionType',
     'Orderbook',
+    'EndpointGroup',
 ]
 
 
+BASE_URL = 'https://api.nobitex.ir'
+
+
 class Resolution:
     """
     Resolution of the order
     """
 
-    DAY = 'D'
+    MINUTE = 1
+    FIVE_MINUTES = 5
+    FIFTEEN_MINUTES = 15
+    THIRTY_MINUTES = 30
     HOUR = 60
+    THREE_HOURS = 180
+    FOUR_HOURS = 240
+    SIX_HOURS = 360
+    TWELVE_HOURS = 720
+    DAY = 'D'
+    TWO_DAYS = '2D'
+    THREE_DAYS = '3D'
 
 
 class OpenOrderStatus:
@@ -61,3 +76,11 @@ class Orderbook:
 
     Buyers = 'asks'
     Sellers = 'bids'
+
+
+class EndpointGroup:
+    Market = 'market'
+    OrderPlacement = 'order_placement'
+    OrderQuery = 'order_query'
+    Wallet = 'wallet'
+    Account = 'account'
@@ -0,0 +1,56 @@
+import json
+import typing as t
+
+
+__all__ = [
+    'Decoder',
+    'get_decoder',
+]
+
+
+Decoder = t.Callable[[t.Union[bytes, str]], t.Any]
+
+# Preference order for decoder="auto"; the first importable one wins.
+_AUTO_ORDER = ('orjson', 'ujson', 'simplejson', 'json')
+
+
+def _load(name: str) -> Decoder:
+    if name == 'json':
+        return json.loads
+    if name == 'simplejson':
+        import simplejson
+        return simplejson.loads
+    if name == 'orjson':
+        import orjson
+        return orjson.loads
+    if name == 'ujson':
+        import ujson
+        return ujson.loads
+    raise ValueError(f'Unknown decoder "{name}" | Expected one of {", ".join(_AUTO_ORDER)}, "auto" or a callable')
+
+
+def get_decoder(decoder: t.Union[str, Decoder] = 'auto') -> Decoder:
+    """
+    Resolve a JSON decoder.
+
+    :param decoder: Decoder name ('auto', 'json', 'simplejson', 'orjson', 'ujson') or a callable
+        taking the raw response body (optional)
+    :type decoder: str | callable
+
+    :raises: ValueError, ImportError
+
+    :return: Decoder
+    :rtype: callable
+    """
+
+    if callable(decoder):
+        return decoder
+
+    if decoder == 'auto':
+        for name in _AUTO_ORDER:
+            try:
+                return _load(name)
+            except ImportError:
+                continue
+
+    return _load(decoder)
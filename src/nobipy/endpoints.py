@@ -0,0 +1,278 @@
+import typing as t
+
+from .const import EndpointGroup
+
+
+__all__ = [
+    'ENDPOINTS',
+    'Endpoint',
+    'Field',
+]
+
+
+def _lower(value: t.Any) -> str:
+    return value.lower()
+
+
+def _upper(value: t.Any) -> str:
+    return value.upper()
+
+
+def _join(values: t.Iterable[str]) -> str:
+    return ','.join(values)
+
+
+def _join_lower(values: t.Iterable[str]) -> str:
+    return ','.join(value.lower() for value in values)
+
+
+def _is_none(value: t.Any) -> bool:
+    return value is None
+
+
+def _is_empty(value: t.Any) -> bool:
+    return not value
+
+
+class Field(t.NamedTuple):
+    """
+    One request field: the method argument it comes from, its API name, an optional conversion, and an
+    optional predicate on the argument that leaves the field out.
+    """
+
+    argument: str
+    name: str
+    convert: t.Optional[t.Callable[[t.Any], t.Any]] = None
+    omit: t.Optional[t.Callable[[t.Any], bool]] = None
+
+
+class Endpoint:
+    __slots__ = (
+        'name', 'method', 'path', 'auth', 'fields', 'location', 'idempotent', 'ttl', 'group',
+        '_path_fields', '_body_fields',
+    )
+
+    def __init__(
+            self, name: str, method: str, path: str, auth: bool, fields: t.Tuple[Field, ...] = (),
+            location: str = 'json', idempotent: bool = False, ttl: float = 0.0, group: str = None,
+    ) -> None:
+        """
+        Declaration of one API endpoint.
+
+        Fields named in ``path`` as ``{name}`` fill the path; the others go to the JSON body, or to the
+        query string when ``location`` is ``'params'``. Endpoints without body fields send no body.
+
+        :param name: Endpoint (function) name, as used by metrics, rate limits, retries and the cache
+        :type name: str
+
+        :param method: HTTP method, upper case
+        :type method: str
+
+        :param path: URL path, possibly with ``{name}`` placeholders
+        :type path: str
+
+        :param auth: Whether the endpoint needs a token
+        :type auth: bool
+
+        :param fields: Request fields (optional)
+        :type fields: tuple
+
+        :param location: Where non-path fields go, ``'json'`` or ``'params'`` (optional)
+        :type location: str
+
+        :param idempotent: Whether a failed call can be repeated safely (optional)
+        :type idempotent: bool
+
+        :param ttl: Seconds a response stays fresh in the cache, 0 to never cache (optional)
+        :type ttl: float
+
+        :param group: Rate limit group (optional)
+        :type group: str
+
+        :return: None
+        """
+
+        self.name = name
+        self.method = method
+        self.path = path
+        self.auth = auth
+        self.fields = fields
+        self.location = location
+        self.idempotent = idempotent
+        self.ttl = ttl
+        self.group = group
+
+        self._path_fields = tuple(field for field in fields if '{' + field.name + '}' in path)
+        self._body_fields = tuple(field for field in fields if field not in self._path_fields)
+
+    def build(self, arguments: t.Mapping[str, t.Any]) -> t.Tuple[str, t.Optional[t.Tuple], t.Optional[t.Dict]]:
+        """
+        Build the path, query parameters and JSON body of a call.
+
+        :param arguments: Method arguments by name
+        :type arguments: mapping
+
+        :return: Path, query parameters and JSON body
+        :rtype: tuple
+        """
+
+        path = self.path
+        if self._path_fields:
+            path = path.format(**{
+                field.name: field.convert(arguments[field.argument]) if field.convert else arguments[field.argument]
+                for field in self._path_fields
+            })
+
+        if not self._body_fields:
+            return path, None, None
+
+        values = {}
+        for argument, name, convert, omit in self._body_fields:
+            value = arguments.get(argument)
+            if omit is not None and omit(value):
+                continue
+            values[name] = value if convert is None else convert(value)
+
+        if self.location == 'params':
+            return path, tuple(values.items()), None
+        return path, None, values
+
+    def __str__(self):
+        return f'{self.__class__.__name__} | ({self.name}, {self.method} {self.path})'
+
+    def __repr__(self):
+        return self.__str__()
+
+
+_PAGE = (
+    Field('page', 'page', omit=_is_none),
+    Field('page_size', 'pageSize', omit=_is_none),
+)
+
+# Every endpoint used by the clients, keyed by a unique name. ``user_wallets`` has two paths, so its
+# second entry has its own key but shares the endpoint name.
+ENDPOINTS: t.Dict[str, Endpoint] = {
+    'orderbook': Endpoint(
+        'orderbook', 'GET', '/v2/orderbook/{symbol}', False,
+        (Field('symbol', 'symbol', _upper),),
+        idempotent=True, ttl=1.0, group=EndpointGroup.Market,
+    ),
+    'trades': Endpoint(
+        'trades', 'GET', '/v2/trades/{symbol}', False,
+        (Field('symbol', 'symbol', _upper),),
+        idempotent=True, ttl=1.0, group=EndpointGroup.Market,
+    ),
+    'market_stats': Endpoint(
+        'market_stats', 'GET', '/market/stats', False,
+        (Field('src_currencies', 'srcCurrency', _join_lower), Field('dst_currencies', 'dstCurrency', _join_lower)),
+        idempotent=True, ttl=5.0, group=EndpointGroup.Market,
+    ),
+    'ohlc': Endpoint(
+        'ohlc', 'GET', '/market/udf/history', False,
+        (
+            Field('symbol', 'symbol', _upper),
+            Field('resolution', 'resolution'),
+            Field('from_date', 'from'),
+            Field('to_data', 'to'),
+        ),
+        location='params', idempotent=True, ttl=60.0, group=EndpointGroup.Market,
+    ),
+    'global_stats': Endpoint(
+        'global_stats', 'GET', '/market/global-stats', False,
+        idempotent=True, ttl=10.0, group=EndpointGroup.Market,
+    ),
+    'create_order': Endpoint(
+        'create_order', 'POST', '/market/orders/add', True,
+        (
+            Field('side', 'type'),
+            Field('execution', 'execution', _lower),
+            Field('src_currency', 'srcCurrency', _lower),
+            Field('dst_currency', 'dstCurrency', _lower),
+            Field('amount', 'amount'),
+            Field('price', 'price'),
+            Field('stop_price', 'stopPrice', omit=_is_none),
+        ),
+        group=EndpointGroup.OrderPlacement,
+    ),
+    'order_status': Endpoint(
+        'order_status', 'POST', '/market/orders/status', True,
+        (Field('order_id', 'id'),),
+        idempotent=True, group=EndpointGroup.OrderQuery,
+    ),
+    'open_orders': Endpoint(
+        'open_orders', 'POST', '/market/orders/list', True,
+        (
+            Field('status', 'status', omit=_is_empty),
+            Field('src_currency', 'srcCurrency', _lower, _is_empty),
+            Field('dst_currency', 'dstCurrency', _lower, _is_empty),
+            Field('details', 'details', omit=_is_empty),
+        ) + _PAGE,
+        idempotent=True, group=EndpointGroup.OrderQuery,
+    ),
+    'update_status': Endpoint(
+        'update_status', 'POST', '/market/orders/update-status', True,
+        (Field('order_id', 'id'), Field('status', 'status')),
+        group=EndpointGroup.OrderPlacement,
+    ),
+    'cancel_all_orders': Endpoint(
+        'cancel_all_orders', 'POST', '/market/orders/cancel-all', True,
+        (
+            Field('src_currency', 'srcCurrency', _lower),
+            Field('dst_currency', 'dstCurrency', _lower),
+            Field('execution', 'execution', _lower, _is_empty),
+            Field('hours', 'hours', omit=_is_empty),
+        ),
+        group=EndpointGroup.OrderPlacement,
+    ),
+    'user_profile': Endpoint(
+        'user_profile', 'POST', '/users/profile', True,
+        idempotent=True, group=EndpointGroup.Account,
+    ),
+    'generate_wallet_address': Endpoint(
+        'generate_wallet_address', 'POST', '/users/wallets/generate-address', True,
+        (Field('currency', 'currency', _lower),),
+        group=EndpointGroup.Wallet,
+    ),
+    'add_bank_card': Endpoint(
+        'add_bank_card', 'POST', '/users/cards-add', True,
+        (Field('card_number', 'number', _lower), Field('bank_name', 'bank', _lower)),
+        group=EndpointGroup.Account,
+    ),
+    'add_bank_account': Endpoint(
+        'add_bank_account', 'POST', '/users/cards-add', True,
+        (
+            Field('card_number', 'number', _lower),
+            Field('shaba', 'shaba', _lower),
+            Field('bank_name', 'bank', _lower),
+        ),
+        group=EndpointGroup.Account,
+    ),
+    'user_limitations': Endpoint(
+        'user_limitations', 'POST', '/users/limitations', True,
+        idempotent=True, group=EndpointGroup.Account,
+    ),
+    'user_wallets': Endpoint(
+        'user_wallets', 'POST', '/users/wallets/list', True,
+        idempotent=True, group=EndpointGroup.Wallet,
+    ),
+    'user_wallets_v2': Endpoint(
+        'user_wallets', 'POST', '/v2/wallets', True,
+        (Field('currencies', 'currencies', _join),),
+        idempotent=True, group=EndpointGroup.Wallet,
+    ),
+    'balance': Endpoint(
+        'balance', 'POST', '/users/wallets/balance', True,
+        (Field('currency', 'currency', _lower),),
+        idempotent=True, group=EndpointGroup.Wallet,
+    ),
+    'transactions_list': Endpoint(
+        'transactions_list', 'POST', '/users/wallets/transactions/list', True,
+        (Field('wallet_id', 'wallet', str),) + _PAGE,
+        idempotent=True, group=EndpointGroup.Wallet,
+    ),
+    'deposits_list': Endpoint(
+        'deposits_list', 'POST', '/users/wallets/deposits/list', True,
+        (Field('wallet_id', 'wallet', str),) + _PAGE,
+        idempotent=True, group=EndpointGroup.Wallet,
+    ),
+}
@@ -79,6 +79,17 @@ class InvalidInputExceptions(NobitexExceptions):
         return f'{self.func_name} -> {self.message} | {str(self._args)}'
 
 
+class ReplayMissExceptions(NobitexExceptions):
+    def __init__(self, func_name: str, message: Union[str, Exception], args: dict = None):
+        self.func_name = func_name
+        self.message = message
+        self._args = args
+        super().__init__(func_name, message, args)
+
+    def __str__(self):
+        return f'{self.func_name} -> {self.message} | {str(self._args)}'
+
+
 class CreateOrderException(NobitexExceptions):
     def __init__(self, func_name: str, message: Union[str, Exception], args: dict = None):
         self.func_name = func_name
@@ -162,3 +173,19 @@ class FeatureUnavailable(CreateOrderException):
         self.message = message
         self._args = args
         super().__init__('create_order', message, args)
+
+
+# Nobitex "code" values of rejected orders, mapped to their exception types.
+CREATE_ORDER_EXCEPTIONS = {
+    'InvalidOrderPrice': InvalidOrderPrice,
+    'BadPrice': BadPrice,
+    'InvalidExecutionType': InvalidExecutionType,
+    'InvalidOrderType': InvalidOrderType,
+    'OverValueOrder': OverValueOrder,
+    'SmallOrder': SmallOrder,
+    'DuplicateOrder': DuplicateOrder,
+    'InvalidMarketPair': InvalidMarketPair,
+    'MarketClosed': MarketClosed,
+    'TradingUnavailable': TradingUnavailable,
+    'FeatureUnavailable': FeatureUnavailable,
+}
@@ -0,0 +1,324 @@
+import json
+import os
+import threading
+import time
+import typing as t
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+from .const import Resolution
+from .exceptions import InvalidInputExceptions, NobitexExceptions
+
+
+__all__ = [
+    'Candles',
+    'OHLCDownloader',
+    'resolution_seconds',
+]
+
+
+# Candles per response served by /market/udf/history
+DEFAULT_WINDOW_LIMIT = 500
+
+_COLUMNS = ('t', 'o', 'h', 'l', 'c', 'v')
+
+
+def resolution_seconds(resolution: t.Union[str, int, Resolution]) -> int:
+    """
+    Length of one candle in seconds.
+
+    :param resolution: Resolution (minutes as int or digit string, or 'D', '2D', '3D')
+    :type resolution: str | int | Resolution
+
+    :raises: InvalidInputExceptions
+
+    :return: Seconds
+    :rtype: int
+    """
+
+    value = str(resolution).upper()
+    if value.isdigit():
+        return int(value) * 60
+    if value.endswith('D') and (value[:-1].isdigit() or value == 'D'):
+        return int(value[:-1] or 1) * 86400
+    raise InvalidInputExceptions('resolution_seconds', f'invalid resolution "{resolution}"', {'resolution': resolution})
+
+
+class Candles:
+    __slots__ = ('time', 'open', 'high', 'low', 'close', 'volume')
+
+    def __init__(
+            self, time: 'np.ndarray', open: 'np.ndarray', high: 'np.ndarray',
+            low: 'np.ndarray', close: 'np.ndarray', volume: 'np.ndarray',
+    ) -> None:
+        """
+        Time-sorted candles as contiguous numeric columns.
+
+        ``time`` is ``int64`` epoch seconds; the price and volume columns are ``float64``.
+
+        :return: None
+        """
+
+        self.time = time
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+
+    @classmethod
+    def empty(cls) -> 'Candles':
+        return cls(np.empty(0, dtype=np.int64), *(np.empty(0, dtype=np.float64) for _ in range(5)))
+
+    @classmethod
+    def from_payload(cls, payload: t.Dict) -> 'Candles':
+        """
+        Build candles from a decoded ``ohlc`` response.
+
+        :param payload: Decoded response body
+        :type payload: dict
+
+        :return: Candles
+        :rtype: Candles
+        """
+
+        if np is None:
+            raise ImportError('Candles requires numpy | Try "pip install nobipy[numpy]"')
+
+        if not payload.get('t'):
+            return cls.empty()
+
+        return cls(
+            np.asarray(payload['t'], dtype=np.int64),
+            *(np.asarray(payload[key], dtype=np.float64) for key in _COLUMNS[1:]),
+        ).sorted()
+
+    @classmethod
+    def concatenate(cls, parts: t.Iterable['Candles']) -> 'Candles':
+        """
+        Merge candles, sorted by time, keeping one candle per timestamp.
+
+        :param parts: Candles
+        :type parts: iterable
+
+        :return: Candles
+        :rtype: Candles
+        """
+
+        parts = [part for part in parts if len(part)]
+        if not parts:
+            return cls.empty()
+
+        merged = cls(*(np.concatenate([getattr(part, name) for part in parts]) for name in cls.__slots__))
+        return merged.sorted()
+
+    def sorted(self) -> 'Candles':
+        """
+        Sort by time and drop duplicated timestamps (the last occurrence wins).
+
+        :return: Candles
+        :rtype: Candles
+        """
+
+        # np.unique keeps the first occurrence, so search the reversed, stably sorted columns.
+        order = np.argsort(self.time, kind='stable')[::-1]
+        _, first = np.unique(self.time[order], return_index=True)
+        index = order[first]
+        return Candles(*(np.ascontiguousarray(getattr(self, name)[index]) for name in self.__slots__))
+
+    def to_payload(self) -> t.Dict[str, t.List]:
+        return {key: getattr(self, name).tolist() for key, name in zip(_COLUMNS, self.__slots__)}
+
+    def __len__(self):
+        return len(self.time)
+
+    def __str__(self):
+        if not len(self):
+            return f'{self.__class__.__name__} | (size=0)'
+        return f'{self.__class__.__name__} | (size={len(self)}, from={self.time[0]}, to={self.time[-1]})'
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class OHLCDownloader:
+    def __init__(
+            self, client, max_workers: int = 8, window_limit: int = DEFAULT_WINDOW_LIMIT,
+            attempts: int = 3, backoff: float = 0.5, checkpoint: str = None,
+    ) -> None:
+        """
+        Concurrent, resumable downloader of historical candles built on ``Nobitex.ohlc``.
+
+        The requested range is split into windows of at most ``window_limit`` candles, which are
+        fetched concurrently and retried on failure. Windows sit on a fixed grid, whatever the requested
+        range. With a checkpoint file, every finished window is appended to it, and a later ``download``
+        of the same symbol and resolution only fetches windows that are not there yet, even with another
+        start or end.
+
+        :param client: Client (``Nobitex``)
+        :type client: Nobitex
+
+        :param max_workers: Maximum concurrent requests (optional)
+        :type max_workers: int
+
+        :param window_limit: Maximum candles per request (optional)
+        :type window_limit: int
+
+        :param attempts: Attempts per window (optional)
+        :type attempts: int
+
+        :param backoff: Delay before the second attempt in seconds, doubled every attempt (optional)
+        :type backoff: float
+
+        :param checkpoint: Checkpoint file path (JSON lines) (optional)
+        :type checkpoint: str
+
+        :return: None
+        """
+
+        if np is None:
+            raise ImportError('OHLCDownloader requires numpy | Try "pip install nobipy[numpy]"')
+
+        self.client = client
+        self.max_workers = max_workers
+        self.window_limit = window_limit
+        self.attempts = attempts
+        self.backoff = backoff
+        self.checkpoint = checkpoint
+
+        self.__lock = threading.Lock()
+
+    def windows(
+            self, resolution: t.Union[str, int, Resolution], start: int, end: int,
+    ) -> t.List[t.Tuple[int, int]]:
+        """
+        Split ``[start, end]`` into request windows on a grid of ``window_limit`` candles counted from the
+        epoch, so that downloads of overlapping ranges share their windows. The first window may begin
+        before ``start``; the last one ends at ``end``.
+
+        :param resolution: Resolution
+        :type resolution: str | int | Resolution
+
+        :param start: Start, epoch seconds
+        :type start: int
+
+        :param end: End, epoch seconds (inclusive)
+        :type end: int
+
+        :return: ``(from, to)`` pairs
+        :rtype: list
+        """
+
+        step = resolution_seconds(resolution)
+        span = step * self.window_limit
+        start -= start % span
+
+        return [(lo, min(end, lo + span - 1)) for lo in range(start, end + 1, span)]
+
+    def _load_checkpoint(self, symbol: str, resolution: str) -> t.Dict[int, t.Tuple[int, Candles]]:
+        # Window start -> (end, candles) of the longest checkpointed window starting there.
+        done = {}
+        if not self.checkpoint or not os.path.exists(self.checkpoint):
+            return done
+
+        with open(self.checkpoint) as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A line cut short by an interruption; the window is fetched again.
+                    continue
+                if record.get('symbol') != symbol or record.get('resolution') != resolution:
+                    continue
+                if record['from'] not in done or record['to'] > done[record['from']][0]:
+                    done[record['from']] = (record['to'], Candles.from_payload(record))
+        return done
+
+    def _save_checkpoint(self, symbol: str, resolution: str, window: t.Tuple[int, int], candles: Candles) -> None:
+        if not self.checkpoint:
+            return
+
+        record = dict(
+            candles.to_payload(), symbol=symbol, resolution=resolution, **{'from': window[0], 'to': window[1]},
+        )
+        line = json.dumps(record, separators=(',', ':')) + '\n'
+        with self.__lock:
+            with open(self.checkpoint, 'a') as f:
+                f.write(line)
+                f.flush()
+
+    def _fetch(self, symbol: str, resolution: str, window: t.Tuple[int, int]) -> Candles:
+        for attempt in range(1, self.attempts + 1):
+            try:
+                payload = self.client.ohlc(symbol, resolution, window[0], window[1])
+                break
+            except NobitexExceptions:
+                if attempt == self.attempts:
+                    raise
+                time.sleep(self.backoff * 2 ** (attempt - 1))
+
+        candles = Candles.from_payload(payload)
+        self._save_checkpoint(symbol, resolution, window, candles)
+        return candles
+
+    def download(
+            self, symbol: str, resolution: t.Union[str, int, Resolution], start: int, end: int,
+    ) -> Candles:
+        """
+        Download candles of ``[start, end]``.
+
+        Windows that still fail after every attempt are raised once all other windows have finished,
+        so a rerun with the same checkpoint only repeats the failed ones.
+
+        :param symbol: Symbol
+        :type symbol: str
+
+        :param resolution: Resolution
+        :type resolution: str | int | Resolution
+
+        :param start: Start, epoch seconds
+        :type start: int
+
+        :param end: End, epoch seconds (inclusive)
+        :type end: int
+
+        :raises: NobitexExceptions
+
+        :return: Candles
+        :rtype: Candles
+        """
+
+        symbol = symbol.upper()
+        resolution = str(resolution)
+
+        windows = self.windows(resolution, start, end)
+        done = self._load_checkpoint(symbol, resolution)
+        # A window is done when a checkpointed window with the same start reaches at least as far.
+        finished = [window for window in windows if window[0] in done and done[window[0]][0] >= window[1]]
+        pending = [window for window in windows if window not in finished]
+
+        errors = []
+        parts = [done[window[0]][1] for window in finished]
+
+        if pending:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(pending))) as executor:
+                futures = [executor.submit(self._fetch, symbol, resolution, window) for window in pending]
+                for future in futures:
+                    try:
+                        parts.append(future.result())
+                    except NobitexExceptions as e:
+                        errors.append(e)
+
+        if errors:
+            raise errors[0]
+
+        candles = Candles.concatenate(parts)
+        if not len(candles):
+            return candles
+
+        mask = (candles.time >= start) & (candles.time <= end)
+        return Candles(*(np.ascontiguousarray(getattr(candles, name)[mask]) for name in Candles.__slots__))
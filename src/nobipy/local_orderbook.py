@@ -0,0 +1,224 @@
+import threading
+import typing as t
+from bisect import bisect_left, insort
+from collections import namedtuple
+
+from .const import Orderbook
+
+
+__all__ = [
+    'LevelChange',
+    'LocalOrderBook',
+]
+
+
+LevelChange = namedtuple('LevelChange', ('side', 'price', 'quantity', 'previous'))
+LevelChange.__doc__ = """
+Change of one price level. ``quantity`` is 0 when the level was removed and ``previous`` is 0 when it is new.
+"""
+
+
+class _BookSide:
+    __slots__ = ('name', 'levels', 'prices', 'raw')
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.levels: t.Dict[float, float] = {}
+        self.prices: t.List[float] = []  # ascending
+        self.raw: t.Optional[t.List] = None
+
+    def diff(self, raw: t.List) -> t.List[LevelChange]:
+        """
+        Apply a full side snapshot and return the levels that changed.
+        """
+
+        # Untouched sides compare equal in C without converting a single level.
+        if raw == self.raw:
+            return []
+        self.raw = raw
+
+        incoming = {
+            float(level[Orderbook.PriceIndex]): float(level[Orderbook.QuantityIndex]) for level in raw
+        }
+        levels = self.levels
+        prices = self.prices
+        changes = []
+        added = 0
+
+        for price, quantity in incoming.items():
+            previous = levels.get(price)
+            if previous is None:
+                insort(prices, price)
+                changes.append(LevelChange(self.name, price, quantity, 0.0))
+                added += 1
+            elif previous != quantity:
+                changes.append(LevelChange(self.name, price, quantity, previous))
+
+        # Levels that disappeared, counted without scanning the old book.
+        if len(levels) + added != len(incoming):
+            for price in levels.keys() - incoming.keys():
+                del prices[bisect_left(prices, price)]
+                changes.append(LevelChange(self.name, price, 0.0, levels[price]))
+
+        self.levels = incoming
+        return changes
+
+
+class LocalOrderBook:
+    def __init__(self, symbol: str, client=None) -> None:
+        """
+        In-memory order book for one symbol, maintained from successive ``orderbook`` snapshots.
+
+        Each snapshot is diffed against the current book and only changed levels are applied.
+        Listeners receive the list of ``LevelChange`` events of every update, and top-of-book reads
+        are O(1) between updates.
+
+        :param symbol: Symbol
+        :type symbol: str
+
+        :param client: Client used by ``refresh`` (``Nobitex`` or anything with an ``orderbook`` method) (optional)
+        :type client: Nobitex
+
+        :return: None
+        """
+
+        self.symbol = symbol.upper()
+        self.client = client
+        self.last_update: t.Optional[int] = None
+
+        self.__bids = _BookSide('bids')
+        self.__asks = _BookSide('asks')
+        self.__lock = threading.Lock()
+        self.__listeners: t.List[t.Callable[['LocalOrderBook', t.List[LevelChange]], None]] = []
+
+    def add_listener(self, callback: t.Callable[['LocalOrderBook', t.List[LevelChange]], None]) -> None:
+        """
+        Register a callback called as ``callback(book, changes)`` after every update with changes.
+
+        :param callback: Callback
+        :type callback: callable
+
+        :return: None
+        """
+
+        self.__listeners.append(callback)
+
+    def remove_listener(self, callback: t.Callable) -> None:
+        """
+        Unregister a callback.
+
+        :param callback: Callback
+        :type callback: callable
+
+        :return: None
+        """
+
+        self.__listeners.remove(callback)
+
+    def apply(self, payload: t.Dict) -> t.List[LevelChange]:
+        """
+        Apply a decoded ``orderbook`` response.
+
+        Snapshots whose ``lastUpdate`` is not newer than the current one are ignored.
+
+        :param payload: Decoded response body
+        :type payload: dict
+
+        :return: Changed levels
+        :rtype: list
+        """
+
+        last_update = payload.get('lastUpdate')
+
+        with self.__lock:
+            if last_update is not None and self.last_update is not None and last_update <= self.last_update:
+                return []
+
+            changes = self.__bids.diff(payload.get('bids') or [])
+            changes.extend(self.__asks.diff(payload.get('asks') or []))
+            self.last_update = last_update
+
+        if changes:
+            for listener in self.__listeners:
+                listener(self, changes)
+
+        return changes
+
+    def refresh(self) -> t.List[LevelChange]:
+        """
+        Fetch a new snapshot with the client and apply it.
+
+        :return: Changed levels
+        :rtype: list
+        """
+
+        return self.apply(self.client.orderbook(self.symbol))
+
+    @property
+    def best_bid(self) -> t.Optional[t.Tuple[float, float]]:
+        with self.__lock:
+            prices = self.__bids.prices
+            if not prices:
+                return None
+            price = prices[-1]
+            return price, self.__bids.levels[price]
+
+    @property
+    def best_ask(self) -> t.Optional[t.Tuple[float, float]]:
+        with self.__lock:
+            prices = self.__asks.prices
+            if not prices:
+                return None
+            price = prices[0]
+            return price, self.__asks.levels[price]
+
+    @property
+    def spread(self) -> t.Optional[float]:
+        bid, ask = self.best_bid, self.best_ask
+        if bid is None or ask is None:
+            return None
+        return ask[0] - bid[0]
+
+    def bids(self, depth: int = None) -> t.List[t.Tuple[float, float]]:
+        """
+        Bid levels, highest price first.
+
+        :param depth: Number of levels, all when omitted (optional)
+        :type depth: int
+
+        :return: ``(price, quantity)`` pairs
+        :rtype: list
+        """
+
+        with self.__lock:
+            prices = self.__bids.prices
+            selected = prices[::-1] if depth is None else prices[:-depth - 1:-1]
+            return [(price, self.__bids.levels[price]) for price in selected]
+
+    def asks(self, depth: int = None) -> t.List[t.Tuple[float, float]]:
+        """
+        Ask levels, lowest price first.
+
+        :param depth: Number of levels, all when omitted (optional)
+        :type depth: int
+
+        :return: ``(price, quantity)`` pairs
+        :rtype: list
+        """
+
+        with self.__lock:
+            prices = self.__asks.prices
+            selected = prices if depth is None else prices[:depth]
+            return [(price, self.__asks.levels[price]) for price in selected]
+
+    def __len__(self):
+        return len(self.__bids.prices) + len(self.__asks.prices)
+
+    def __str__(self):
+        return (
+            f'{self.__class__.__name__} | (symbol={self.symbol}, best_bid={self.best_bid}, '
+            f'best_ask={self.best_ask}, last_update={self.last_update})'
+        )
+
+    def __repr__(self):
+        return self.__str__()
@@ -1,10 +1,26 @@
+import json
+import time
 import typing as t
+from datetime import datetime
 
 import requests
 from simplejson import JSONDecodeError
 
 from .exceptions import *
 from .const import *
+from .transport import HTTPTransport
+from .decoders import Decoder, get_decoder
+from .models import build_models
+from .cache import MISSING, ResponseCache
+from .ratelimit import RateLimiter
+from .retry import RetryPolicy
+from .singleflight import SingleFlight
+from .snapshot import OrderbookSnapshot
+from .pagination import iter_records
+from .batch import BatchResult, run_batch
+from .metrics import Metrics
+from .tracing import RequestTrace, Tracer, activate
+from .endpoints import ENDPOINTS, Endpoint
 
 
 __all__ = [
@@ -13,7 +29,12 @@ __all__ = [
 ]
 
 
-def get_token(username: str, password: str) -> t.Dict:
+def _context(func_name: str, additional: t.Dict = None, **extra) -> t.Dict:
+    # Arguments attached to an exception, built only when one is raised.
+    return dict(additional or (), func_name=func_name, **extra)
+
+
+def get_token(username: str, password: str, base_url: str = BASE_URL) -> t.Dict:
     """
     Get a token from the Nobitex API.
 
@@ -23,6 +44,9 @@ def get_token(username: str, password: str) -> t.Dict:
     :param password: Nobitex account password
     :type password: str
 
+    :param base_url: API root, e.g. a local stand-in server (optional)
+    :type base_url: str
+
     :raises: NobitexAPIException
 
     :return: Token
@@ -38,7 +62,7 @@ def get_token(username: str, password: str) -> t.Dict:
     }
 
     try:
-        r = requests.post('https://api.nobitex.ir/auth/login/', json=json_data, timeout=5)
+        r = requests.post(base_url.rstrip('/') + '/auth/login/', json=json_data, timeout=5)
     except Exception as e:
         raise RequestsExceptions('get_token', e, __locals)
 
@@ -57,7 +81,14 @@ def get_token(username: str, password: str) -> t.Dict:
 
 
 class Nobitex:
-    def __init__(self, token: str = None, timeout: int = 5) -> None:
+    def __init__(
+            self, token: str = None, timeout: int = 5, transport: HTTPTransport = None,
+            pool_connections: int = 10, pool_maxsize: int = 10, keep_alive: bool = True,
+            decoder: t.Union[str, Decoder] = 'auto',
+            models: bool = False, cache: t.Union[bool, ResponseCache] = None, coalesce: bool = False,
+            rate_limiter: t.Union[bool, RateLimiter] = None, retry: t.Union[bool, RetryPolicy] = None,
+            metrics: t.Union[bool, Metrics] = None, tracer: Tracer = None, base_url: str = BASE_URL,
+    ) -> None:
         """
         Initialize a Nobitex API object.
 
@@ -67,18 +98,86 @@ class Nobitex:
         :param timeout: Timeout (optional)
         :type timeout: int
 
+        :param transport: Shared transport; the pool options below are ignored when given (optional)
+        :type transport: HTTPTransport
+
+        :param pool_connections: Number of per-host connection pools to cache (optional)
+        :type pool_connections: int
+
+        :param pool_maxsize: Maximum number of connections kept per host (optional)
+        :type pool_maxsize: int
+
+        :param keep_alive: Whether to reuse connections between requests (optional)
+        :type keep_alive: bool
+
+        :param decoder: JSON decoder name ('auto', 'json', 'simplejson', 'orjson', 'ujson') or callable (optional)
+        :type decoder: str | callable
+
+        :param models: Return orders, trades, wallets and market stats as typed models (optional)
+        :type models: bool
+
+        :param cache: Cache for public market-data responses; True uses a default ResponseCache (optional)
+        :type cache: bool | ResponseCache
+
+        :param coalesce: Share one in-flight request between concurrent identical public GETs (optional)
+        :type coalesce: bool
+
+        :param rate_limiter: Client-side rate limiter; True uses a default RateLimiter (optional)
+        :type rate_limiter: bool | RateLimiter
+
+        :param retry: Retry policy for idempotent endpoints; True uses a default RetryPolicy (optional)
+        :type retry: bool | RetryPolicy
+
+        :param metrics: Per-endpoint metrics; True uses a new Metrics (optional)
+        :type metrics: bool | Metrics
+
+        :param tracer: Per-request phase tracing; network phases need a transport created with tracing=True (optional)
+        :type tracer: Tracer
+
+        :param base_url: API root, e.g. a local stand-in server (optional)
+        :type base_url: str
+
         :raises: TokenExceptions
 
         :return: None
         """
 
-        self.__base_url = 'https://api.nobitex.ir'
+        self.__base_url = base_url.rstrip('/')
         self.__token = token
         self.__timeout = timeout
-        self.__headers = {
+        self.__transport = transport if transport is not None else HTTPTransport(
+            pool_connections=pool_connections, pool_maxsize=pool_maxsize, keep_alive=keep_alive,
+            tracing=tracer is not None,
+        )
+        self.__decoder = get_decoder(decoder)
+        self.__models = models
+        self.__cache = ResponseCache() if cache is True else (cache or None)
+        self.__flight = SingleFlight() if coalesce else None
+        self.__rate_limiter = RateLimiter() if rate_limiter is True else (rate_limiter or None)
+        self.__retry = RetryPolicy() if retry is True else (retry or None)
+        self.__metrics = Metrics() if metrics is True else (metrics or None)
+        self.__tracer = tracer
+        self.__senders = {'GET': self._get, 'POST': self._post}
+        self.__headers, self.__auth_headers = self._build_headers(token)
+
+    @staticmethod
+    def _build_headers(token: t.Optional[str]) -> t.Tuple[t.Dict[str, str], t.Optional[t.Dict[str, str]]]:
+        """
+        Build the request headers once. They are shared by all requests and never modified; a new token
+        replaces them as a whole.
+
+        :param token: Token
+        :type token: str | None
+
+        :return: Public headers, and authenticated headers (None without a token)
+        :rtype: tuple
+        """
+
+        headers = {
             'Content-Type': 'application/json',
             'Accept': 'application/json',
         }
+        return headers, None if token is None else dict(headers, Authorization='Token ' + token)
 
     def set_token(self, token: str) -> str:
         """
@@ -91,9 +190,102 @@ class Nobitex:
         :rtype: str
         """
 
+        self.__headers, self.__auth_headers = self._build_headers(token)
         self.__token = token
         return self.__token
 
+    @property
+    def base_url(self) -> str:
+        """
+        API root
+
+        :return: Base URL
+        :rtype: str
+        """
+
+        return self.__base_url
+
+    @property
+    def cache(self) -> t.Optional[ResponseCache]:
+        """
+        Response cache for public endpoints
+
+        :return: Cache
+        :rtype: ResponseCache | None
+        """
+
+        return self.__cache
+
+    @property
+    def rate_limiter(self) -> t.Optional[RateLimiter]:
+        """
+        Client-side rate limiter
+
+        :return: Rate limiter
+        :rtype: RateLimiter | None
+        """
+
+        return self.__rate_limiter
+
+    @property
+    def retry(self) -> t.Optional[RetryPolicy]:
+        """
+        Retry policy
+
+        :return: Retry policy
+        :rtype: RetryPolicy | None
+        """
+
+        return self.__retry
+
+    @property
+    def metrics(self) -> t.Optional[Metrics]:
+        """
+        Per-endpoint metrics
+
+        :return: Metrics
+        :rtype: Metrics | None
+        """
+
+        return self.__metrics
+
+    @property
+    def tracer(self) -> t.Optional[Tracer]:
+        """
+        Request phase tracer
+
+        :return: Tracer
+        :rtype: Tracer | None
+        """
+
+        return self.__tracer
+
+    @property
+    def transport(self) -> HTTPTransport:
+        """
+        Transport used to send requests
+
+        :return: Transport
+        :rtype: HTTPTransport
+        """
+
+        return self.__transport
+
+    def close(self) -> None:
+        """
+        Close pooled connections
+
+        :return: None
+        """
+
+        self.__transport.close()
+
+    def __enter__(self) -> 'Nobitex':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
     def _get(
             self, url: str, headers: t.Dict = None,
             params: t.Dict = None, data: t.Dict = None, json_data: t.Dict = None,
@@ -122,7 +314,8 @@ class Nobitex:
         :rtype: requests.Response
         """
 
-        response = requests.get(
+        response = self.__transport.send(
+            'GET',
             self.__base_url + url,
             headers=headers,
             params=params,
@@ -161,7 +354,8 @@ class Nobitex:
         :rtype: requests.Response
         """
 
-        response = requests.post(
+        response = self.__transport.send(
+            'POST',
             self.__base_url + url,
             headers=headers,
             params=params,
@@ -175,7 +369,7 @@ class Nobitex:
     def _request(
             self, method: str, url: str, auth: bool = False,
             params: t.Dict = None, data: t.Dict = None, json_data: t.Dict = None,
-            func_name: str = '_request',
+            func_name: str = '_request', trace: RequestTrace = None,
     ) -> requests.Response:
         """
         Make a request to the Nobitex API.
@@ -201,35 +395,71 @@ class Nobitex:
         :param func_name: Function name (optional)
         :type func_name: str
 
+        :param trace: Trace receiving the network phases (optional)
+        :type trace: RequestTrace
+
         :return: Response
         :rtype: requests.Response
         """
 
-        __locals = locals()
-
         if auth is True:
-            if self.__token is None:
-                raise InvalidTokenExceptions(func_name, 'No token | Try setting via "set_token" method', __locals)
-            headers = self.__headers
-            headers['Authorization'] = 'Token ' + self.__token
+            headers = self.__auth_headers
+            if headers is None:
+                raise InvalidTokenExceptions(
+                    func_name, 'No token | Try setting via "set_token" method',
+                    _context(func_name, method=method, url=url),
+                )
         else:
             headers = self.__headers
 
-        if method.upper() == 'GET':
-            return self._get(url, headers, params, data, json_data)
-        elif method.upper() == 'POST':
-            return self._post(url, headers, params, data, json_data)
-        else:
-            raise NobitexExceptions(func_name, 'Invalid method', __locals)
+        send = self.__senders.get(method) or self.__senders.get(method.upper())
+        if send is None:
+            raise NobitexExceptions(func_name, 'Invalid method', _context(func_name, method=method, url=url))
+
+        rate_limiter = self.__rate_limiter
+        if rate_limiter is not None:
+            if trace is not None:
+                waiting = time.perf_counter()
+            rate_limiter.acquire(func_name)
+            if trace is not None:
+                trace.add('rate_limit', time.perf_counter() - waiting)
+
+        metrics = self.__metrics
+        if metrics is not None:
+            started = time.perf_counter()
+
+        try:
+            if trace is not None:
+                with activate(trace):
+                    response = send(url, headers, params, data, json_data)
+                trace.status_code = response.status_code
+            else:
+                response = send(url, headers, params, data, json_data)
+        except requests.RequestException as e:
+            raise RequestsExceptions(func_name, e, _context(func_name, method=method, url=url)) from e
+
+        if metrics is not None:
+            body = getattr(response.request, 'body', None)
+            metrics.observe_response(
+                func_name, response.status_code, time.perf_counter() - started,
+                len(body) if body else 0, len(response.content),
+            )
+
+        if rate_limiter is not None:
+            rate_limiter.feedback(func_name, response.status_code, response.headers.get('Retry-After'))
+
+        return response
 
     @staticmethod
     def _raise_for_exception(
             response: requests.Response,
             func_name: str = '_raise_for_exception',
-            additional: t.Dict = None
-    ) -> None:
+            additional: t.Dict = None,
+            decoder: Decoder = None,
+            trace: RequestTrace = None,
+    ) -> t.Dict:
         """
-        Raise exception if response status code is not 200.
+        Raise exception if the response is invalid, decoding its body exactly once.
 
         :param response: Response
         :type response: requests.Response
@@ -237,40 +467,126 @@ class Nobitex:
         :param func_name: Function name (optional)
         :type func_name: str
 
+        :param additional: Arguments (optional)
+        :type additional: dict
+
+        :param decoder: JSON decoder (optional)
+        :type decoder: callable
+
+        :param trace: Trace receiving the decode and validation phases (optional)
+        :type trace: RequestTrace
+
         :raises: NobitexAPIException
 
+        :return: Decoded response body
+        :rtype: dict
+        """
+
+        # The error context is only built once something is wrong.
+        if trace is not None:
+            started = time.perf_counter()
+
+        status_code = response.status_code
+        if not 200 <= status_code < 300:
+            Nobitex._raise_for_status(
+                status_code, response.url, func_name, _context(func_name, additional, response=response),
+            )
+
+        if trace is not None:
+            decoding = time.perf_counter()
+            trace.add('validation', decoding - started)
+
+        try:
+            r_json: t.Dict = (decoder or json.loads)(response.content)
+        except Exception as e:
+            raise JsonDecodingExceptions(func_name, e, _context(func_name, additional, response=response))
+
+        if trace is not None:
+            decoded = time.perf_counter()
+            trace.add('decode', decoded - decoding)
+
+        if type(r_json) is not dict or r_json.get('status') != 'ok':
+            Nobitex._raise_for_payload(r_json, func_name, _context(func_name, additional, response=response))
+
+        if trace is not None:
+            trace.add('validation', time.perf_counter() - decoded)
+
+        return r_json
+
+    @staticmethod
+    def _raise_for_status(
+            status_code: int, url: str,
+            func_name: str = '_raise_for_status',
+            additional: t.Dict = None
+    ) -> None:
+        """
+        Raise exception if status code is not 2xx.
+
+        :param status_code: HTTP status code
+        :type status_code: int
+
+        :param url: Requested URL
+        :type url: str
+
+        :param func_name: Function name (optional)
+        :type func_name: str
+
+        :param additional: Arguments (optional)
+        :type additional: dict
+
+        :raises: StatusCodeExceptions
+
         :return: None
         :rtype: None
         """
 
-        additional.update(locals())
+        if not 200 <= status_code < 300:
+            raise StatusCodeExceptions(func_name, status_code, f'invalid status code | {url}', additional)
 
-        if 200 <= response.status_code < 300:
-            try:
-                r_json: t.Dict = response.json()
-            except Exception as e:
-                raise JsonDecodingExceptions(func_name, e, additional)
+    @staticmethod
+    def _raise_for_payload(
+            r_json: t.Dict,
+            func_name: str = '_raise_for_payload',
+            additional: t.Dict = None
+    ) -> None:
+        """
+        Raise exception if decoded response body does not report "ok" status.
 
-            if "status" in r_json.keys():
-                pass
-            else:
-                raise InvalidResponseExceptions(func_name, '"status" key not found', additional)
+        :param r_json: Decoded response body
+        :type r_json: dict
 
-            if r_json['status'].lower() == 'ok':
-                pass
-            else:
+        :param func_name: Function name (optional)
+        :type func_name: str
+
+        :param additional: Arguments (optional)
+        :type additional: dict
+
+        :raises: InvalidResponseExceptions, CreateOrderException
+
+        :return: None
+        :rtype: None
+        """
+
+        if isinstance(r_json, dict) and "status" not in r_json.keys() and "s" in r_json.keys():
+            # UDF endpoints (ohlc) report "s", which is "no_data" for an empty range
+            if r_json['s'].lower() not in ('ok', 'no_data'):
                 raise InvalidResponseExceptions(func_name, f'response status is not ok | {r_json}', additional)
+            return
 
-        else:
-            raise StatusCodeExceptions(
-                func_name, response.status_code, f'invalid status code | {response.url}', additional
-            )
+        if not isinstance(r_json, dict) or "status" not in r_json.keys():
+            raise InvalidResponseExceptions(func_name, '"status" key not found', additional)
+
+        if r_json['status'].lower() != 'ok':
+            if func_name == 'create_order' and r_json.get('code') in CREATE_ORDER_EXCEPTIONS:
+                raise CREATE_ORDER_EXCEPTIONS[r_json['code']](r_json.get('message', r_json['code']), additional)
+            raise InvalidResponseExceptions(func_name, f'response status is not ok | {r_json}', additional)
 
     def _process_response(
             self,
             response: requests.Response,
             func_name: str = '_process_response',
             additional: t.Dict = None,
+            trace: RequestTrace = None,
     ) -> t.Dict:
         """
         Process the response from the Nobitex API.
@@ -284,14 +600,127 @@ class Nobitex:
         :param additional: Arguments (optional)
         :type additional: dict
 
+        :param trace: Trace receiving the decode and validation phases (optional)
+        :type trace: RequestTrace
+
+        :raises: NobitexAPIException
+
+        :return: Response
+        :rtype: dict
+        """
+
+        return self._raise_for_exception(response, func_name, additional, self.__decoder, trace)
+
+    def _call(
+            self, method: str, url: str, auth: bool = False,
+            params: t.Dict = None, data: t.Dict = None, json_data: t.Dict = None,
+            func_name: str = '_call', additional: t.Dict = None,
+    ) -> t.Dict:
+        """
+        Make a request and return the validated, decoded response.
+
+        Failed attempts are retried according to the retry policy. Unauthenticated requests are served from the
+        response cache when one is configured, and concurrent identical unauthenticated GETs share one in-flight
+        request when coalescing is enabled.
+
+        :param method: HTTP method
+        :type method: str
+
+        :param url: URL
+        :type url: str
+
+        :param auth: Whether to use authentication (optional)
+        :type auth: bool
+
+        :param params: Query parameters (optional)
+        :type params: dict
+
+        :param data: Request body (optional)
+        :type data: dict
+
+        :param json_data: Request body (optional)
+        :type json_data: dict
+
+        :param func_name: Function name (optional)
+        :type func_name: str
+
+        :param additional: Arguments (optional)
+        :type additional: dict
+
+        :raises: NobitexAPIException
+
+        :return: Response
+        :rtype: dict
+        """
+
+        cache = self.__cache
+        cacheable = cache is not None and not auth and cache.cacheable(func_name)
+        coalesce = self.__flight is not None and not auth and method == 'GET'
+        key = ResponseCache.make_key(func_name, method, url, params, json_data) if cacheable or coalesce else None
+
+        metrics = self.__metrics
+        tracer = self.__tracer
+
+        def fetch() -> t.Dict:
+            retry = self.__retry
+            started = time.monotonic()
+            attempt = 0
+            while True:
+                trace = tracer.start(func_name, method, url) if tracer is not None else None
+                try:
+                    response = self._request(method, url, auth, params, data, json_data, func_name, trace)
+                    result = self._process_response(response, func_name, additional, trace)
+                    if trace is not None:
+                        tracer.finish(trace)
+                    break
+                except NobitexExceptions as e:
+                    if trace is not None:
+                        tracer.fail(trace, e)
+                    if metrics is not None:
+                        metrics.observe_error(func_name, e)
+                    attempt += 1
+                    delay = retry.next_delay(func_name, attempt, e, started) if retry is not None else None
+                    if delay is None:
+                        raise
+                    if metrics is not None:
+                        metrics.observe_retry(func_name)
+                    time.sleep(delay)
+            if cacheable:
+                cache.set(key, result)
+            return result
+
+        r_json = cache.get(key) if cacheable else MISSING
+        if cacheable and metrics is not None:
+            metrics.observe_cache(func_name, r_json is not MISSING)
+
+        if r_json is MISSING:
+            if coalesce:
+                r_json = self.__flight.do(key, fetch)
+            else:
+                r_json = fetch()
+
+        if self.__models:
+            return build_models(func_name, r_json, additional)
+        return r_json
+
+    def _invoke(self, endpoint: Endpoint, arguments: t.Dict) -> t.Dict:
+        """
+        Call a declared endpoint.
+
+        :param endpoint: Endpoint declaration
+        :type endpoint: Endpoint
+
+        :param arguments: Method arguments by name; also attached to exceptions
+        :type arguments: dict
+
         :raises: NobitexAPIException
 
         :return: Response
         :rtype: dict
         """
 
-        self._raise_for_exception(response, func_name, additional)
-        return response.json()
+        path, params, json_data = endpoint.build(arguments)
+        return self._call(endpoint.method, path, endpoint.auth, params, None, json_data, endpoint.name, arguments)
 
     def orderbook(self, symbol: str) -> t.Dict[str, t.List]:
         """
@@ -304,14 +733,20 @@ class Nobitex:
         :rtype: dict
         """
 
-        __locals = locals()
-        url = f'/v2/orderbook/{symbol.upper()}'
+        return self._invoke(ENDPOINTS['orderbook'], {'symbol': symbol})
 
-        response = self._request(
-            'GET', url, auth=False, params=None, data=None, json_data=None, func_name='orderbook'
-        )
+    def orderbook_snapshot(self, symbol: str) -> OrderbookSnapshot:
+        """
+        Get orderbook as a numpy-backed snapshot
+
+        :param symbol: Symbol
+        :type symbol: str
+
+        :return: Orderbook snapshot
+        :rtype: OrderbookSnapshot
+        """
 
-        return self._process_response(response, func_name='orderbook', additional=__locals)
+        return OrderbookSnapshot.from_payload(self.orderbook(symbol), symbol=symbol.upper())
 
     def trades(self, symbol: str) -> t.Dict:
         """
@@ -324,42 +759,104 @@ class Nobitex:
         :rtype: dict
         """
 
-        __locals = locals()
-        url = f'/v2/trades/{symbol.upper()}'
+        return self._invoke(ENDPOINTS['trades'], {'symbol': symbol})
 
-        response = self._request(
-            'GET', url, auth=False, params=None, data=None, json_data=None, func_name='trades'
-        )
+    def orderbooks(
+            self, symbols: t.Iterable[str], max_workers: int = 8, return_exceptions: bool = False,
+    ) -> t.Dict[str, t.Dict]:
+        """
+        Get orderbook of several symbols concurrently
+
+        :param symbols: Symbols
+        :type symbols: iterable
+
+        :param max_workers: Maximum concurrent requests (optional)
+        :type max_workers: int
+
+        :param return_exceptions: Map failed symbols to their exception instead of raising (optional)
+        :type return_exceptions: bool
+
+        :return: Orderbooks by symbol
+        :rtype: dict
+        """
+
+        symbols = [symbol.upper() for symbol in symbols]
+        results = run_batch(self.orderbook, symbols, max_workers)
+        return results.to_mapping(symbols, return_exceptions)
+
+    def trades_many(
+            self, symbols: t.Iterable[str], max_workers: int = 8, return_exceptions: bool = False,
+    ) -> t.Dict[str, t.Dict]:
+        """
+        Get trades of several symbols concurrently
+
+        :param symbols: Symbols
+        :type symbols: iterable
+
+        :param max_workers: Maximum concurrent requests (optional)
+        :type max_workers: int
 
-        return self._process_response(response, func_name='trades', additional=__locals)
+        :param return_exceptions: Map failed symbols to their exception instead of raising (optional)
+        :type return_exceptions: bool
 
-    def market_stats(self, src_currency: str, dst_currency: Union[str, DstCurrency]) -> t.Dict:
+        :return: Trades by symbol
+        :rtype: dict
+        """
+
+        symbols = [symbol.upper() for symbol in symbols]
+        results = run_batch(self.trades, symbols, max_workers)
+        return results.to_mapping(symbols, return_exceptions)
+
+    def market_stats(
+            self, src_currency: t.Union[str, t.List[str]], dst_currency: t.Union[str, DstCurrency, t.List[str]],
+            batch_size: int = 50, max_workers: int = 8,
+    ) -> t.Dict:
         """
         Get market stats
 
-        :param src_currency: Source currency
-        :type src_currency: str
+        Lists of currencies are sent comma-separated, so one request covers every source/destination pair.
+        Source lists longer than ``batch_size`` are split into batches that are requested concurrently and
+        merged into a single "stats" mapping.
 
-        :param dst_currency: Destination currency
-        :type dst_currency: str | DstCurrency
+        :param src_currency: Source currency or currencies
+        :type src_currency: str | list
+
+        :param dst_currency: Destination currency or currencies
+        :type dst_currency: str | DstCurrency | list
+
+        :param batch_size: Maximum source currencies per request (optional)
+        :type batch_size: int
+
+        :param max_workers: Maximum concurrent requests (optional)
+        :type max_workers: int
 
         :return: Market stats
         :rtype: dict
         """
 
-        __locals = locals()
-        url = f'/market/stats'
+        src_currencies = [src_currency] if isinstance(src_currency, str) else list(src_currency)
+        dst_currencies = [dst_currency] if isinstance(dst_currency, str) else list(dst_currency)
+        batches = [src_currencies[i:i + batch_size] for i in range(0, len(src_currencies), batch_size)]
 
-        json_data = {
-            'srcCurrency': src_currency.lower(),
-            'dstCurrency': dst_currency.lower(),
-        }
+        if len(batches) == 1:
+            return self._market_stats(batches[0], dst_currencies)
 
-        response = self._request(
-            'GET', url, auth=False, params=None, data=None, json_data=json_data, func_name='stats'
+        results = run_batch(
+            lambda batch: self._market_stats(batch, dst_currencies), batches, max_workers,
         )
 
-        return self._process_response(response, func_name='stats', additional=__locals)
+        stats = {}
+        for entry in results:
+            if not entry.ok:
+                raise entry.error
+            stats.update(entry.result.get('stats') or {})
+
+        return {'status': 'ok', 'stats': stats}
+
+    def _market_stats(self, src_currencies: t.List[str], dst_currencies: t.List[str]) -> t.Dict:
+        return self._invoke(
+            ENDPOINTS['market_stats'], {'src_currencies': src_currencies, 'dst_currencies': dst_currencies},
+        )
 
     def ohlc(self, symbol: str, resolution: Union[str, int, Resolution], from_date: int, to_data: int) -> t.Dict:
         """
@@ -381,21 +878,9 @@ class Nobitex:
         :rtype: dict
         """
 
-        __locals = locals()
-        url = f'/market/udf/history'
-
-        params = (
-            ('symbol', symbol.upper()),
-            ('resolution', resolution),
-            ('from', from_date),
-            ('to', to_data),
-        )
-
-        response = self._request(
-            'GET', url, auth=False, params=None, data=None, json_data=None, func_name='stats'
-        )
-
-        return self._process_response(response, func_name='stats', additional=__locals)
+        return self._invoke(ENDPOINTS['ohlc'], {
+            'symbol': symbol, 'resolution': resolution, 'from_date': from_date, 'to_data': to_data,
+        })
 
     def global_stats(self) -> t.Dict:
         """
@@ -405,14 +890,7 @@ class Nobitex:
         :rtype: dict
         """
 
-        __locals = locals()
-        url = f'/market/global-stats'
-
-        response = self._request(
-            'GET', url, auth=False, params=None, data=None, json_data=None, func_name='global_stats'
-        )
-
-        return self._process_response(response, func_name='global_stats', additional=__locals)
+        return self._invoke(ENDPOINTS['global_stats'], {})
 
     def create_order(
             self, side: Union[str, Side], execution: Union[str, ExecutionType],
@@ -447,32 +925,19 @@ class Nobitex:
         :rtype: dict
         """
 
-        __locals = locals()
-        url = f'/market/orders/add'
-
-        json_data = {
-            'type': side,
-            'execution': execution.lower(),
-            'srcCurrency': src_currency.lower(),
-            'dstCurrency': dst_currency.lower(),
-            'amount': amount,
-            'price': price,
-        }
-
         if execution.lower() in ('stop_limit', 'stop_market'):
             if stop_price is None:
                 raise InvalidInputExceptions(
                     'create_order',
                     'stop_price is required for stop_limit and stop_market orders'
                 )
-            else:
-                json_data['stopPrice'] = stop_price
-
-        response = self._request(
-            'POST', url, auth=True, params=None, data=None, json_data=json_data, func_name='create_order'
-        )
+        else:
+            stop_price = None
 
-        return self._process_response(response, func_name='create_order', additional=__locals)
+        return self._invoke(ENDPOINTS['create_order'], {
+            'side': side, 'execution': execution, 'src_currency': src_currency, 'dst_currency': dst_currency,
+            'amount': amount, 'price': price, 'stop_price': stop_price,
+        })
 
     def order_status(self, order_id: int) -> t.Dict:
         """
@@ -485,22 +950,12 @@ class Nobitex:
         :rtype: dict
         """
 
-        __locals = locals()
-        url = f'/market/orders/status'
-
-        json_data = {
-            'id': order_id,
-        }
-
-        response = self._request(
-            'POST', url, auth=True, params=None, data=None, json_data=json_data, func_name='order_status'
-        )
-
-        return self._process_response(response, func_name='order_status', additional=__locals)
+        return self._invoke(ENDPOINTS['order_status'], {'order_id': order_id})
 
     def open_orders(
             self, status: Union[OpenOrderStatus, str] = OpenOrderStatus.Open,
-            src_currency: str = None, dst_currency: Union[DstCurrency, str] = None, details: int = 1
+            src_currency: str = None, dst_currency: Union[DstCurrency, str] = None, details: int = 1,
+            page: int = None, page_size: int = None,
     ) -> t.Dict:
         """
         Get user open orders
@@ -517,29 +972,20 @@ class Nobitex:
         :param details: Details
         :type details: int
 
+        :param page: Page number (optional)
+        :type page: int
+
+        :param page_size: Page size (optional)
+        :type page_size: int
+
         :return: Open orders
         :rtype: dict
         """
 
-        __locals = locals()
-        url = f'/market/orders/list'
-
-        json_data = {}
-
-        if status:
-            json_data['status'] = status
-        if src_currency:
-            json_data['srcCurrency'] = src_currency.lower()
-        if dst_currency:
-            json_data['dstCurrency'] = dst_currency.lower()
-        if details:
-            json_data['details'] = details
-
-        response = self._request(
-            'POST', url, auth=True, params=None, data=None, json_data=json_data, func_name='open_orders'
-        )
-
-        return self._process_response(response, func_name='open_orders', additional=__locals)
+        return self._invoke(ENDPOINTS['open_orders'], {
+            'status': status, 'src_currency': src_currency, 'dst_currency': dst_currency, 'details': details,
+            'page': page, 'page_size': page_size,
+        })
 
     def update_status(self, order_id: int, status: t.Union[str, UpdateOrderStatus]) -> t.Dict:
         """
@@ -555,19 +1001,48 @@ class Nobitex:
         :rtype: dict
         """
 
-        __locals = locals()
-        url = f'/market/orders/update-status'
+        return self._invoke(ENDPOINTS['update_status'], {'order_id': order_id, 'status': status})
 
-        json_data = {
-            'id': order_id,
-            'status': status,
-        }
+    def create_orders(self, specs: t.List[t.Dict], max_workers: int = 8) -> BatchResult:
+        """
+        Place several orders concurrently
 
-        response = self._request(
-            'POST', url, auth=True, params=None, data=None, json_data=json_data, func_name='order_status'
-        )
+        Each spec holds the keyword arguments of ``create_order``. A rejected order is reported in its
+        entry (typically as a ``CreateOrderException`` subclass) and does not stop the others.
+
+        :param specs: Order specs
+        :type specs: list
+
+        :param max_workers: Maximum concurrent requests (optional)
+        :type max_workers: int
+
+        :return: One entry per spec, in input order
+        :rtype: BatchResult
+        """
+
+        return run_batch(lambda spec: self.create_order(**spec), specs, max_workers)
+
+    def update_statuses(
+            self, order_ids: t.List[int], status: t.Union[str, UpdateOrderStatus] = UpdateOrderStatus.Cancel,
+            max_workers: int = 8,
+    ) -> BatchResult:
+        """
+        Update the status of several orders concurrently
+
+        :param order_ids: Order IDs
+        :type order_ids: list
+
+        :param status: Order status (optional)
+        :type status: str | UpdateOrderStatus
+
+        :param max_workers: Maximum concurrent requests (optional)
+        :type max_workers: int
 
-        return self._process_response(response, func_name='order_status', additional=__locals)
+        :return: One entry per order ID, in input order
+        :rtype: BatchResult
+        """
+
+        return run_batch(lambda order_id: self.update_status(order_id, status), order_ids, max_workers)
 
     def cancel_all_orders(
             self, src_currency: str, dst_currency: t.Union[str, DstCurrency],
@@ -592,24 +1067,9 @@ class Nobitex:
         :rtype: dict
         """
 
-        __locals = locals()
-        url = f'/market/orders/cancel-all'
-
-        json_data = {
-            'srcCurrency': src_currency.lower(),
-            'dstCurrency': dst_currency.lower(),
-        }
-
-        if execution:
-            json_data['execution'] = execution.lower()
-        if hours:
-            json_data['hours'] = hours
-
-        response = self._request(
-            'POST', url, auth=True, params=None, data=None, json_data=json_data, func_name='cancel_all_orders'
-        )
-
-        return self._process_response(response, func_name='cancel_all_orders', additional=__locals)
+        return self._invoke(ENDPOINTS['cancel_all_orders'], {
+            'src_currency': src_currency, 'dst_currency': dst_currency, 'execution': execution, 'hours': hours,
+        })
 
     def user_profile(self) -> t.Dict:
         """
@@ -619,14 +1079,7 @@ class Nobitex:
         :rtype: dict
         """
 
-        __locals = locals()
-        url = f'/users/profile'
-
-        response = self._request(
-            'POST', url, auth=True, params=None, data=None, json_data=None, func_name='user_profile'
-        )
-
-        return self._process_response(response, func_name='user_profile', additional=__locals)
+        return self._invoke(ENDPOINTS['user_profile'], {})
 
     def generate_wallet_address(self, currency: str) -> t.Dict:
         """
@@ -639,18 +1092,7 @@ class Nobitex:
         :rtype: dict
         """
 
-        __locals = locals()
-        url = f'/users/wallets/generate-address'
-
-        json_data = {
-            'currency': currency.lower(),
-        }
-
-        response = self._request(
-            'POST', url, auth=True, params=None, data=None, json_data=json_data, func_name='generate_wallet_address'
-        )
-
-        return self._process_response(response, func_name='generate_wallet_address', additional=__locals)
+        return self._invoke(ENDPOINTS['generate_wallet_address'], {'currency': currency})
 
     def add_bank_card(self, card_number: str, bank_name: str) -> t.Dict:
         """
@@ -666,19 +1108,7 @@ class Nobitex:
         :rtype: dict
         """
 
-        __locals = locals()
-        url = f'/users/cards-add'
-
-        json_data = {
-            'number': card_number.lower(),
-            'bank': bank_name.lower(),
-        }
-
-        response = self._request(
-            'POST', url, auth=True, params=None, data=None, json_data=json_data, func_name='add_bank_card'
-        )
-
-        return self._process_response(response, func_name='add_bank_card', additional=__locals)
+        return self._invoke(ENDPOINTS['add_bank_card'], {'card_number': card_number, 'bank_name': bank_name})
 
     def add_bank_account(self, card_number: str, shaba: str, bank_name: str) -> t.Dict:
         """
@@ -697,20 +1127,9 @@ class Nobitex:
         :rtype: dict
         """
 
-        __locals = locals()
-        url = f'/users/cards-add'
-
-        json_data = {
-            'number': card_number.lower(),
-            'shaba': shaba.lower(),
-            'bank': bank_name.lower(),
-        }
-
-        response = self._request(
-            'POST', url, auth=True, params=None, data=None, json_data=json_data, func_name='add_bank_account'
-        )
-
-        return self._process_response(response, func_name='add_bank_account', additional=__locals)
+        return self._invoke(ENDPOINTS['add_bank_account'], {
+            'card_number': card_number, 'shaba': shaba, 'bank_name': bank_name,
+        })
 
     def user_limitations(self) -> t.Dict:
         """
@@ -720,14 +1139,7 @@ class Nobitex:
         :rtype: dict
         """
 
-        __locals = locals()
-        url = f'/users/limitations'
-
-        response = self._request(
-            'POST', url, auth=True, params=None, data=None, json_data=None, func_name='user_limitations'
-        )
-
-        return self._process_response(response, func_name='user_limitations', additional=__locals)
+        return self._invoke(ENDPOINTS['user_limitations'], {})
 
     def user_wallets(self, currencies: t.List = None) -> t.Dict:
         """
@@ -740,20 +1152,9 @@ class Nobitex:
         :rtype: dict
         """
 
-        __locals = locals()
-
         if currencies is None:
-            url = f'/users/wallets/list'
-            json_data = None
-        else:
-            url = f'/v2/wallets'
-            json_data = {'currencies': ",".join(currencies)}
-
-        response = self._request(
-            'POST', url, auth=True, params=None, data=None, json_data=json_data, func_name='user_wallets'
-        )
-
-        return self._process_response(response, func_name='user_wallets', additional=__locals)
+            return self._invoke(ENDPOINTS['user_wallets'], {})
+        return self._invoke(ENDPOINTS['user_wallets_v2'], {'currencies': currencies})
 
     def balance(self, currency: str) -> t.Dict:
         """
@@ -766,69 +1167,153 @@ class Nobitex:
         :rtype: dict
         """
 
-        __locals = locals()
+        return self._invoke(ENDPOINTS['balance'], {'currency': currency})
 
-        url = f'/users/wallets/balance'
+    def transactions_list(self, wallet_id: int, page: int = None, page_size: int = None) -> t.Dict:
+        """
+        Get user wallets
 
-        json_data = {
-            'currency': currency.lower(),
-        }
+        :param wallet_id: Wallet id
+        :type wallet_id: int
 
-        response = self._request(
-            'POST', url, auth=True, params=None, data=None, json_data=json_data, func_name='balance'
-        )
+        :param page: Page number (optional)
+        :type page: int
+
+        :param page_size: Page size (optional)
+        :type page_size: int
+
+        :return: User transactions
+        :rtype: dict
+        """
 
-        return self._process_response(response, func_name='balance', additional=__locals)
+        return self._invoke(ENDPOINTS['transactions_list'], {
+            'wallet_id': wallet_id, 'page': page, 'page_size': page_size,
+        })
 
-    def transactions_list(self, wallet_id: int) -> t.Dict:
+    def deposits_list(self, wallet_id: int = 'all', page: int = None, page_size: int = None) -> t.Dict:
         """
         Get user wallets
 
         :param wallet_id: Wallet id
         :type wallet_id: int
 
+        :param page: Page number (optional)
+        :type page: int
+
+        :param page_size: Page size (optional)
+        :type page_size: int
+
         :return: User transactions
         :rtype: dict
         """
 
-        __locals = locals()
+        return self._invoke(ENDPOINTS['deposits_list'], {
+            'wallet_id': wallet_id, 'page': page, 'page_size': page_size,
+        })
 
-        url = f'/users/wallets/transactions/list'
+    def iter_transactions(
+            self, wallet_id: int, page_size: int = 50, prefetch: bool = False,
+            since: t.Union[str, datetime] = None, since_id: int = None,
+    ) -> t.Iterator[t.Dict]:
+        """
+        Iterate over wallet transactions, newest first, fetching pages on demand
 
-        json_data = {
-            'wallet': str(wallet_id),
-        }
+        :param wallet_id: Wallet id
+        :type wallet_id: int
 
-        response = self._request(
-            'POST', url, auth=True, params=None, data=None, json_data=json_data, func_name='transactions_list'
-        )
+        :param page_size: Page size (optional)
+        :type page_size: int
+
+        :param prefetch: Request the next page in the background while the current one is consumed (optional)
+        :type prefetch: bool
 
-        return self._process_response(response, func_name='transactions_list', additional=__locals)
+        :param since: Stop at the first record created at or before this time (optional)
+        :type since: str | datetime
 
-    def deposits_list(self, wallet_id: int = 'all') -> t.Dict:
+        :param since_id: Stop at the first record with an id at or below this one (optional)
+        :type since_id: int
+
+        :return: Transactions
+        :rtype: iterator
         """
-        Get user wallets
 
-        :param wallet_id: Wallet id
+        def fetch_page(page: int) -> t.Dict:
+            return self.transactions_list(wallet_id, page=page, page_size=page_size)
+
+        return iter_records(fetch_page, 'transactions', page_size, prefetch, since, since_id)
+
+    def iter_deposits(
+            self, wallet_id: int = 'all', page_size: int = 50, prefetch: bool = False,
+            since: t.Union[str, datetime] = None, since_id: int = None,
+    ) -> t.Iterator[t.Dict]:
+        """
+        Iterate over deposits, newest first, fetching pages on demand
+
+        :param wallet_id: Wallet id (optional)
         :type wallet_id: int
 
-        :return: User transactions
-        :rtype: dict
+        :param page_size: Page size (optional)
+        :type page_size: int
+
+        :param prefetch: Request the next page in the background while the current one is consumed (optional)
+        :type prefetch: bool
+
+        :param since: Stop at the first record created at or before this time (optional)
+        :type since: str | datetime
+
+        :param since_id: Stop at the first record with an id at or below this one (optional)
+        :type since_id: int
+
+        :return: Deposits
+        :rtype: iterator
         """
 
-        __locals = locals()
+        def fetch_page(page: int) -> t.Dict:
+            return self.deposits_list(wallet_id, page=page, page_size=page_size)
 
-        url = f'/users/wallets/deposits/list'
+        return iter_records(fetch_page, 'deposits', page_size, prefetch, since, since_id)
 
-        json_data = {
-            'wallet': str(wallet_id),
-        }
+    def iter_orders(
+            self, status: Union[OpenOrderStatus, str] = OpenOrderStatus.All,
+            src_currency: str = None, dst_currency: Union[DstCurrency, str] = None, details: int = 1,
+            page_size: int = 50, prefetch: bool = False,
+            since: t.Union[str, datetime] = None, since_id: int = None,
+    ) -> t.Iterator[t.Dict]:
+        """
+        Iterate over orders, newest first, fetching pages on demand
 
-        response = self._request(
-            'POST', url, auth=True, params=None, data=None, json_data=json_data, func_name='deposits_list'
-        )
+        :param status: Status (optional)
+        :type status: str or OpenOrderStatus
+
+        :param src_currency: Source currency (optional)
+        :type src_currency: str
+
+        :param dst_currency: Destination currency (optional)
+        :type dst_currency: str or DstCurrency
+
+        :param details: Details (optional)
+        :type details: int
+
+        :param page_size: Page size (optional)
+        :type page_size: int
+
+        :param prefetch: Request the next page in the background while the current one is consumed (optional)
+        :type prefetch: bool
+
+        :param since: Stop at the first record created at or before this time (optional)
+        :type since: str | datetime
+
+        :param since_id: Stop at the first record with an id at or below this one (optional)
+        :type since_id: int
+
+        :return: Orders
+        :rtype: iterator
+        """
+
+        def fetch_page(page: int) -> t.Dict:
+            return self.open_orders(status, src_currency, dst_currency, details, page=page, page_size=page_size)
 
-        return self._process_response(response, func_name='deposits_list', additional=__locals)
+        return iter_records(fetch_page, 'orders', page_size, prefetch, since, since_id)
 
     def __str__(self):
         return f'{self.__class__.__name__} | (token={self.__token})'
@@ -0,0 +1,413 @@
+import threading
+import time
+import typing as t
+import warnings
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+from .exceptions import NobitexExceptions
+from .models import MarketStat
+
+
+__all__ = [
+    'DEFAULT_FIELDS',
+    'MarketSeries',
+    'MarketStatsSampler',
+]
+
+
+DEFAULT_FIELDS = ('latest', 'bestBuy', 'bestSell', 'volumeSrc', 'dayChange')
+
+# Payload key -> model attribute, for clients returning typed models
+_MODEL_ATTRS = {key: name for name, key, _ in MarketStat._fields}
+
+
+def _to_float(value: t.Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float('nan')
+
+
+def _stat_value(item: t.Any, key: str) -> float:
+    if isinstance(item, dict):
+        return _to_float(item.get(key))
+    return _to_float(getattr(item, _MODEL_ATTRS.get(key, key), None))
+
+
+class MarketSeries:
+    def __init__(
+            self, fields: t.Iterable[str] = DEFAULT_FIELDS, capacity: int = 1440,
+            markets: t.Iterable[str] = (),
+    ) -> None:
+        """
+        Columnar ring buffer of market samples with a time axis and a market axis.
+
+        Every field is a ``(capacity, markets)`` ``float64`` array; missing values are ``nan``. Markets
+        seen for the first time widen the arrays, earlier samples of them stay ``nan``. Indicators work
+        on whole arrays and return one value per market, in ``markets`` order.
+
+        Requires the optional ``numpy`` dependency (``pip install nobipy[numpy]``).
+
+        :param fields: Payload keys to keep (optional)
+        :type fields: iterable
+
+        :param capacity: Samples kept per market (optional)
+        :type capacity: int
+
+        :param markets: Markets known upfront (optional)
+        :type markets: iterable
+
+        :return: None
+        """
+
+        if np is None:
+            raise ImportError('MarketSeries requires numpy | Try "pip install nobipy[numpy]"')
+
+        self.fields = tuple(fields)
+        self.capacity = capacity
+        self.markets: t.List[str] = []
+
+        self.__index: t.Dict[str, int] = {}
+        self.__time = np.full(capacity, np.nan)
+        self.__columns = {field: np.full((capacity, 0), np.nan) for field in self.fields}
+        self.__start = 0
+        self.__size = 0
+        self.__lock = threading.RLock()
+
+        self._add_markets(markets)
+
+    def _add_markets(self, markets: t.Iterable[str]) -> None:
+        new = [market for market in dict.fromkeys(markets) if market not in self.__index]
+        if not new:
+            return
+
+        for market in new:
+            self.__index[market] = len(self.markets)
+            self.markets.append(market)
+
+        padding = np.full((self.capacity, len(new)), np.nan)
+        for field, column in self.__columns.items():
+            self.__columns[field] = np.hstack((column, padding))
+
+    def append(self, samples: t.Mapping[str, t.Any], timestamp: float = None) -> None:
+        """
+        Add one sample of every market.
+
+        :param samples: Items by market, as dicts or models (e.g. the ``stats`` of ``market_stats``)
+        :type samples: dict
+
+        :param timestamp: Epoch seconds, defaults to now (optional)
+        :type timestamp: float
+
+        :return: None
+        """
+
+        with self.__lock:
+            self._add_markets(samples)
+
+            if self.__size == self.capacity:
+                row = self.__start
+                self.__start = (self.__start + 1) % self.capacity
+            else:
+                row = (self.__start + self.__size) % self.capacity
+                self.__size += 1
+
+            self.__time[row] = time.time() if timestamp is None else timestamp
+
+            index = np.fromiter((self.__index[market] for market in samples), dtype=np.intp, count=len(samples))
+            for field, column in self.__columns.items():
+                column[row].fill(np.nan)
+                column[row, index] = [_stat_value(item, field) for item in samples.values()]
+
+    def _rows(self, count: t.Optional[int]) -> 'np.ndarray':
+        size = self.__size if count is None else min(count, self.__size)
+        return (self.__start + self.__size - size + np.arange(size)) % self.capacity
+
+    def times(self, count: int = None) -> 'np.ndarray':
+        """
+        Sample times, oldest first.
+
+        :param count: Newest samples only (optional)
+        :type count: int
+
+        :return: Epoch seconds
+        :rtype: numpy.ndarray
+        """
+
+        with self.__lock:
+            return self.__time[self._rows(count)]
+
+    def values(self, field: str, count: int = None) -> 'np.ndarray':
+        """
+        Samples of one field as a ``(samples, markets)`` array, oldest first.
+
+        :param field: Field
+        :type field: str
+
+        :param count: Newest samples only (optional)
+        :type count: int
+
+        :return: Values
+        :rtype: numpy.ndarray
+        """
+
+        with self.__lock:
+            return self.__columns[field][self._rows(count)]
+
+    def latest(self, field: str) -> 'np.ndarray':
+        """
+        Newest value of one field per market.
+
+        :param field: Field
+        :type field: str
+
+        :return: Values
+        :rtype: numpy.ndarray
+        """
+
+        return self.values(field, 1)[-1] if len(self) else np.full(len(self.markets), np.nan)
+
+    def change(self, field: str = 'latest', periods: int = 1) -> 'np.ndarray':
+        """
+        Relative change of every market over the last ``periods`` samples.
+
+        :param field: Field (optional)
+        :type field: str
+
+        :param periods: Samples back (optional)
+        :type periods: int
+
+        :return: Changes, ``nan`` where there is not enough history
+        :rtype: numpy.ndarray
+        """
+
+        values = self.values(field, periods + 1)
+        if len(values) <= periods:
+            return np.full(len(self.markets), np.nan)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return values[-1] / values[0] - 1
+
+    def returns(self, field: str = 'latest', window: int = None) -> 'np.ndarray':
+        """
+        Log returns between consecutive samples as a ``(samples - 1, markets)`` array.
+
+        :param field: Field (optional)
+        :type field: str
+
+        :param window: Number of returns (optional)
+        :type window: int
+
+        :return: Returns
+        :rtype: numpy.ndarray
+        """
+
+        values = self.values(field, None if window is None else window + 1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.diff(np.log(values), axis=0)
+
+    def volatility(self, field: str = 'latest', window: int = 60) -> 'np.ndarray':
+        """
+        Standard deviation of the log returns over the last ``window`` returns.
+
+        :param field: Field (optional)
+        :type field: str
+
+        :param window: Number of returns (optional)
+        :type window: int
+
+        :return: Volatility per market
+        :rtype: numpy.ndarray
+        """
+
+        returns = self.returns(field, window)
+        if not len(returns):
+            return np.full(len(self.markets), np.nan)
+        return _nan_reduce(np.nanstd, returns)
+
+    def mean(self, field: str = 'latest', window: int = 60) -> 'np.ndarray':
+        """
+        Mean over the last ``window`` samples.
+
+        :param field: Field (optional)
+        :type field: str
+
+        :param window: Number of samples (optional)
+        :type window: int
+
+        :return: Mean per market
+        :rtype: numpy.ndarray
+        """
+
+        values = self.values(field, window)
+        if not len(values):
+            return np.full(len(self.markets), np.nan)
+        return _nan_reduce(np.nanmean, values)
+
+    def zscore(self, field: str = 'latest', window: int = 60) -> 'np.ndarray':
+        """
+        Distance of the newest value from the mean of the last ``window`` samples, in standard deviations.
+
+        :param field: Field (optional)
+        :type field: str
+
+        :param window: Number of samples (optional)
+        :type window: int
+
+        :return: Z-score per market, ``nan`` where the window is flat
+        :rtype: numpy.ndarray
+        """
+
+        values = self.values(field, window)
+        if not len(values):
+            return np.full(len(self.markets), np.nan)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            std = _nan_reduce(np.nanstd, values)
+            return np.where(std > 0, (values[-1] - _nan_reduce(np.nanmean, values)) / std, np.nan)
+
+    def to_dict(self, values: 'np.ndarray') -> t.Dict[str, float]:
+        """
+        Label per-market values with their market.
+
+        :param values: One value per market, e.g. the result of ``zscore``
+        :type values: numpy.ndarray
+
+        :return: Values by market
+        :rtype: dict
+        """
+
+        return dict(zip(self.markets, values.tolist()))
+
+    def __len__(self):
+        return self.__size
+
+    def __str__(self):
+        return f'{self.__class__.__name__} | (samples={self.__size}, markets={len(self.markets)})'
+
+    def __repr__(self):
+        return self.__str__()
+
+
+def _nan_reduce(fn: t.Callable, values: 'np.ndarray') -> 'np.ndarray':
+    # All-nan columns are expected (markets added later); silence numpy's warning about them.
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        return fn(values, axis=0)
+
+
+class MarketStatsSampler:
+    def __init__(
+            self, client, src_currency: t.Union[str, t.List[str]], dst_currency: t.Union[str, t.List[str]],
+            interval: float = 60, capacity: int = 1440, fields: t.Iterable[str] = DEFAULT_FIELDS,
+            global_stats: bool = False,
+    ) -> None:
+        """
+        Sample ``market_stats`` (and optionally ``global_stats``) on a schedule into ``MarketSeries``.
+
+        Markets are keyed like the ``stats`` of ``market_stats`` (e.g. ``'btc-rls'``); global prices are
+        keyed ``'<exchange>:<currency>'`` with the single field ``price``.
+
+        :param client: Client (``Nobitex``)
+        :type client: Nobitex
+
+        :param src_currency: Source currencies
+        :type src_currency: str | list
+
+        :param dst_currency: Destination currencies
+        :type dst_currency: str | list
+
+        :param interval: Seconds between samples when running in the background (optional)
+        :type interval: float
+
+        :param capacity: Samples kept per market (optional)
+        :type capacity: int
+
+        :param fields: Payload keys to keep (optional)
+        :type fields: iterable
+
+        :param global_stats: Sample ``global_stats`` too (optional)
+        :type global_stats: bool
+
+        :return: None
+        """
+
+        self.client = client
+        self.src_currency = src_currency
+        self.dst_currency = dst_currency
+        self.interval = interval
+
+        self.stats = MarketSeries(fields, capacity)
+        self.global_stats = MarketSeries(('price',), capacity) if global_stats else None
+        self.error: t.Optional[NobitexExceptions] = None
+
+        self.__stop = threading.Event()
+        self.__thread: t.Optional[threading.Thread] = None
+
+    def sample(self) -> None:
+        """
+        Fetch the endpoints once and append a sample.
+
+        :raises: NobitexExceptions
+
+        :return: None
+        """
+
+        timestamp = time.time()
+        payload = self.client.market_stats(self.src_currency, self.dst_currency)
+        self.stats.append(payload.get('stats') or {}, timestamp)
+
+        if self.global_stats is not None:
+            markets = self.client.global_stats().get('markets') or {}
+            prices = {
+                f'{exchange}:{currency}': {'price': price}
+                for exchange, quotes in markets.items() if isinstance(quotes, dict)
+                for currency, price in quotes.items()
+            }
+            self.global_stats.append(prices, timestamp)
+
+    def _run(self) -> None:
+        while not self.__stop.is_set():
+            try:
+                self.sample()
+                self.error = None
+            except NobitexExceptions as e:
+                # Keep sampling; the failed sample is simply missing from the series.
+                self.error = e
+            self.__stop.wait(self.interval)
+
+    def start(self) -> None:
+        """
+        Start sampling on a background thread.
+
+        :return: None
+        """
+
+        if self.__thread is not None and self.__thread.is_alive():
+            return
+        self.__stop.clear()
+        self.__thread = threading.Thread(target=self._run, name='nobipy-market-stats', daemon=True)
+        self.__thread.start()
+
+    def stop(self, timeout: float = None) -> None:
+        """
+        Stop the background thread.
+
+        :param timeout: Seconds to wait for the thread (optional)
+        :type timeout: float
+
+        :return: None
+        """
+
+        self.__stop.set()
+        if self.__thread is not None:
+            self.__thread.join(timeout)
+            self.__thread = None
+
+    def __str__(self):
+        return f'{self.__class__.__name__} | (samples={len(self.stats)}, markets={len(self.stats.markets)})'
+
+    def __repr__(self):
+        return self.__str__()
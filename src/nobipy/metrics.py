@@ -0,0 +1,262 @@
+import threading
+import typing as t
+from bisect import bisect_left
+
+
+__all__ = [
+    'DEFAULT_BUCKETS',
+    'Metrics',
+]
+
+
+# Latency histogram upper bounds in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _EndpointMetrics:
+    __slots__ = (
+        'buckets', 'count', 'sum', 'statuses', 'errors',
+        'bytes_in', 'bytes_out', 'cache_hits', 'cache_misses', 'retries',
+    )
+
+    def __init__(self, bucket_count: int) -> None:
+        # One extra bucket for +Inf
+        self.buckets = [0] * (bucket_count + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.statuses: t.Dict[int, int] = {}
+        self.errors: t.Dict[str, int] = {}
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.retries = 0
+
+
+def _escape(value: t.Any) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_bound(bound: float) -> str:
+    return repr(float(bound))
+
+
+class Metrics:
+    def __init__(self, buckets: t.Iterable[float] = DEFAULT_BUCKETS, namespace: str = 'nobipy') -> None:
+        """
+        Per-endpoint client metrics.
+
+        Records request latency histograms, response status codes, exception classes, bytes sent and
+        received, and cache and retry counters, all labelled by endpoint name (e.g. ``'orderbook'``).
+        Clients created without metrics skip every recording call, so there is no cost when disabled.
+
+        :param buckets: Latency histogram upper bounds in seconds (optional)
+        :type buckets: iterable
+
+        :param namespace: Prefix of the Prometheus metric names (optional)
+        :type namespace: str
+
+        :return: None
+        """
+
+        self.bounds = tuple(sorted(buckets))
+        self.namespace = namespace
+
+        self.__endpoints: t.Dict[str, _EndpointMetrics] = {}
+        self.__lock = threading.Lock()
+
+    def _endpoint(self, endpoint: str) -> _EndpointMetrics:
+        metrics = self.__endpoints.get(endpoint)
+        if metrics is None:
+            metrics = self.__endpoints[endpoint] = _EndpointMetrics(len(self.bounds))
+        return metrics
+
+    def observe_response(
+            self, endpoint: str, status_code: int, seconds: float, bytes_out: int = 0, bytes_in: int = 0,
+    ) -> None:
+        """
+        Record a response received from the API.
+
+        :param endpoint: Endpoint name
+        :type endpoint: str
+
+        :param status_code: HTTP status code
+        :type status_code: int
+
+        :param seconds: Time from sending the request to reading the body
+        :type seconds: float
+
+        :param bytes_out: Request body size (optional)
+        :type bytes_out: int
+
+        :param bytes_in: Response body size (optional)
+        :type bytes_in: int
+
+        :return: None
+        """
+
+        index = bisect_left(self.bounds, seconds)
+        with self.__lock:
+            metrics = self._endpoint(endpoint)
+            metrics.buckets[index] += 1
+            metrics.count += 1
+            metrics.sum += seconds
+            metrics.statuses[status_code] = metrics.statuses.get(status_code, 0) + 1
+            metrics.bytes_out += bytes_out
+            metrics.bytes_in += bytes_in
+
+    def observe_error(self, endpoint: str, error: BaseException) -> None:
+        """
+        Record an exception raised by a call, e.g. ``StatusCodeExceptions``.
+
+        :param endpoint: Endpoint name
+        :type endpoint: str
+
+        :param error: Exception
+        :type error: BaseException
+
+        :return: None
+        """
+
+        name = error.__class__.__name__
+        with self.__lock:
+            errors = self._endpoint(endpoint).errors
+            errors[name] = errors.get(name, 0) + 1
+
+    def observe_cache(self, endpoint: str, hit: bool) -> None:
+        """
+        Record a response cache lookup.
+
+        :param endpoint: Endpoint name
+        :type endpoint: str
+
+        :param hit: Whether the response was served from the cache
+        :type hit: bool
+
+        :return: None
+        """
+
+        with self.__lock:
+            metrics = self._endpoint(endpoint)
+            if hit:
+                metrics.cache_hits += 1
+            else:
+                metrics.cache_misses += 1
+
+    def observe_retry(self, endpoint: str) -> None:
+        """
+        Record a retried attempt.
+
+        :param endpoint: Endpoint name
+        :type endpoint: str
+
+        :return: None
+        """
+
+        with self.__lock:
+            self._endpoint(endpoint).retries += 1
+
+    def reset(self) -> None:
+        """
+        Drop every recorded value.
+
+        :return: None
+        """
+
+        with self.__lock:
+            self.__endpoints.clear()
+
+    def snapshot(self) -> t.Dict[str, t.Dict]:
+        """
+        Recorded values per endpoint as plain dicts.
+
+        Histogram buckets are cumulative and keyed by their upper bound, ``'+Inf'`` included.
+
+        :return: ``{endpoint: {'requests', 'latency_sum', 'latency_buckets', 'statuses', 'errors',
+            'bytes_in', 'bytes_out', 'cache_hits', 'cache_misses', 'retries'}}``
+        :rtype: dict
+        """
+
+        with self.__lock:
+            snapshot = {}
+            for endpoint, metrics in self.__endpoints.items():
+                cumulative = 0
+                buckets = {}
+                for bound, count in zip(self.bounds + (float('inf'),), metrics.buckets):
+                    cumulative += count
+                    buckets['+Inf' if bound == float('inf') else bound] = cumulative
+
+                snapshot[endpoint] = {
+                    'requests': metrics.count,
+                    'latency_sum': metrics.sum,
+                    'latency_buckets': buckets,
+                    'statuses': dict(metrics.statuses),
+                    'errors': dict(metrics.errors),
+                    'bytes_in': metrics.bytes_in,
+                    'bytes_out': metrics.bytes_out,
+                    'cache_hits': metrics.cache_hits,
+                    'cache_misses': metrics.cache_misses,
+                    'retries': metrics.retries,
+                }
+            return snapshot
+
+    def to_prometheus(self) -> str:
+        """
+        Recorded values in the Prometheus text exposition format.
+
+        :return: Exposition text
+        :rtype: str
+        """
+
+        snapshot = self.snapshot()
+        prefix = self.namespace
+        lines = []
+
+        def family(name: str, kind: str, help_text: str) -> str:
+            full = f'{prefix}_{name}'
+            lines.append(f'# HELP {full} {help_text}')
+            lines.append(f'# TYPE {full} {kind}')
+            return full
+
+        name = family('request_duration_seconds', 'histogram', 'Time from sending a request to reading its body.')
+        for endpoint, values in snapshot.items():
+            label = f'endpoint="{_escape(endpoint)}"'
+            for bound, count in values['latency_buckets'].items():
+                le = bound if bound == '+Inf' else _format_bound(bound)
+                lines.append(f'{name}_bucket{{{label},le="{le}"}} {count}')
+            lines.append(f'{name}_sum{{{label}}} {values["latency_sum"]!r}')
+            lines.append(f'{name}_count{{{label}}} {values["requests"]}')
+
+        name = family('responses_total', 'counter', 'Responses by HTTP status code.')
+        for endpoint, values in snapshot.items():
+            for status, count in sorted(values['statuses'].items()):
+                lines.append(f'{name}{{endpoint="{_escape(endpoint)}",status="{status}"}} {count}')
+
+        name = family('errors_total', 'counter', 'Exceptions raised by calls, by exception class.')
+        for endpoint, values in snapshot.items():
+            for error, count in sorted(values['errors'].items()):
+                lines.append(f'{name}{{endpoint="{_escape(endpoint)}",exception="{_escape(error)}"}} {count}')
+
+        for key, metric, help_text in (
+                ('bytes_out', 'request_bytes_total', 'Request body bytes sent.'),
+                ('bytes_in', 'response_bytes_total', 'Response body bytes received.'),
+                ('retries', 'retries_total', 'Retried attempts.'),
+        ):
+            name = family(metric, 'counter', help_text)
+            for endpoint, values in snapshot.items():
+                lines.append(f'{name}{{endpoint="{_escape(endpoint)}"}} {values[key]}')
+
+        name = family('cache_requests_total', 'counter', 'Response cache lookups by result.')
+        for endpoint, values in snapshot.items():
+            if values['cache_hits'] or values['cache_misses']:
+                label = f'endpoint="{_escape(endpoint)}"'
+                lines.append(f'{name}{{{label},result="hit"}} {values["cache_hits"]}')
+                lines.append(f'{name}{{{label},result="miss"}} {values["cache_misses"]}')
+
+        return '\n'.join(lines) + '\n'
+
+    def __str__(self):
+        return f'{self.__class__.__name__} | (endpoints={len(self.__endpoints)})'
+
+    def __repr__(self):
+        return self.__str__()
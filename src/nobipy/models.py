@@ -0,0 +1,304 @@
+import typing as t
+from collections.abc import Mapping, Sequence
+
+
+__all__ = [
+    'Order',
+    'Trade',
+    'Wallet',
+    'MarketStat',
+    'ModelList',
+    'ModelMap',
+    'build_models',
+]
+
+
+def _float(value) -> t.Optional[float]:
+    if value is None or value == '':
+        return None
+    return float(value)
+
+
+def _int(value) -> t.Optional[int]:
+    if value is None or value == '':
+        return None
+    return int(value)
+
+
+def _str(value) -> t.Optional[str]:
+    if value is None:
+        return None
+    return str(value)
+
+
+def _bool(value) -> t.Optional[bool]:
+    if value is None:
+        return None
+    return bool(value)
+
+
+class _Model:
+    """
+    Base for compact response models.
+
+    Subclasses declare ``_fields`` as ``(attribute, payload key, converter)`` triples; ``__slots__`` is
+    derived from it so instances carry no per-instance ``__dict__``.
+    """
+
+    __slots__ = ()
+    _fields: t.Tuple[t.Tuple[str, str, t.Callable], ...] = ()
+
+    def __init__(self, **kwargs) -> None:
+        for name, _, _ in self._fields:
+            setattr(self, name, kwargs.get(name))
+
+    @classmethod
+    def from_dict(cls, data: t.Dict, **extra) -> '_Model':
+        """
+        Build a model from a decoded payload item.
+
+        :param data: Decoded payload item
+        :type data: dict
+
+        :param extra: Values for fields that are not part of the item (e.g. the mapping key)
+        :type extra: dict
+
+        :return: Model
+        """
+
+        obj = cls.__new__(cls)
+        get = data.get
+        for name, key, convert in cls._fields:
+            if name in extra:
+                setattr(obj, name, extra[name])
+            else:
+                setattr(obj, name, convert(get(key)))
+        return obj
+
+    def to_dict(self) -> t.Dict:
+        """
+        Convert the model back to a dict keyed by attribute name.
+
+        :return: Model attributes
+        :rtype: dict
+        """
+
+        return {name: getattr(self, name) for name, _, _ in self._fields}
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name, _, _ in self._fields)
+
+    def __str__(self):
+        fields = ', '.join(f'{name}={getattr(self, name)!r}' for name, _, _ in self._fields)
+        return f'{self.__class__.__name__}({fields})'
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class Order(_Model):
+    _fields = (
+        ('id', 'id', _int),
+        ('type', 'type', _str),
+        ('execution', 'execution', _str),
+        ('src_currency', 'srcCurrency', _str),
+        ('dst_currency', 'dstCurrency', _str),
+        ('market', 'market', _str),
+        ('price', 'price', _float),
+        ('amount', 'amount', _float),
+        ('total_price', 'totalPrice', _float),
+        ('matched_amount', 'matchedAmount', _float),
+        ('unmatched_amount', 'unmatchedAmount', _float),
+        ('average_price', 'averagePrice', _float),
+        ('fee', 'fee', _float),
+        ('status', 'status', _str),
+        ('partial', 'partial', _bool),
+        ('created_at', 'created_at', _str),
+    )
+    __slots__ = tuple(name for name, _, _ in _fields)
+
+
+class Trade(_Model):
+    _fields = (
+        ('time', 'time', _int),
+        ('price', 'price', _float),
+        ('volume', 'volume', _float),
+        ('type', 'type', _str),
+    )
+    __slots__ = tuple(name for name, _, _ in _fields)
+
+
+class Wallet(_Model):
+    _fields = (
+        ('id', 'id', _int),
+        ('currency', 'currency', _str),
+        ('balance', 'balance', _float),
+        ('active_balance', 'activeBalance', _float),
+        ('blocked_balance', 'blockedBalance', _float),
+        ('rial_balance', 'rialBalance', _float),
+        ('deposit_address', 'depositAddress', _str),
+    )
+    __slots__ = tuple(name for name, _, _ in _fields)
+
+    @classmethod
+    def from_dict(cls, data: t.Dict, **extra) -> 'Wallet':
+        # /v2/wallets reports the blocked balance as "blocked"
+        if 'blocked' in data and 'blockedBalance' not in data:
+            extra.setdefault('blocked_balance', _float(data['blocked']))
+        return super().from_dict(data, **extra)
+
+
+class MarketStat(_Model):
+    _fields = (
+        ('symbol', 'symbol', _str),
+        ('is_closed', 'isClosed', _bool),
+        ('best_sell', 'bestSell', _float),
+        ('best_buy', 'bestBuy', _float),
+        ('volume_src', 'volumeSrc', _float),
+        ('volume_dst', 'volumeDst', _float),
+        ('latest', 'latest', _float),
+        ('mark', 'mark', _float),
+        ('day_low', 'dayLow', _float),
+        ('day_high', 'dayHigh', _float),
+        ('day_open', 'dayOpen', _float),
+        ('day_close', 'dayClose', _float),
+        ('day_change', 'dayChange', _float),
+    )
+    __slots__ = tuple(name for name, _, _ in _fields)
+
+
+class ModelList(Sequence):
+    """
+    List of payload items that are turned into models on first access.
+
+    Converted items replace their source dicts, so the raw dicts are freed as the list is consumed.
+    """
+
+    __slots__ = ('_items', '_model')
+
+    def __init__(self, items: t.List[t.Dict], model: t.Type[_Model]) -> None:
+        self._items = list(items)
+        self._model = model
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self._items)))]
+
+        item = self._items[index]
+        if not isinstance(item, self._model):
+            item = self._items[index] = self._model.from_dict(item)
+        return item
+
+    def __len__(self):
+        return len(self._items)
+
+    def materialize(self) -> t.List[_Model]:
+        """
+        Convert every remaining item and return the underlying list.
+
+        :return: Models
+        :rtype: list
+        """
+
+        for index in range(len(self._items)):
+            self[index]
+        return self._items
+
+    def __str__(self):
+        return f'{self.__class__.__name__}({self._model.__name__}, size={len(self._items)})'
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class ModelMap(Mapping):
+    """
+    Mapping of payload items that are turned into models on first access.
+
+    The mapping key is passed to the model as ``key_field`` (e.g. the market symbol).
+    """
+
+    __slots__ = ('_items', '_model', '_key_field')
+
+    def __init__(self, items: t.Dict[str, t.Dict], model: t.Type[_Model], key_field: str) -> None:
+        self._items = dict(items)
+        self._model = model
+        self._key_field = key_field
+
+    def __getitem__(self, key):
+        item = self._items[key]
+        if not isinstance(item, self._model):
+            item = self._items[key] = self._model.from_dict(item, **{self._key_field: key})
+        return item
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+    def materialize(self) -> t.Dict[str, _Model]:
+        """
+        Convert every remaining item and return the underlying dict.
+
+        :return: Models
+        :rtype: dict
+        """
+
+        for key in self._items:
+            self[key]
+        return self._items
+
+    def __str__(self):
+        return f'{self.__class__.__name__}({self._model.__name__}, size={len(self._items)})'
+
+    def __repr__(self):
+        return self.__str__()
+
+
+def build_models(func_name: str, payload: t.Dict, additional: t.Dict = None) -> t.Dict:
+    """
+    Replace the data part of a decoded payload with lazily built models.
+
+    The payload itself is not modified; a shallow copy is returned.
+
+    :param func_name: Function name that produced the payload
+    :type func_name: str
+
+    :param payload: Decoded response body
+    :type payload: dict
+
+    :param additional: Call arguments (optional)
+    :type additional: dict
+
+    :return: Payload with models
+    :rtype: dict
+    """
+
+    payload = dict(payload)
+
+    if func_name in ('create_order', 'order_status'):
+        if isinstance(payload.get('order'), dict):
+            payload['order'] = Order.from_dict(payload['order'])
+    elif func_name == 'open_orders':
+        if isinstance(payload.get('orders'), list):
+            payload['orders'] = ModelList(payload['orders'], Order)
+    elif func_name == 'trades':
+        if isinstance(payload.get('trades'), list):
+            payload['trades'] = ModelList(payload['trades'], Trade)
+    elif func_name == 'user_wallets':
+        wallets = payload.get('wallets')
+        if isinstance(wallets, list):
+            payload['wallets'] = ModelList(wallets, Wallet)
+        elif isinstance(wallets, dict):
+            payload['wallets'] = ModelMap(wallets, Wallet, 'currency')
+    elif func_name == 'balance':
+        currency = (additional or {}).get('currency')
+        payload['balance'] = Wallet(currency=currency and currency.lower(), balance=_float(payload.get('balance')))
+    elif func_name == 'market_stats':
+        if isinstance(payload.get('stats'), dict):
+            payload['stats'] = ModelMap(payload['stats'], MarketStat, 'symbol')
+
+    return payload
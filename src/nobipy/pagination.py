@@ -0,0 +1,225 @@
+import asyncio
+import re
+import typing as t
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+
+__all__ = [
+    'iter_pages',
+    'iter_records',
+    'aiter_pages',
+    'aiter_records',
+]
+
+
+# ISO 8601 timestamps as sent by the API, e.g. "2021-05-01T10:20:30.123456+03:30" or "...Z".
+_ISO_TIME = re.compile(
+    r'(\d{4})-(\d{2})-(\d{2})(?:[T ](\d{2}):(\d{2})(?::(\d{2})(?:\.(\d{1,6})\d*)?)?)?'
+    r'\s*(Z|[+-]\d{2}:?\d{2})?$'
+)
+
+
+def _last_page(payload: t.Dict, items: t.List, page_size: int) -> bool:
+    if 'hasNext' in payload:
+        return not payload['hasNext']
+    return len(items) < page_size
+
+
+def iter_pages(
+        fetch_page: t.Callable[[int], t.Dict], key: str, page_size: int,
+        prefetch: bool = False, first_page: int = 1,
+) -> t.Iterator[t.List[t.Dict]]:
+    """
+    Yield the items of successive pages until the last one.
+
+    With ``prefetch``, the next page is requested on a background thread while the current one is
+    consumed. At most two pages are held at once.
+
+    :param fetch_page: Function returning the decoded response of a page number
+    :type fetch_page: callable
+
+    :param key: Payload key holding the page items
+    :type key: str
+
+    :param page_size: Requested page size
+    :type page_size: int
+
+    :param prefetch: Request the next page in the background (optional)
+    :type prefetch: bool
+
+    :param first_page: First page number (optional)
+    :type first_page: int
+
+    :return: Page items
+    :rtype: iterator
+    """
+
+    page = first_page
+
+    if not prefetch:
+        while True:
+            payload = fetch_page(page)
+            items = payload.get(key) or []
+            if items:
+                yield items
+            if not items or _last_page(payload, items, page_size):
+                return
+            page += 1
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(fetch_page, page)
+        while True:
+            payload = future.result()
+            items = payload.get(key) or []
+            last = not items or _last_page(payload, items, page_size)
+            if not last:
+                page += 1
+                future = executor.submit(fetch_page, page)
+            if items:
+                yield items
+            if last:
+                return
+
+
+async def aiter_pages(
+        fetch_page: t.Callable[[int], t.Awaitable[t.Dict]], key: str, page_size: int,
+        prefetch: bool = False, first_page: int = 1,
+) -> t.AsyncIterator[t.List[t.Dict]]:
+    """
+    Asyncio version of ``iter_pages``; the prefetched page is requested as a task.
+    """
+
+    page = first_page
+    task = asyncio.ensure_future(fetch_page(page))
+
+    try:
+        while True:
+            payload = await task
+            items = payload.get(key) or []
+            last = not items or _last_page(payload, items, page_size)
+            if not last:
+                page += 1
+                task = asyncio.ensure_future(fetch_page(page)) if prefetch else None
+            if items:
+                yield items
+            if last:
+                return
+            if task is None:
+                task = asyncio.ensure_future(fetch_page(page))
+    finally:
+        if task is not None and not task.done():
+            task.cancel()
+
+
+def _parse_iso(value: str) -> datetime:
+    # ``datetime.fromisoformat`` needs Python 3.7+.
+    match = _ISO_TIME.match(value.strip())
+    if match is None:
+        raise ValueError(f'Invalid time: {value!r}')
+
+    year, month, day, hour, minute, second, fraction, zone = match.groups()
+    tzinfo = None
+    if zone == 'Z':
+        tzinfo = timezone.utc
+    elif zone:
+        digits = zone[1:].replace(':', '')
+        offset = timedelta(hours=int(digits[:2]), minutes=int(digits[2:]))
+        tzinfo = timezone(-offset if zone[0] == '-' else offset)
+
+    return datetime(
+        int(year), int(month), int(day), int(hour or 0), int(minute or 0), int(second or 0),
+        int((fraction or '0').ljust(6, '0')), tzinfo,
+    )
+
+
+def _parse_time(value: t.Union[str, datetime, None]) -> t.Optional[datetime]:
+    if value is None or isinstance(value, datetime):
+        parsed = value
+    else:
+        parsed = _parse_iso(value)
+    if parsed is not None and parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+class _Cursor:
+    __slots__ = ('since', 'since_id', 'time_key')
+
+    def __init__(self, since: t.Union[str, datetime, None], since_id: t.Optional[int], time_key: str) -> None:
+        self.since = _parse_time(since)
+        self.since_id = since_id
+        self.time_key = time_key
+
+    def reached(self, record: t.Any) -> bool:
+        # Records are dicts, or models when the client returns typed models.
+        get = record.get if isinstance(record, dict) else lambda key: getattr(record, key, None)
+
+        record_id = get('id')
+        if self.since_id is not None and record_id is not None and record_id <= self.since_id:
+            return True
+
+        created_at = get(self.time_key)
+        if self.since is not None and created_at:
+            return _parse_time(created_at) <= self.since
+        return False
+
+
+def iter_records(
+        fetch_page: t.Callable[[int], t.Dict], key: str, page_size: int, prefetch: bool = False,
+        since: t.Union[str, datetime] = None, since_id: int = None, time_key: str = 'created_at',
+) -> t.Iterator[t.Dict]:
+    """
+    Yield records of a newest-first paginated list, stopping at the cursor.
+
+    :param fetch_page: Function returning the decoded response of a page number
+    :type fetch_page: callable
+
+    :param key: Payload key holding the page items
+    :type key: str
+
+    :param page_size: Requested page size
+    :type page_size: int
+
+    :param prefetch: Request the next page in the background (optional)
+    :type prefetch: bool
+
+    :param since: Stop at the first record created at or before this time (optional)
+    :type since: str | datetime
+
+    :param since_id: Stop at the first record with an id at or below this one (optional)
+    :type since_id: int
+
+    :param time_key: Record key holding the creation time (optional)
+    :type time_key: str
+
+    :return: Records
+    :rtype: iterator
+    """
+
+    cursor = _Cursor(since, since_id, time_key)
+    for items in iter_pages(fetch_page, key, page_size, prefetch):
+        for record in items:
+            if cursor.reached(record):
+                return
+            yield record
+
+
+async def aiter_records(
+        fetch_page: t.Callable[[int], t.Awaitable[t.Dict]], key: str, page_size: int, prefetch: bool = False,
+        since: t.Union[str, datetime] = None, since_id: int = None, time_key: str = 'created_at',
+) -> t.AsyncIterator[t.Dict]:
+    """
+    Asyncio version of ``iter_records``.
+    """
+
+    cursor = _Cursor(since, since_id, time_key)
+    pages = aiter_pages(fetch_page, key, page_size, prefetch)
+    try:
+        async for items in pages:
+            for record in items:
+                if cursor.reached(record):
+                    return
+                yield record
+    finally:
+        await pages.aclose()
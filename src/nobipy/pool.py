@@ -0,0 +1,293 @@
+import threading
+import typing as t
+
+from .const import BASE_URL
+from .exceptions import NobitexExceptions
+from .transport import HTTPTransport
+from .ratelimit import RateLimiter
+from .batch import BatchResult, run_batch
+from .main import Nobitex
+
+
+__all__ = [
+    'NobitexPool',
+]
+
+
+class NobitexPool:
+    def __init__(
+            self, accounts: t.Mapping[t.Hashable, str] = None, transport: HTTPTransport = None,
+            max_workers: int = 8, pool_connections: int = 10, pool_maxsize: int = None,
+            rate_limiter: t.Union[bool, t.Callable[[], RateLimiter]] = True, base_url: str = BASE_URL,
+            **options,
+    ) -> None:
+        """
+        Authenticated clients for many accounts over one shared connection pool.
+
+        Every account gets its own ``Nobitex`` client, so its token lives in its own header set and a call
+        never goes out with another account's token, whichever thread makes it. Nobitex limits each
+        account separately, so each client also gets its own rate limiter. Public market data goes
+        through ``public``, a client without a token. All clients share one transport: connections are
+        reused across accounts.
+
+        :param accounts: Token per account id (optional)
+        :type accounts: dict
+
+        :param transport: Shared transport; the pool options below are ignored when given (optional)
+        :type transport: HTTPTransport
+
+        :param max_workers: Maximum concurrent calls of ``map`` and ``run`` (optional)
+        :type max_workers: int
+
+        :param pool_connections: Number of per-host connection pools to cache (optional)
+        :type pool_connections: int
+
+        :param pool_maxsize: Maximum number of connections kept per host, ``max_workers`` by default (optional)
+        :type pool_maxsize: int
+
+        :param rate_limiter: Rate limiter per account; True creates a default RateLimiter per account,
+            a callable is called once per account (optional)
+        :type rate_limiter: bool | callable
+
+        :param base_url: API root, e.g. a local stand-in server (optional)
+        :type base_url: str
+
+        :param options: Other ``Nobitex`` options applied to every client, e.g. ``cache``, ``retry``,
+            ``metrics`` or ``tracer``; pass instances to share them between clients (optional)
+        :type options: dict
+
+        :return: None
+        """
+
+        self.max_workers = max_workers
+        self.base_url = base_url
+        self.rate_limiter = rate_limiter
+        self.options = options
+
+        self.__transport = transport if transport is not None else HTTPTransport(
+            pool_connections=pool_connections, pool_maxsize=pool_maxsize or max_workers,
+            tracing=options.get('tracer') is not None,
+        )
+        self.__lock = threading.Lock()
+        # Replaced as a whole on every change, so lookups never need the lock.
+        self.__clients: t.Dict[t.Hashable, Nobitex] = {}
+        self.__public = self._create_client(None)
+
+        for account_id, token in (accounts or {}).items():
+            self.add(account_id, token)
+
+    def _create_client(self, token: t.Optional[str]) -> Nobitex:
+        """
+        Create a client over the shared transport.
+
+        :param token: Token
+        :type token: str | None
+
+        :return: Client
+        :rtype: Nobitex
+        """
+
+        rate_limiter = self.rate_limiter
+        if callable(rate_limiter):
+            rate_limiter = rate_limiter()
+        elif rate_limiter is True:
+            rate_limiter = RateLimiter()
+
+        return Nobitex(
+            token, transport=self.__transport, rate_limiter=rate_limiter, base_url=self.base_url, **self.options,
+        )
+
+    def add(self, account_id: t.Hashable, token: str) -> Nobitex:
+        """
+        Add an account, or replace the client of an existing one (its rate limiter starts over).
+
+        :param account_id: Account id
+        :type account_id: hashable
+
+        :param token: Token
+        :type token: str
+
+        :return: Client of the account
+        :rtype: Nobitex
+        """
+
+        client = self._create_client(token)
+        with self.__lock:
+            clients = dict(self.__clients)
+            clients[account_id] = client
+            self.__clients = clients
+        return client
+
+    def remove(self, account_id: t.Hashable) -> None:
+        """
+        Remove an account. Calls already running on its client finish normally.
+
+        :param account_id: Account id
+        :type account_id: hashable
+
+        :return: None
+        """
+
+        with self.__lock:
+            clients = dict(self.__clients)
+            clients.pop(account_id, None)
+            self.__clients = clients
+
+    def client(self, account_id: t.Hashable) -> Nobitex:
+        """
+        Client of an account.
+
+        :param account_id: Account id
+        :type account_id: hashable
+
+        :raises: NobitexExceptions
+
+        :return: Client
+        :rtype: Nobitex
+        """
+
+        client = self.__clients.get(account_id)
+        if client is None:
+            raise NobitexExceptions('client', 'Unknown account', {'account_id': account_id})
+        return client
+
+    @property
+    def public(self) -> Nobitex:
+        """
+        Client without a token, for public market data
+
+        :return: Client
+        :rtype: Nobitex
+        """
+
+        return self.__public
+
+    @property
+    def accounts(self) -> t.List[t.Hashable]:
+        """
+        Account ids
+
+        :return: Account ids
+        :rtype: list
+        """
+
+        return list(self.__clients)
+
+    @property
+    def transport(self) -> HTTPTransport:
+        """
+        Transport shared by all clients
+
+        :return: Transport
+        :rtype: HTTPTransport
+        """
+
+        return self.__transport
+
+    def call(self, account_id: t.Hashable, method: str, *args, **kwargs) -> t.Any:
+        """
+        Call a client method of an account, e.g. ``pool.call('sub-1', 'balance', 'rls')``.
+
+        :param account_id: Account id
+        :type account_id: hashable
+
+        :param method: ``Nobitex`` method name
+        :type method: str
+
+        :param args: Positional arguments (optional)
+        :type args: tuple
+
+        :param kwargs: Keyword arguments (optional)
+        :type kwargs: dict
+
+        :raises: NobitexAPIException
+
+        :return: Result of the method
+        :rtype: any
+        """
+
+        return getattr(self.client(account_id), method)(*args, **kwargs)
+
+    def map(self, method: str, *args, account_ids: t.Iterable[t.Hashable] = None, **kwargs) -> BatchResult:
+        """
+        Call the same method on several accounts concurrently.
+
+        A failing account is recorded in its entry and does not abort the others. Use
+        ``result.to_mapping(account_ids)`` to key the results by account.
+
+        :param method: ``Nobitex`` method name
+        :type method: str
+
+        :param args: Positional arguments (optional)
+        :type args: tuple
+
+        :param account_ids: Accounts, all of them by default (optional)
+        :type account_ids: iterable
+
+        :param kwargs: Keyword arguments (optional)
+        :type kwargs: dict
+
+        :return: Entries in account order
+        :rtype: BatchResult
+        """
+
+        account_ids = self.accounts if account_ids is None else account_ids
+        return run_batch(
+            lambda account_id: self.call(account_id, method, *args, **kwargs), account_ids, self.max_workers,
+        )
+
+    def run(self, calls: t.Iterable[t.Tuple]) -> BatchResult:
+        """
+        Run calls of any accounts concurrently, each routed to its account's client.
+
+        A call is ``(account_id, method)``, ``(account_id, method, args)`` or
+        ``(account_id, method, args, kwargs)``. A failing call is recorded in its entry and does not abort
+        the others.
+
+        :param calls: Calls
+        :type calls: iterable
+
+        :return: Entries in input order
+        :rtype: BatchResult
+        """
+
+        def run_one(call: t.Tuple) -> t.Any:
+            account_id, method, *rest = call
+            args = rest[0] if rest else ()
+            kwargs = rest[1] if len(rest) > 1 else {}
+            return self.call(account_id, method, *args, **kwargs)
+
+        return run_batch(run_one, calls, self.max_workers)
+
+    def close(self) -> None:
+        """
+        Close the shared pooled connections
+
+        :return: None
+        """
+
+        self.__transport.close()
+
+    def __enter__(self) -> 'NobitexPool':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def __getitem__(self, account_id: t.Hashable) -> Nobitex:
+        return self.client(account_id)
+
+    def __contains__(self, account_id: t.Hashable) -> bool:
+        return account_id in self.__clients
+
+    def __len__(self) -> int:
+        return len(self.__clients)
+
+    def __iter__(self) -> t.Iterator[t.Hashable]:
+        return iter(list(self.__clients))
+
+    def __str__(self):
+        return f'{self.__class__.__name__} | (accounts={len(self)}, max_workers={self.max_workers})'
+
+    def __repr__(self):
+        return self.__str__()
@@ -0,0 +1,401 @@
+import asyncio
+import os
+import struct
+import threading
+import time
+import typing as t
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+from .const import EndpointGroup
+from .endpoints import ENDPOINTS
+
+
+__all__ = [
+    'ENDPOINT_GROUPS',
+    'DEFAULT_RATES',
+    'TokenBucket',
+    'SharedTokenBucket',
+    'RateLimiter',
+]
+
+
+# Endpoint (function) name -> rate limit group, from the endpoint table.
+ENDPOINT_GROUPS = {endpoint.name: endpoint.group for endpoint in ENDPOINTS.values()}
+
+# (tokens per second, burst capacity) per group. Conservative starting points; tune to your account.
+DEFAULT_RATES = {
+    EndpointGroup.Market: (5.0, 20.0),
+    EndpointGroup.OrderPlacement: (0.5, 10.0),
+    EndpointGroup.OrderQuery: (2.0, 10.0),
+    EndpointGroup.Wallet: (1.0, 5.0),
+    EndpointGroup.Account: (0.5, 5.0),
+}
+
+
+class TokenBucket:
+    def __init__(
+            self, rate: float, capacity: float = None,
+            decrease_factor: float = 0.5, increase_step: float = 0.05, min_rate: float = None,
+    ) -> None:
+        """
+        Thread-safe token bucket that can go into debt, so waiting callers queue in arrival order.
+
+        The rate adapts to throttling: ``on_throttle`` multiplies it by ``decrease_factor`` and blocks the
+        bucket for the server's Retry-After, and every ``on_success`` adds ``increase_step * rate`` back
+        until the configured rate is reached.
+
+        :param rate: Tokens per second
+        :type rate: float
+
+        :param capacity: Burst size, defaults to ``rate`` but at least 1, since a bucket holding less
+            than one token could never grant a request without going into debt (optional)
+        :type capacity: float
+
+        :param decrease_factor: Rate multiplier applied on throttling (optional)
+        :type decrease_factor: float
+
+        :param increase_step: Fraction of the configured rate restored per success (optional)
+        :type increase_step: float
+
+        :param min_rate: Lowest adaptive rate, defaults to 5% of ``rate`` (optional)
+        :type min_rate: float
+
+        :return: None
+        """
+
+        self.base_rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(rate, 1.0))
+        self.decrease_factor = decrease_factor
+        self.increase_step = increase_step
+        self.min_rate = float(min_rate if min_rate is not None else rate * 0.05)
+
+        self.__lock = threading.Lock()
+        # tokens, last refill, current rate, blocked until
+        self.__state = (self.capacity, self._now(), self.base_rate, 0.0)
+
+    @staticmethod
+    def _now() -> float:
+        return time.time()
+
+    @contextmanager
+    def _locked_state(self):
+        """
+        Yield a one-item list holding the state tuple; the new state is stored on exit.
+        """
+
+        with self.__lock:
+            box = [self.__state]
+            yield box
+            self.__state = box[0]
+
+    def _refill(self, state: t.Tuple, now: float) -> t.Tuple:
+        tokens, last, rate, blocked_until = state
+        tokens = min(self.capacity, tokens + max(0.0, now - last) * rate)
+        return tokens, now, rate, blocked_until
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """
+        Take tokens and return how long the caller must wait before sending.
+
+        :param tokens: Tokens to take (optional)
+        :type tokens: float
+
+        :return: Wait in seconds
+        :rtype: float
+        """
+
+        now = self._now()
+        with self._locked_state() as box:
+            available, last, rate, blocked_until = self._refill(box[0], now)
+            available -= tokens
+            box[0] = (available, last, rate, blocked_until)
+
+        wait = -available / rate if available < 0 else 0.0
+        return max(wait, blocked_until - now)
+
+    def peek(self, tokens: float = 1.0) -> float:
+        """
+        Wait a request arriving now would have, without taking tokens.
+
+        :param tokens: Tokens to take (optional)
+        :type tokens: float
+
+        :return: Wait in seconds
+        :rtype: float
+        """
+
+        now = self._now()
+        with self._locked_state() as box:
+            available, _, rate, blocked_until = self._refill(box[0], now)
+
+        available -= tokens
+        wait = -available / rate if available < 0 else 0.0
+        return max(wait, blocked_until - now)
+
+    def on_throttle(self, retry_after: float = None) -> None:
+        """
+        Slow down after a 429 response.
+
+        :param retry_after: Seconds the server asked to wait (optional)
+        :type retry_after: float
+
+        :return: None
+        """
+
+        now = self._now()
+        with self._locked_state() as box:
+            available, last, rate, blocked_until = self._refill(box[0], now)
+            rate = max(self.min_rate, rate * self.decrease_factor)
+            if retry_after:
+                blocked_until = max(blocked_until, now + retry_after)
+            box[0] = (min(available, 0.0), last, rate, blocked_until)
+
+    def on_success(self) -> None:
+        """
+        Recover the rate after a successful response.
+
+        :return: None
+        """
+
+        with self._locked_state() as box:
+            available, last, rate, blocked_until = box[0]
+            if rate < self.base_rate:
+                rate = min(self.base_rate, rate + self.base_rate * self.increase_step)
+                box[0] = (available, last, rate, blocked_until)
+
+    @property
+    def rate(self) -> float:
+        with self._locked_state() as box:
+            return box[0][2]
+
+    def __str__(self):
+        return f'{self.__class__.__name__} | (rate={self.rate}, capacity={self.capacity})'
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class SharedTokenBucket(TokenBucket):
+    _STATE = struct.Struct('<dddd')
+
+    def __init__(self, path: str, rate: float, capacity: float = None, **kwargs) -> None:
+        """
+        Token bucket whose state lives in a small file, shared by every process on the host using the same path.
+
+        Updates are serialized with ``fcntl.flock``; POSIX only.
+
+        :param path: State file path
+        :type path: str
+
+        :param rate: Tokens per second
+        :type rate: float
+
+        :param capacity: Burst size, defaults to ``rate`` (optional)
+        :type capacity: float
+
+        :param kwargs: Adaptive options of ``TokenBucket`` (optional)
+        :type kwargs: dict
+
+        :return: None
+        """
+
+        if fcntl is None:
+            raise ImportError('SharedTokenBucket requires fcntl (POSIX)')
+
+        super().__init__(rate, capacity, **kwargs)
+        self.path = path
+        self.__thread_lock = threading.Lock()
+
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            if len(os.pread(fd, self._STATE.size, 0)) < self._STATE.size:
+                os.pwrite(fd, self._STATE.pack(self.capacity, self._now(), self.base_rate, 0.0), 0)
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+    @contextmanager
+    def _locked_state(self):
+        with self.__thread_lock:
+            fd = os.open(self.path, os.O_RDWR)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                state = self._STATE.unpack(os.pread(fd, self._STATE.size, 0))
+                box = [state]
+                yield box
+                if box[0] != state:
+                    os.pwrite(fd, self._STATE.pack(*box[0]), 0)
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+                os.close(fd)
+
+
+class RateLimiter:
+    def __init__(
+            self, buckets: t.Dict[str, TokenBucket] = None, groups: t.Dict[str, str] = None,
+    ) -> None:
+        """
+        Client-side rate limiter with one token bucket per endpoint group.
+
+        :param buckets: Bucket per group; groups missing here use ``DEFAULT_RATES`` (optional)
+        :type buckets: dict
+
+        :param groups: Endpoint (function) name to group mapping; defaults to ``ENDPOINT_GROUPS`` (optional)
+        :type groups: dict
+
+        :return: None
+        """
+
+        self.groups = dict(ENDPOINT_GROUPS if groups is None else groups)
+        self.buckets = {group: TokenBucket(rate, capacity) for group, (rate, capacity) in DEFAULT_RATES.items()}
+        self.buckets.update(buckets or {})
+
+        self.__lock = threading.Lock()
+        self.__waits: t.Dict[str, t.List[float]] = {}  # group -> [count, total seconds, last seconds]
+        self.__throttled: t.Dict[str, int] = {}
+
+    def bucket(self, func_name: str) -> t.Optional[TokenBucket]:
+        """
+        Bucket limiting an endpoint.
+
+        :param func_name: Endpoint (function) name
+        :type func_name: str
+
+        :return: Bucket, or None when the endpoint is not limited
+        :rtype: TokenBucket | None
+        """
+
+        return self.buckets.get(self.groups.get(func_name))
+
+    def _record(self, func_name: str, wait: float) -> None:
+        group = self.groups.get(func_name)
+        with self.__lock:
+            stats = self.__waits.setdefault(group, [0, 0.0, 0.0])
+            stats[0] += 1
+            stats[1] += wait
+            stats[2] = wait
+
+    def acquire(self, func_name: str) -> float:
+        """
+        Block until a request to the endpoint may be sent.
+
+        :param func_name: Endpoint (function) name
+        :type func_name: str
+
+        :return: Seconds waited
+        :rtype: float
+        """
+
+        bucket = self.bucket(func_name)
+        if bucket is None:
+            return 0.0
+
+        wait = bucket.reserve()
+        self._record(func_name, wait)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, func_name: str) -> float:
+        """
+        Wait on the event loop until a request to the endpoint may be sent.
+
+        :param func_name: Endpoint (function) name
+        :type func_name: str
+
+        :return: Seconds waited
+        :rtype: float
+        """
+
+        bucket = self.bucket(func_name)
+        if bucket is None:
+            return 0.0
+
+        wait = bucket.reserve()
+        self._record(func_name, wait)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def feedback(self, func_name: str, status_code: int, retry_after: t.Optional[str] = None) -> None:
+        """
+        Adapt the endpoint's bucket to a response.
+
+        :param func_name: Endpoint (function) name
+        :type func_name: str
+
+        :param status_code: HTTP status code
+        :type status_code: int
+
+        :param retry_after: Retry-After header value (optional)
+        :type retry_after: str
+
+        :return: None
+        """
+
+        bucket = self.bucket(func_name)
+        if bucket is None:
+            return
+
+        if status_code == 429:
+            try:
+                delay = float(retry_after) if retry_after is not None else None
+            except ValueError:
+                delay = None
+            bucket.on_throttle(delay)
+            group = self.groups.get(func_name)
+            with self.__lock:
+                self.__throttled[group] = self.__throttled.get(group, 0) + 1
+        else:
+            bucket.on_success()
+
+    def queue_wait(self, group: str) -> float:
+        """
+        Seconds a request to the group would wait if sent now.
+
+        :param group: Endpoint group
+        :type group: str
+
+        :return: Wait in seconds
+        :rtype: float
+        """
+
+        bucket = self.buckets.get(group)
+        return bucket.peek() if bucket is not None else 0.0
+
+    def stats(self) -> t.Dict[str, t.Dict[str, float]]:
+        """
+        Wait and throttling metrics per group.
+
+        :return: ``{group: {'queue_wait', 'rate', 'waits', 'total_wait', 'last_wait', 'throttled'}}``
+        :rtype: dict
+        """
+
+        with self.__lock:
+            waits = {group: list(values) for group, values in self.__waits.items()}
+            throttled = dict(self.__throttled)
+
+        result = {}
+        for group, bucket in self.buckets.items():
+            count, total, last = waits.get(group, (0, 0.0, 0.0))
+            result[group] = {
+                'queue_wait': bucket.peek(),
+                'rate': bucket.rate,
+                'waits': count,
+                'total_wait': total,
+                'last_wait': last,
+                'throttled': throttled.get(group, 0),
+            }
+        return result
+
+    def __str__(self):
+        return f'{self.__class__.__name__} | (groups={sorted(self.buckets)})'
+
+    def __repr__(self):
+        return self.__str__()
@@ -0,0 +1,342 @@
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+import typing as t
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from .exceptions import ReplayMissExceptions
+from .transport import HTTPTransport
+
+
+__all__ = [
+    'RecordedExchange',
+    'RecordingTransport',
+    'ReplayTransport',
+    'iter_records',
+    'request_key',
+]
+
+
+_MAGIC = b'NOBIREC1'
+
+# started at (unix time), elapsed seconds, status code, key / headers / body lengths
+_HEADER = struct.Struct('<dfHIII')
+
+
+class RecordedExchange(t.NamedTuple):
+    started_at: float
+    elapsed: float
+    status_code: int
+    key: str
+    headers: t.Dict[str, str]
+    body: bytes
+
+
+def request_key(
+        method: str, url: str, params: t.Union[t.Mapping, t.Sequence[t.Tuple]] = None,
+        json_data: t.Any = None, data: t.Any = None,
+) -> str:
+    """
+    Canonical key of a request: method, path, sorted query parameters and body. The host and the
+    headers (and with them the token) are not part of it.
+
+    :param method: HTTP method
+    :type method: str
+
+    :param url: URL
+    :type url: str
+
+    :param params: Query parameters, as a mapping or (key, value) pairs (optional)
+    :type params: dict | tuple
+
+    :param json_data: JSON body (optional)
+    :type json_data: any
+
+    :param data: Form body (optional)
+    :type data: any
+
+    :return: Key
+    :rtype: str
+    """
+
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query)
+    pairs = params or ()
+    # A mapping, or (key, value) pairs as the endpoint table sends them.
+    for k, v in (pairs.items() if isinstance(pairs, t.Mapping) else pairs):
+        if v is not None:
+            query.append((str(k), str(v)))
+
+    body = json_data if json_data is not None else data
+    if isinstance(body, bytes):
+        body = body.decode('utf-8', 'replace')
+    elif body is not None and not isinstance(body, str):
+        body = json.dumps(body, sort_keys=True, separators=(',', ':'), default=str)
+
+    key = f'{method.upper()} {parts.path}'
+    if query:
+        key += '?' + urlencode(sorted(query))
+    if body:
+        key += '\n' + body
+    return key
+
+
+def _route(key: str) -> str:
+    # Method and path only, for the fallback lookup of ``ReplayTransport(strict=False)``.
+    return key.split('\n', 1)[0].split('?', 1)[0]
+
+
+def _scan(data: t.Union[bytes, mmap.mmap], path: str) -> t.Iterator[t.Tuple[int, t.Tuple]]:
+    if data[:len(_MAGIC)] != _MAGIC:
+        raise ValueError(f'{path} is not a nobipy recording')
+
+    offset, size = len(_MAGIC), len(data)
+    while offset + _HEADER.size <= size:
+        header = _HEADER.unpack_from(data, offset)
+        end = offset + _HEADER.size + header[3] + header[4] + header[5]
+        if end > size:
+            # A record cut short by a crash while writing; everything before it is intact.
+            break
+        yield offset, header
+        offset = end
+
+
+def _decode(data: t.Union[bytes, mmap.mmap], offset: int, header: t.Tuple) -> RecordedExchange:
+    started_at, elapsed, status_code, key_length, headers_length, body_length = header
+    start = offset + _HEADER.size
+    key = bytes(data[start:start + key_length]).decode()
+    start += key_length
+    headers = json.loads(bytes(data[start:start + headers_length])) if headers_length else {}
+    start += headers_length
+    return RecordedExchange(started_at, elapsed, status_code, key, headers, bytes(data[start:start + body_length]))
+
+
+def iter_records(path: str) -> t.Iterator[RecordedExchange]:
+    """
+    Read the exchanges of a recording in the order they were written.
+
+    :param path: Recording file
+    :type path: str
+
+    :return: Recorded exchanges
+    :rtype: iterator
+    """
+
+    with open(path, 'rb') as f:
+        data = f.read()
+    for offset, header in _scan(data, path):
+        yield _decode(data, offset, header)
+
+
+class RecordingTransport:
+    def __init__(self, path: str, transport: HTTPTransport = None) -> None:
+        """
+        Transport sending through another transport and appending every exchange to a file.
+
+        Each record holds the start time, duration, status code, request key (see ``request_key``),
+        response headers and raw response body. Request headers are not written, so the file does not
+        contain the token. An existing file is appended to.
+
+        :param path: Recording file
+        :type path: str
+
+        :param transport: Transport doing the actual requests (optional)
+        :type transport: HTTPTransport
+
+        :return: None
+        """
+
+        self.path = path
+        self.transport = transport if transport is not None else HTTPTransport()
+
+        self.__lock = threading.Lock()
+        self.__file = open(path, 'ab')
+        if self.__file.tell() == 0:
+            self.__file.write(_MAGIC)
+            self.__file.flush()
+
+    def send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send a request and record the exchange.
+
+        :param method: HTTP method
+        :type method: str
+
+        :param url: Absolute URL
+        :type url: str
+
+        :param kwargs: Keyword arguments of ``requests.Session.request``
+        :type kwargs: dict
+
+        :return: Response
+        :rtype: requests.Response
+        """
+
+        started_at = time.time()
+        started = time.perf_counter()
+        response = self.transport.send(method, url, **kwargs)
+        body = response.content
+        elapsed = time.perf_counter() - started
+
+        key = request_key(method, url, kwargs.get('params'), kwargs.get('json'), kwargs.get('data')).encode()
+        headers = json.dumps(dict(response.headers), separators=(',', ':')).encode()
+        record = _HEADER.pack(started_at, elapsed, response.status_code, len(key), len(headers), len(body))
+
+        with self.__lock:
+            self.__file.write(record + key + headers + body)
+            self.__file.flush()
+
+        return response
+
+    def close(self) -> None:
+        with self.__lock:
+            if not self.__file.closed:
+                self.__file.close()
+        self.transport.close()
+
+    def __str__(self):
+        return f'{self.__class__.__name__} | (path={self.path})'
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class ReplayTransport:
+    def __init__(self, path: str, pacing: bool = False, speed: float = 1.0, strict: bool = True) -> None:
+        """
+        Transport answering requests from a recording, without any network.
+
+        Requests are looked up by ``request_key`` in an index built once when the file is opened; bodies
+        are read from a memory map only when served. A request recorded several times gets its
+        responses in recorded order, and the last one once they run out.
+
+        With ``pacing`` responses are held back so that they arrive at their original offsets from the
+        first recorded request (divided by ``speed``), counted from the first replayed request.
+        Otherwise they are served as fast as possible.
+
+        :param path: Recording file
+        :type path: str
+
+        :param pacing: Replay at the original pace (optional)
+        :type pacing: bool
+
+        :param speed: Pace multiplier when pacing (optional)
+        :type speed: float
+
+        :param strict: Fail on requests whose parameters or body were not recorded; otherwise fall
+            back to the recorded responses of the same method and path (optional)
+        :type strict: bool
+
+        :return: None
+        """
+
+        self.path = path
+        self.pacing = pacing
+        self.speed = speed
+        self.strict = strict
+
+        self.__file = open(path, 'rb')
+        size = os.fstat(self.__file.fileno()).st_size
+        self.__data = mmap.mmap(self.__file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+
+        self.__index: t.Dict[str, t.List[t.Tuple[int, t.Tuple]]] = {}
+        self.__routes: t.Dict[str, t.List[t.Tuple[int, t.Tuple]]] = {}
+        self.__first: t.Optional[float] = None
+        for offset, header in _scan(self.__data, path):
+            if self.__first is None:
+                self.__first = header[0]
+            start = offset + _HEADER.size
+            key = bytes(self.__data[start:start + header[3]]).decode()
+            self.__index.setdefault(key, []).append((offset, header))
+            self.__routes.setdefault(_route(key), []).append((offset, header))
+
+        self.__lock = threading.Lock()
+        self.__served: t.Dict[str, int] = {}
+        self.__started: t.Optional[float] = None
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self.__index.values())
+
+    def _next(self, key: str) -> t.Optional[t.Tuple[int, t.Tuple]]:
+        entries = self.__index.get(key)
+        if entries is None and not self.strict:
+            key = _route(key)
+            entries = self.__routes.get(key)
+        if entries is None:
+            return None
+
+        with self.__lock:
+            served = self.__served.get(key, 0)
+            self.__served[key] = served + 1
+            if self.__started is None:
+                self.__started = time.monotonic()
+        return entries[min(served, len(entries) - 1)]
+
+    def send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Answer a request from the recording.
+
+        :param method: HTTP method
+        :type method: str
+
+        :param url: Absolute URL
+        :type url: str
+
+        :param kwargs: Keyword arguments of ``requests.Session.request``
+        :type kwargs: dict
+
+        :raises: ReplayMissExceptions
+
+        :return: Response
+        :rtype: requests.Response
+        """
+
+        key = request_key(method, url, kwargs.get('params'), kwargs.get('json'), kwargs.get('data'))
+        entry = self._next(key)
+        if entry is None:
+            raise ReplayMissExceptions('replay', f'request not recorded | {key}', {'path': self.path})
+
+        offset, header = entry
+        record = _decode(self.__data, offset, header)
+
+        if self.pacing:
+            due = self.__started + (record.started_at + record.elapsed - self.__first) / self.speed
+            delay = due - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+        response = requests.Response()
+        response.status_code = record.status_code
+        response.url = url
+        response.headers = CaseInsensitiveDict(record.headers)
+        response.encoding = 'utf-8'
+        response._content = record.body
+        return response
+
+    def reset(self) -> None:
+        """
+        Start the replay over: serve every key from its first response and restart the pacing clock.
+
+        :return: None
+        """
+
+        with self.__lock:
+            self.__served.clear()
+            self.__started = None
+
+    def close(self) -> None:
+        if isinstance(self.__data, mmap.mmap):
+            self.__data.close()
+        self.__file.close()
+
+    def __str__(self):
+        return f'{self.__class__.__name__} | (path={self.path}, records={len(self)}, pacing={self.pacing})'
+
+    def __repr__(self):
+        return self.__str__()
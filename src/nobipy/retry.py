@@ -0,0 +1,161 @@
+import asyncio
+import random
+import threading
+import time
+import typing as t
+
+import requests
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None
+
+from .endpoints import ENDPOINTS
+from .exceptions import StatusCodeExceptions
+
+
+__all__ = [
+    'IDEMPOTENT_ENDPOINTS',
+    'RetryPolicy',
+]
+
+
+# Endpoints that can be repeated without side effects, from the endpoint table. Order placement, status
+# updates, cancellation, address generation and bank card registration are deliberately not marked.
+IDEMPOTENT_ENDPOINTS = frozenset(endpoint.name for endpoint in ENDPOINTS.values() if endpoint.idempotent)
+
+_TRANSIENT_EXCEPTIONS: t.Tuple[t.Type[BaseException], ...] = (
+    requests.ConnectionError, requests.Timeout, asyncio.TimeoutError,
+)
+if aiohttp is not None:
+    _TRANSIENT_EXCEPTIONS += (aiohttp.ClientConnectionError,)
+
+
+class RetryPolicy:
+    def __init__(
+            self, max_attempts: int = 3, backoff_base: float = 0.1, backoff_max: float = 5.0,
+            jitter: bool = True, total_timeout: float = 10.0,
+            retry_on_status: t.Iterable[int] = (429, 500, 502, 503, 504),
+            retry_on_exceptions: t.Tuple[t.Type[BaseException], ...] = _TRANSIENT_EXCEPTIONS,
+            idempotent: t.Iterable[str] = IDEMPOTENT_ENDPOINTS,
+    ) -> None:
+        """
+        Retry policy with exponential backoff and full jitter.
+
+        Only endpoints listed in ``idempotent`` are retried, so ``create_order`` and friends are never
+        sent twice by the client.
+
+        :param max_attempts: Maximum attempts per call, including the first one (optional)
+        :type max_attempts: int
+
+        :param backoff_base: Delay before the first retry in seconds, doubled every attempt (optional)
+        :type backoff_base: float
+
+        :param backoff_max: Maximum delay between attempts in seconds (optional)
+        :type backoff_max: float
+
+        :param jitter: Draw each delay uniformly from [0, backoff] (optional)
+        :type jitter: bool
+
+        :param total_timeout: Time budget per call in seconds; no retry starts after it (optional)
+        :type total_timeout: float
+
+        :param retry_on_status: HTTP status codes to retry (optional)
+        :type retry_on_status: iterable
+
+        :param retry_on_exceptions: Transport exception types to retry (optional)
+        :type retry_on_exceptions: tuple
+
+        :param idempotent: Endpoint (function) names safe to retry (optional)
+        :type idempotent: iterable
+
+        :return: None
+        """
+
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.total_timeout = total_timeout
+        self.retry_on_status = frozenset(retry_on_status)
+        self.retry_on_exceptions = tuple(retry_on_exceptions)
+        self.idempotent = frozenset(idempotent)
+
+        self.__lock = threading.Lock()
+        self.__retries: t.Dict[str, int] = {}
+        self.__exhausted: t.Dict[str, int] = {}
+
+    def retryable(self, error: BaseException) -> bool:
+        """
+        Whether an error is transient according to the policy.
+
+        :param error: Raised exception
+        :type error: Exception
+
+        :return: Retryable
+        :rtype: bool
+        """
+
+        if isinstance(error, StatusCodeExceptions):
+            return error.status_code in self.retry_on_status
+
+        return isinstance(error, self.retry_on_exceptions) or isinstance(error.__cause__, self.retry_on_exceptions)
+
+    def next_delay(self, func_name: str, attempt: int, error: BaseException, started: float) -> t.Optional[float]:
+        """
+        Delay before retrying a failed attempt, or None to give up.
+
+        :param func_name: Endpoint (function) name
+        :type func_name: str
+
+        :param attempt: Number of failed attempts so far
+        :type attempt: int
+
+        :param error: Raised exception
+        :type error: Exception
+
+        :param started: ``time.monotonic()`` when the call started
+        :type started: float
+
+        :return: Delay in seconds
+        :rtype: float | None
+        """
+
+        if func_name not in self.idempotent or not self.retryable(error):
+            return None
+
+        backoff = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+        delay = random.uniform(0, backoff) if self.jitter else backoff
+
+        if attempt >= self.max_attempts or time.monotonic() - started + delay > self.total_timeout:
+            with self.__lock:
+                self.__exhausted[func_name] = self.__exhausted.get(func_name, 0) + 1
+            return None
+
+        with self.__lock:
+            self.__retries[func_name] = self.__retries.get(func_name, 0) + 1
+        return delay
+
+    def stats(self) -> t.Dict[str, t.Dict[str, int]]:
+        """
+        Retry counters per endpoint.
+
+        :return: ``{endpoint: {'retries': int, 'exhausted': int}}``
+        :rtype: dict
+        """
+
+        with self.__lock:
+            return {
+                endpoint: {'retries': self.__retries.get(endpoint, 0), 'exhausted': self.__exhausted.get(endpoint, 0)}
+                for endpoint in set(self.__retries) | set(self.__exhausted)
+            }
+
+    def __str__(self):
+        return (
+            f'{self.__class__.__name__} | (max_attempts={self.max_attempts}, backoff_base={self.backoff_base}, '
+            f'total_timeout={self.total_timeout})'
+        )
+
+    def __repr__(self):
+        return self.__str__()
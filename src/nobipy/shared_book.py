@@ -0,0 +1,554 @@
+import mmap
+import os
+import struct
+import threading
+import time
+import typing as t
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # pragma: no cover
+    shared_memory = None
+
+try:
+    import _posixshmem
+except ImportError:  # pragma: no cover
+    _posixshmem = None
+
+from .const import Side
+from .exceptions import NobitexExceptions
+from .snapshot import OrderbookSnapshot
+from .tape import TRADE_DTYPE, _trade_fields
+
+
+__all__ = [
+    'SharedBook',
+    'SharedBookPublisher',
+    'segment_name',
+]
+
+
+_MAGIC = b'NOBISHM1'
+
+# magic, sequence, level capacity, trade capacity, bid count, ask count, trade count, padding,
+# server "lastUpdate", book published at, trades published at (unix times)
+_HEADER = struct.Struct('<8sQIIIIIIqdd')
+_SEQUENCE_OFFSET = 8
+_COUNTS = struct.Struct('<III')
+_COUNTS_OFFSET = 24
+_TIMES = struct.Struct('<qdd')
+_TIMES_OFFSET = 40
+
+# Sequence of a segment its publisher gave up: odd, so no read succeeds on it any more.
+_DEAD = 2 ** 64 - 1
+
+
+def segment_name(symbol: str, prefix: str = 'nobipy') -> str:
+    """
+    Name of the shared memory segment of a symbol.
+
+    :param symbol: Symbol
+    :type symbol: str
+
+    :param prefix: Segment name prefix (optional)
+    :type prefix: str
+
+    :return: Segment name
+    :rtype: str
+    """
+
+    return f'{prefix}-{symbol.upper()}'
+
+
+def _layout(levels: int, trades: int) -> t.Tuple[int, int, int, int]:
+    # Offsets of bids, asks and trades, and the segment size.
+    bids = _HEADER.size
+    asks = bids + levels * 16
+    tape = asks + levels * 16
+    return bids, asks, tape, tape + trades * np.dtype(TRADE_DTYPE).itemsize
+
+
+class _ReadOnlyMemory:
+    __slots__ = ('buf', '_mmap')
+
+    def __init__(self, name: str) -> None:
+        # ``SharedMemory`` would register the segment with this process's resource tracker, which
+        # unlinks it at exit (and, after a fork, shares the tracker with the publisher). Readers only
+        # map it, read-only.
+        fd = _posixshmem.shm_open('/' + name, os.O_RDONLY, mode=0o600)
+        try:
+            self._mmap = mmap.mmap(fd, os.fstat(fd).st_size, prot=mmap.PROT_READ)
+        finally:
+            os.close(fd)
+        self.buf = memoryview(self._mmap)
+
+    def close(self) -> None:
+        self.buf.release()
+        self._mmap.close()
+
+
+class _Segment:
+    __slots__ = ('memory', 'levels', 'capacity', 'sequence', 'bids', 'asks', 'trades')
+
+    def __init__(self, memory: t.Any, levels: int, capacity: int) -> None:
+        # Array views over one segment; the sequence is a single aligned 8-byte word.
+        buffer = memory.buf
+        bids, asks, tape, _ = _layout(levels, capacity)
+        self.memory = memory
+        self.levels = levels
+        self.capacity = capacity
+        self.sequence = np.ndarray((1,), np.uint64, buffer, _SEQUENCE_OFFSET)
+        self.bids = np.ndarray((levels, 2), np.float64, buffer, bids)
+        self.asks = np.ndarray((levels, 2), np.float64, buffer, asks)
+        self.trades = np.ndarray((capacity,), TRADE_DTYPE, buffer, tape)
+
+    def release(self) -> None:
+        self.sequence = self.bids = self.asks = self.trades = None
+        self.memory.close()
+
+
+class SharedBook:
+    def __init__(self, symbol: str, prefix: str = 'nobipy', timeout: float = 1.0) -> None:
+        """
+        Reader of the latest order book and trades of a symbol, published by ``SharedBookPublisher`` in
+        another process on this machine.
+
+        Reads come straight from shared memory: no request, no JSON. The publisher bumps a sequence number
+        to an odd value before writing and to the next even value after; a read is retried until it sees
+        the same even value before and after, so it never returns a half-written book.
+
+        Requires Python 3.8+ and the optional ``numpy`` dependency (``pip install nobipy[numpy]``).
+
+        :param symbol: Symbol
+        :type symbol: str
+
+        :param prefix: Segment name prefix of the publisher (optional)
+        :type prefix: str
+
+        :param timeout: Seconds a read waits for a write in progress before failing (optional)
+        :type timeout: float
+
+        :raises: FileNotFoundError
+
+        :return: None
+        """
+
+        if np is None or shared_memory is None:
+            raise ImportError('SharedBook requires Python 3.8+ and numpy | Try "pip install nobipy[numpy]"')
+
+        self.symbol = symbol.upper()
+        self.name = segment_name(symbol, prefix)
+        self.timeout = timeout
+
+        memory = _ReadOnlyMemory(self.name) if _posixshmem is not None else shared_memory.SharedMemory(self.name)
+
+        magic, _, levels, capacity = _HEADER.unpack_from(memory.buf)[:4]
+        if magic != _MAGIC:
+            memory.close()
+            raise ValueError(f'{self.name} is not a nobipy shared book')
+        self.__segment = _Segment(memory, levels, capacity)
+
+    def read(self, fn: t.Callable[[t.Tuple[int, int, int]], t.Any]) -> t.Any:
+        """
+        Run ``fn`` on a consistent state of the segment.
+
+        ``fn`` gets the bid, ask and trade counts and reads the views ``bids``, ``asks`` and ``trades``
+        without copying. It is run again when the publisher wrote in the meantime, so it must not have
+        side effects, and its result must not keep views.
+
+        :param fn: Function of the counts
+        :type fn: callable
+
+        :raises: NobitexExceptions (also when the publisher closed or replaced the segment)
+
+        :return: Result of ``fn``
+        :rtype: any
+        """
+
+        segment = self.__segment
+        buffer = segment.memory.buf
+        sequence = segment.sequence
+        deadline = None
+
+        while True:
+            before = int(sequence[0])
+            if not before & 1:
+                result = fn(_COUNTS.unpack_from(buffer, _COUNTS_OFFSET))
+                if int(sequence[0]) == before:
+                    return result
+            elif before == _DEAD:
+                raise NobitexExceptions('shared_book', 'Segment closed by its publisher | Open a new SharedBook', {
+                    'symbol': self.symbol,
+                })
+            if deadline is None:
+                deadline = time.monotonic() + self.timeout
+            elif time.monotonic() > deadline:
+                raise NobitexExceptions('shared_book', 'No consistent read | Is the publisher alive?', {
+                    'symbol': self.symbol, 'sequence': before,
+                })
+            time.sleep(0)
+
+    def snapshot(self) -> OrderbookSnapshot:
+        """
+        Copy of the latest order book.
+
+        :raises: NobitexExceptions
+
+        :return: Snapshot
+        :rtype: OrderbookSnapshot
+        """
+
+        segment = self.__segment
+
+        def copy(counts: t.Tuple[int, int, int]) -> OrderbookSnapshot:
+            last_update = _TIMES.unpack_from(segment.memory.buf, _TIMES_OFFSET)[0]
+            return OrderbookSnapshot(
+                self.symbol, segment.bids[:counts[0]].copy(), segment.asks[:counts[1]].copy(), last_update or None,
+            )
+
+        return self.read(copy)
+
+    def latest_trades(self) -> 'np.ndarray':
+        """
+        Copy of the latest trades, oldest first, as ``TRADE_DTYPE`` records (``side`` +1 buy / -1 sell).
+
+        :raises: NobitexExceptions
+
+        :return: Trades
+        :rtype: numpy.ndarray
+        """
+
+        segment = self.__segment
+        return self.read(lambda counts: segment.trades[:counts[2]].copy())
+
+    def best(self) -> t.Tuple[float, float]:
+        """
+        Best bid and ask price, ``nan`` for an empty side.
+
+        :raises: NobitexExceptions
+
+        :return: Best bid and best ask
+        :rtype: tuple
+        """
+
+        segment = self.__segment
+        return self.read(lambda counts: (
+            float(segment.bids[0, 0]) if counts[0] else float('nan'),
+            float(segment.asks[0, 0]) if counts[1] else float('nan'),
+        ))
+
+    @property
+    def bids(self) -> 'np.ndarray':
+        return self.__segment.bids
+
+    @property
+    def asks(self) -> 'np.ndarray':
+        return self.__segment.asks
+
+    @property
+    def trades(self) -> 'np.ndarray':
+        return self.__segment.trades
+
+    @property
+    def sequence(self) -> int:
+        """
+        Sequence number; it grows by 2 with every write, so a change means new data
+
+        :return: Sequence number
+        :rtype: int
+        """
+
+        return int(self.__segment.sequence[0])
+
+    @property
+    def published_at(self) -> t.Tuple[float, float]:
+        """
+        Unix times of the last book and trades writes, 0 when never written
+
+        :return: Book and trades publish times
+        :rtype: tuple
+        """
+
+        return self.read(lambda counts: _TIMES.unpack_from(self.__segment.memory.buf, _TIMES_OFFSET)[1:])
+
+    def close(self) -> None:
+        self.__segment.release()
+
+    def __enter__(self) -> 'SharedBook':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def __str__(self):
+        return f'{self.__class__.__name__} | (symbol={self.symbol}, sequence={self.sequence})'
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class SharedBookPublisher:
+    def __init__(
+            self, client, symbols: t.Iterable[str], prefix: str = 'nobipy', levels: int = 50,
+            trades: int = 100, interval: float = 1.0, max_workers: int = 8,
+    ) -> None:
+        """
+        Poll ``orderbook`` and ``trades`` once for all local processes and publish the latest book and
+        trades of each symbol in a fixed-layout shared memory segment, read with ``SharedBook``.
+
+        Each segment (see ``segment_name``) holds a header with a sequence number, ``levels`` bid and ask
+        rows of ``[price, quantity]`` float64 and ``trades`` records of ``TRADE_DTYPE``. Segments are
+        created here and removed by ``close``; there must be a single publisher per segment name. A segment
+        left by a publisher that did not close is taken over when its layout matches, so its readers get
+        the new data; otherwise it is replaced and its readers' reads raise.
+
+        Requires Python 3.8+ and the optional ``numpy`` dependency (``pip install nobipy[numpy]``).
+
+        :param client: Client (``Nobitex``)
+        :type client: Nobitex
+
+        :param symbols: Symbols
+        :type symbols: iterable
+
+        :param prefix: Segment name prefix (optional)
+        :type prefix: str
+
+        :param levels: Levels kept per side (optional)
+        :type levels: int
+
+        :param trades: Trades kept per symbol, 0 to not poll trades (optional)
+        :type trades: int
+
+        :param interval: Seconds between polls when running in the background (optional)
+        :type interval: float
+
+        :param max_workers: Maximum concurrent requests per poll (optional)
+        :type max_workers: int
+
+        :return: None
+        """
+
+        if np is None or shared_memory is None:
+            raise ImportError('SharedBookPublisher requires Python 3.8+ and numpy | Try "pip install nobipy[numpy]"')
+
+        self.client = client
+        self.symbols = [symbol.upper() for symbol in symbols]
+        self.prefix = prefix
+        self.levels = levels
+        self.capacity = trades
+        self.interval = interval
+        self.max_workers = max_workers
+        # (symbol, 'book' | 'trades') -> error of the last poll of that feed
+        self.errors: t.Dict[t.Tuple[str, str], NobitexExceptions] = {}
+
+        self.__segments: t.Dict[str, _Segment] = {}
+        for symbol in self.symbols:
+            self.__segments[symbol] = self._create(symbol)
+
+        self.__stop = threading.Event()
+        self.__thread: t.Optional[threading.Thread] = None
+
+    def _create(self, symbol: str) -> _Segment:
+        name = segment_name(symbol, self.prefix)
+        size = _layout(self.levels, self.capacity)[3]
+        try:
+            memory = shared_memory.SharedMemory(name, create=True, size=size)
+        except FileExistsError:
+            # Left behind by a publisher that did not close.
+            stale = shared_memory.SharedMemory(name)
+            magic, _, levels, capacity = _HEADER.unpack_from(stale.buf)[:4]
+            if magic == _MAGIC and levels == self.levels and capacity == self.capacity and stale.size >= size:
+                # Same layout: take it over, so readers still attached to it see the new data.
+                segment = _Segment(stale, levels, capacity)
+                self._reset(segment)
+                return segment
+            if magic == _MAGIC:
+                # Readers of the old layout must not keep reading it as if it were live.
+                segment = _Segment(stale, levels, capacity)
+                self._retire(segment)
+            else:
+                stale.close()
+                stale.unlink()
+            memory = shared_memory.SharedMemory(name, create=True, size=size)
+
+        _HEADER.pack_into(memory.buf, 0, _MAGIC, 0, self.levels, self.capacity, 0, 0, 0, 0, 0, 0.0, 0.0)
+        return _Segment(memory, self.levels, self.capacity)
+
+    @staticmethod
+    def _reset(segment: _Segment) -> None:
+        # Empty the book and trades under the sequence protocol. An odd sequence means the previous
+        # publisher stopped in the middle of a write; the write is finished here.
+        sequence = int(segment.sequence[0])
+        sequence += 0 if sequence & 1 else 1
+        segment.sequence[0] = sequence
+        _COUNTS.pack_into(segment.memory.buf, _COUNTS_OFFSET, 0, 0, 0)
+        _TIMES.pack_into(segment.memory.buf, _TIMES_OFFSET, 0, 0.0, 0.0)
+        segment.sequence[0] = sequence + 1
+
+    @staticmethod
+    def _retire(segment: _Segment) -> None:
+        # Mark the segment dead, so attached readers raise instead of reading frozen data, and remove it.
+        segment.sequence[0] = _DEAD
+        segment.memory.buf[:len(_MAGIC)] = bytes(len(_MAGIC))
+        memory = segment.memory
+        segment.release()
+        memory.unlink()
+
+    def publish_book(self, symbol: str, payload: t.Dict) -> int:
+        """
+        Write a decoded ``orderbook`` response.
+
+        :param symbol: Symbol
+        :type symbol: str
+
+        :param payload: Decoded response body
+        :type payload: dict
+
+        :return: New sequence number
+        :rtype: int
+        """
+
+        segment = self.__segments[symbol.upper()]
+        bids = np.asarray(payload.get('bids') or [], dtype=np.float64).reshape(-1, 2)[:segment.levels]
+        asks = np.asarray(payload.get('asks') or [], dtype=np.float64).reshape(-1, 2)[:segment.levels]
+        buffer = segment.memory.buf
+        trade_count = _COUNTS.unpack_from(buffer, _COUNTS_OFFSET)[2]
+        trades_at = _TIMES.unpack_from(buffer, _TIMES_OFFSET)[2]
+
+        sequence = int(segment.sequence[0]) + 1
+        segment.sequence[0] = sequence
+        segment.bids[:len(bids)] = bids
+        segment.asks[:len(asks)] = asks
+        _COUNTS.pack_into(buffer, _COUNTS_OFFSET, len(bids), len(asks), trade_count)
+        _TIMES.pack_into(buffer, _TIMES_OFFSET, int(payload.get('lastUpdate') or 0), time.time(), trades_at)
+        segment.sequence[0] = sequence + 1
+        return sequence + 1
+
+    def publish_trades(self, symbol: str, payload: t.Dict) -> int:
+        """
+        Write a decoded ``trades`` response.
+
+        :param symbol: Symbol
+        :type symbol: str
+
+        :param payload: Decoded response body
+        :type payload: dict
+
+        :return: New sequence number
+        :rtype: int
+        """
+
+        segment = self.__segments[symbol.upper()]
+        # Responses are newest first; the segment keeps the newest ones, oldest first.
+        fields = [_trade_fields(trade) for trade in (payload.get('trades') or [])[:segment.capacity]]
+        fields.reverse()
+        records = np.array(
+            [(time_, price, volume, 1 if side == Side.Buy else -1) for time_, price, volume, side in fields],
+            dtype=TRADE_DTYPE,
+        )
+        buffer = segment.memory.buf
+        bid_count, ask_count, _ = _COUNTS.unpack_from(buffer, _COUNTS_OFFSET)
+        last_update, book_at, _ = _TIMES.unpack_from(buffer, _TIMES_OFFSET)
+
+        sequence = int(segment.sequence[0]) + 1
+        segment.sequence[0] = sequence
+        segment.trades[:len(records)] = records
+        _COUNTS.pack_into(buffer, _COUNTS_OFFSET, bid_count, ask_count, len(records))
+        _TIMES.pack_into(buffer, _TIMES_OFFSET, last_update, book_at, time.time())
+        segment.sequence[0] = sequence + 1
+        return sequence + 1
+
+    def poll(self) -> t.Dict[str, int]:
+        """
+        Fetch every symbol once and publish the results.
+
+        Failures are kept per feed in ``errors``, keyed ``(symbol, 'book')`` or ``(symbol, 'trades')``; the
+        failed feed keeps its previous data. A feed that succeeded is still published.
+
+        :return: Sequence number by symbol, only for symbols whose feeds were all published
+        :rtype: dict
+        """
+
+        feeds = [('book', self.client.orderbooks, self.publish_book)]
+        if self.capacity:
+            feeds.append(('trades', self.client.trades_many, self.publish_trades))
+
+        sequences = {}
+        failed = set()
+        for feed, fetch, publish in feeds:
+            payloads = fetch(self.symbols, self.max_workers, return_exceptions=True)
+            for symbol in self.symbols:
+                payload = payloads.get(symbol)
+                if isinstance(payload, Exception):
+                    self.errors[(symbol, feed)] = payload
+                    failed.add(symbol)
+                    continue
+                self.errors.pop((symbol, feed), None)
+                if payload is not None:
+                    sequences[symbol] = publish(symbol, payload)
+
+        for symbol in failed:
+            sequences.pop(symbol, None)
+        return sequences
+
+    def _run(self) -> None:
+        while not self.__stop.is_set():
+            self.poll()
+            self.__stop.wait(self.interval)
+
+    def start(self) -> None:
+        """
+        Start polling on a background thread.
+
+        :return: None
+        """
+
+        if self.__thread is not None and self.__thread.is_alive():
+            return
+        self.__stop.clear()
+        self.__thread = threading.Thread(target=self._run, name='nobipy-shared-book', daemon=True)
+        self.__thread.start()
+
+    def stop(self, timeout: float = None) -> None:
+        """
+        Stop the background thread.
+
+        :param timeout: Seconds to wait for the thread (optional)
+        :type timeout: float
+
+        :return: None
+        """
+
+        self.__stop.set()
+        if self.__thread is not None:
+            self.__thread.join(timeout)
+            self.__thread = None
+
+    def close(self) -> None:
+        """
+        Stop polling and remove the segments. Reads of readers still attached raise from then on.
+
+        :return: None
+        """
+
+        self.stop()
+        for segment in self.__segments.values():
+            self._retire(segment)
+        self.__segments.clear()
+
+    def __enter__(self) -> 'SharedBookPublisher':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def __str__(self):
+        return f'{self.__class__.__name__} | (symbols={len(self.symbols)}, prefix={self.prefix})'
+
+    def __repr__(self):
+        return self.__str__()
@@ -0,0 +1,115 @@
+import asyncio
+import threading
+import typing as t
+
+
+__all__ = [
+    'SingleFlight',
+    'AsyncSingleFlight',
+]
+
+
+class _Flight:
+    __slots__ = ('event', 'result', 'error')
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.result = None
+        self.error: t.Optional[BaseException] = None
+
+
+class SingleFlight:
+    def __init__(self) -> None:
+        """
+        Collapse concurrent calls with the same key into one execution (threaded).
+
+        The first caller of a key runs the function; callers arriving while it is in flight wait and
+        receive the same result, or the same exception.
+
+        :return: None
+        """
+
+        self.__lock = threading.Lock()
+        self.__flights: t.Dict[t.Hashable, _Flight] = {}
+        self.coalesced = 0
+
+    def do(self, key: t.Hashable, fn: t.Callable[[], t.Any]) -> t.Any:
+        """
+        Run ``fn`` once for all concurrent callers of ``key``.
+
+        :param key: Key
+        :type key: hashable
+
+        :param fn: Function
+        :type fn: callable
+
+        :return: Result of ``fn``
+        """
+
+        with self.__lock:
+            flight = self.__flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self.__flights[key] = _Flight()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = fn()
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self.__lock:
+                del self.__flights[key]
+            flight.event.set()
+
+    def __len__(self):
+        return len(self.__flights)
+
+
+class AsyncSingleFlight:
+    def __init__(self) -> None:
+        """
+        Collapse concurrent calls with the same key into one execution (asyncio).
+
+        The shared call runs as its own task, so cancelling one waiter does not cancel the others.
+
+        :return: None
+        """
+
+        self.__flights: t.Dict[t.Hashable, asyncio.Future] = {}
+        self.coalesced = 0
+
+    async def do(self, key: t.Hashable, fn: t.Callable[[], t.Awaitable]) -> t.Any:
+        """
+        Await ``fn()`` once for all concurrent callers of ``key``.
+
+        :param key: Key
+        :type key: hashable
+
+        :param fn: Coroutine function
+        :type fn: callable
+
+        :return: Result of ``fn()``
+        """
+
+        task = self.__flights.get(key)
+
+        if task is None:
+            task = self.__flights[key] = asyncio.ensure_future(fn())
+            task.add_done_callback(lambda _: self.__flights.pop(key, None))
+        else:
+            self.coalesced += 1
+
+        return await asyncio.shield(task)
+
+    def __len__(self):
+        return len(self.__flights)
@@ -0,0 +1,220 @@
+import typing as t
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+from .const import Side
+from .exceptions import InvalidInputExceptions
+
+
+__all__ = [
+    'OrderbookSnapshot',
+]
+
+
+def _levels(levels: t.List) -> 'np.ndarray':
+    if not levels:
+        return np.empty((0, 2), dtype=np.float64)
+    return np.asarray(levels, dtype=np.float64).reshape(-1, 2)
+
+
+class OrderbookSnapshot:
+    __slots__ = (
+        'symbol', 'last_update', 'bids', 'asks',
+        '_bid_cum_qty', '_bid_cum_notional', '_ask_cum_qty', '_ask_cum_notional',
+    )
+
+    def __init__(self, symbol: str, bids: 'np.ndarray', asks: 'np.ndarray', last_update: int = None) -> None:
+        """
+        Order book snapshot stored as contiguous ``float64`` arrays.
+
+        ``bids`` and ``asks`` are ``(n, 2)`` arrays of ``[price, quantity]`` rows, best level first
+        (see ``Orderbook.PriceIndex`` / ``Orderbook.QuantityIndex``). Requires the optional ``numpy``
+        dependency (``pip install nobipy[numpy]``).
+
+        :param symbol: Symbol
+        :type symbol: str
+
+        :param bids: Bid levels, highest price first
+        :type bids: numpy.ndarray
+
+        :param asks: Ask levels, lowest price first
+        :type asks: numpy.ndarray
+
+        :param last_update: Server "lastUpdate" timestamp (optional)
+        :type last_update: int
+
+        :return: None
+        """
+
+        if np is None:
+            raise ImportError('OrderbookSnapshot requires numpy | Try "pip install nobipy[numpy]"')
+
+        self.symbol = symbol
+        self.last_update = last_update
+        self.bids = np.ascontiguousarray(bids, dtype=np.float64)
+        self.asks = np.ascontiguousarray(asks, dtype=np.float64)
+
+        self._bid_cum_qty = None
+        self._bid_cum_notional = None
+        self._ask_cum_qty = None
+        self._ask_cum_notional = None
+
+    @classmethod
+    def from_payload(cls, payload: t.Dict, symbol: str = None) -> 'OrderbookSnapshot':
+        """
+        Build a snapshot from a decoded ``orderbook`` response.
+
+        :param payload: Decoded response body
+        :type payload: dict
+
+        :param symbol: Symbol (optional)
+        :type symbol: str
+
+        :return: Snapshot
+        :rtype: OrderbookSnapshot
+        """
+
+        if np is None:
+            raise ImportError('OrderbookSnapshot requires numpy | Try "pip install nobipy[numpy]"')
+
+        return cls(
+            symbol=symbol,
+            bids=_levels(payload.get('bids')),
+            asks=_levels(payload.get('asks')),
+            last_update=payload.get('lastUpdate'),
+        )
+
+    def _book(self, side: str) -> t.Tuple['np.ndarray', 'np.ndarray', 'np.ndarray']:
+        """
+        Levels consumed by an order of the given side, with cached cumulative quantity and notional.
+
+        A buy order consumes asks, a sell order consumes bids.
+        """
+
+        if side == Side.Buy:
+            if self._ask_cum_qty is None:
+                self._ask_cum_qty = np.cumsum(self.asks[:, 1])
+                self._ask_cum_notional = np.cumsum(self.asks[:, 0] * self.asks[:, 1])
+            return self.asks, self._ask_cum_qty, self._ask_cum_notional
+
+        if side == Side.Sell:
+            if self._bid_cum_qty is None:
+                self._bid_cum_qty = np.cumsum(self.bids[:, 1])
+                self._bid_cum_notional = np.cumsum(self.bids[:, 0] * self.bids[:, 1])
+            return self.bids, self._bid_cum_qty, self._bid_cum_notional
+
+        raise InvalidInputExceptions('OrderbookSnapshot', f'invalid side "{side}"', {'side': side})
+
+    @property
+    def best_bid(self) -> float:
+        return float(self.bids[0, 0]) if len(self.bids) else float('nan')
+
+    @property
+    def best_ask(self) -> float:
+        return float(self.asks[0, 0]) if len(self.asks) else float('nan')
+
+    @property
+    def spread(self) -> float:
+        return self.best_ask - self.best_bid
+
+    @property
+    def mid(self) -> float:
+        return (self.best_ask + self.best_bid) / 2
+
+    def cumulative_depth(self, side: t.Union[str, Side]) -> 'np.ndarray':
+        """
+        Cumulative quantity available to an order of the given side, level by level.
+
+        :param side: Side ('buy' walks the asks, 'sell' walks the bids)
+        :type side: str | Side
+
+        :return: Cumulative quantity
+        :rtype: numpy.ndarray
+        """
+
+        return self._book(side)[1]
+
+    def imbalance(self, levels: int = None) -> float:
+        """
+        Order book imbalance ``(bid_qty - ask_qty) / (bid_qty + ask_qty)`` over the top levels.
+
+        :param levels: Number of levels per side, all when omitted (optional)
+        :type levels: int
+
+        :return: Imbalance in [-1, 1]
+        :rtype: float
+        """
+
+        bid_qty = self.bids[:levels, 1].sum()
+        ask_qty = self.asks[:levels, 1].sum()
+        total = bid_qty + ask_qty
+        return float((bid_qty - ask_qty) / total) if total else float('nan')
+
+    def vwap(self, size: t.Union[float, 'np.ndarray'], side: t.Union[str, Side]) -> t.Union[float, 'np.ndarray']:
+        """
+        Average fill price of a market order of the given size.
+
+        Accepts a scalar or an array of sizes. Sizes larger than the visible depth give ``nan``.
+
+        :param size: Order size in base currency
+        :type size: float | numpy.ndarray
+
+        :param side: Side ('buy' walks the asks, 'sell' walks the bids)
+        :type side: str | Side
+
+        :return: VWAP
+        :rtype: float | numpy.ndarray
+        """
+
+        levels, cum_qty, cum_notional = self._book(side)
+        sizes = np.asarray(size, dtype=np.float64)
+
+        index = np.searchsorted(cum_qty, sizes, side='left')
+        filled = index < len(cum_qty)
+        safe = np.minimum(index, max(len(cum_qty) - 1, 0))
+
+        if len(cum_qty):
+            prev_qty = np.where(safe > 0, cum_qty[safe - 1], 0.0)
+            prev_notional = np.where(safe > 0, cum_notional[safe - 1], 0.0)
+            notional = prev_notional + (sizes - prev_qty) * levels[safe, 0]
+        else:
+            notional = np.zeros_like(sizes)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            result = np.where(filled & (sizes > 0), notional / sizes, np.nan)
+
+        return float(result) if result.ndim == 0 else result
+
+    def slippage(self, size: t.Union[float, 'np.ndarray'], side: t.Union[str, Side]) -> t.Union[float, 'np.ndarray']:
+        """
+        Relative cost of a market order against the mid price.
+
+        Positive values are a cost for both sides.
+
+        :param size: Order size in base currency
+        :type size: float | numpy.ndarray
+
+        :param side: Side ('buy' walks the asks, 'sell' walks the bids)
+        :type side: str | Side
+
+        :return: Slippage as a fraction of the mid price
+        :rtype: float | numpy.ndarray
+        """
+
+        mid = self.mid
+        vwap = self.vwap(size, side)
+        if side == Side.Buy:
+            return (vwap - mid) / mid
+        return (mid - vwap) / mid
+
+    def __str__(self):
+        return (
+            f'{self.__class__.__name__} | (symbol={self.symbol}, bids={len(self.bids)}, '
+            f'asks={len(self.asks)}, last_update={self.last_update})'
+        )
+
+    def __repr__(self):
+        return self.__str__()
@@ -0,0 +1,403 @@
+import os
+import threading
+import typing as t
+from collections import Counter
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+from .const import Side
+from .exceptions import NobitexExceptions
+
+
+__all__ = [
+    'TRADE_DTYPE',
+    'TradeRingBuffer',
+    'TradeTapeRecorder',
+]
+
+
+TRADE_DTYPE = [('time', '<i8'), ('price', '<f8'), ('volume', '<f8'), ('side', 'i1')]
+
+
+class TradeRingBuffer:
+    def __init__(self, capacity: int, spill_path: str = None) -> None:
+        """
+        Fixed-capacity, array-backed ring buffer of trades in time order.
+
+        Columns are ``time`` (int64, milliseconds), ``price`` and ``volume`` (float64) and ``side``
+        (int8, +1 buy / -1 sell). When ``spill_path`` is set, trades about to be overwritten are first
+        appended to that file as ``TRADE_DTYPE`` records (readable with ``numpy.fromfile``).
+
+        Requires the optional ``numpy`` dependency (``pip install nobipy[numpy]``).
+
+        :param capacity: Maximum number of trades kept in memory
+        :type capacity: int
+
+        :param spill_path: File receiving overwritten trades (optional)
+        :type spill_path: str
+
+        :return: None
+        """
+
+        if np is None:
+            raise ImportError('TradeRingBuffer requires numpy | Try "pip install nobipy[numpy]"')
+
+        self.capacity = capacity
+        self.spill_path = spill_path
+
+        self.time = np.zeros(capacity, dtype=np.int64)
+        self.price = np.zeros(capacity, dtype=np.float64)
+        self.volume = np.zeros(capacity, dtype=np.float64)
+        self.side = np.zeros(capacity, dtype=np.int8)
+
+        self.__start = 0
+        self.__size = 0
+        self.__lock = threading.Lock()
+
+    def _spill(self, count: int) -> None:
+        if not self.spill_path or count <= 0:
+            return
+
+        records = np.empty(count, dtype=TRADE_DTYPE)
+        index = (self.__start + np.arange(count)) % self.capacity
+        for name, _ in TRADE_DTYPE:
+            records[name] = getattr(self, name)[index]
+        with open(self.spill_path, 'ab') as f:
+            records.tofile(f)
+
+    def extend(self, time: 'np.ndarray', price: 'np.ndarray', volume: 'np.ndarray', side: 'np.ndarray') -> None:
+        """
+        Append trades, oldest first.
+
+        :param time: Trade times in milliseconds
+        :type time: numpy.ndarray
+
+        :param price: Prices
+        :type price: numpy.ndarray
+
+        :param volume: Volumes
+        :type volume: numpy.ndarray
+
+        :param side: Sides (+1 buy, -1 sell)
+        :type side: numpy.ndarray
+
+        :return: None
+        """
+
+        count = len(time)
+        if count == 0:
+            return
+
+        columns = (time, price, volume, side)
+        if count > self.capacity:
+            # Only the newest trades fit; the rest goes straight to the spill file.
+            if self.spill_path:
+                records = np.empty(count - self.capacity, dtype=TRADE_DTYPE)
+                for (name, _), column in zip(TRADE_DTYPE, columns):
+                    records[name] = np.asarray(column)[:count - self.capacity]
+                with self.__lock:
+                    self._spill(self.__size)
+                    with open(self.spill_path, 'ab') as f:
+                        records.tofile(f)
+                    self.__start, self.__size = 0, 0
+            columns = tuple(np.asarray(column)[-self.capacity:] for column in columns)
+            count = self.capacity
+
+        with self.__lock:
+            overflow = self.__size + count - self.capacity
+            if overflow > 0:
+                self._spill(overflow)
+                self.__start = (self.__start + overflow) % self.capacity
+                self.__size -= overflow
+
+            index = (self.__start + self.__size + np.arange(count)) % self.capacity
+            for (name, _), column in zip(TRADE_DTYPE, columns):
+                getattr(self, name)[index] = column
+            self.__size += count
+
+    def _ordered(self, count: int = None) -> t.Tuple['np.ndarray', ...]:
+        with self.__lock:
+            size = self.__size if count is None else min(count, self.__size)
+            first = (self.__start + self.__size - size) % self.capacity
+            end = first + size
+            if end <= self.capacity:
+                return tuple(getattr(self, name)[first:end].copy() for name, _ in TRADE_DTYPE)
+            end -= self.capacity
+            return tuple(
+                np.concatenate((getattr(self, name)[first:], getattr(self, name)[:end])) for name, _ in TRADE_DTYPE
+            )
+
+    def last(self, count: int) -> t.Dict[str, 'np.ndarray']:
+        """
+        Newest trades, oldest first.
+
+        :param count: Number of trades
+        :type count: int
+
+        :return: Columns by name
+        :rtype: dict
+        """
+
+        return dict(zip((name for name, _ in TRADE_DTYPE), self._ordered(count)))
+
+    def window(self, duration_ms: int, now_ms: int = None) -> t.Dict[str, 'np.ndarray']:
+        """
+        Trades of the last ``duration_ms`` milliseconds, oldest first.
+
+        :param duration_ms: Window length in milliseconds
+        :type duration_ms: int
+
+        :param now_ms: Window end, defaults to the newest trade (optional)
+        :type now_ms: int
+
+        :return: Columns by name
+        :rtype: dict
+        """
+
+        time, price, volume, side = self._ordered()
+        if not len(time):
+            return {'time': time, 'price': price, 'volume': volume, 'side': side}
+
+        end = time[-1] if now_ms is None else now_ms
+        lo = np.searchsorted(time, end - duration_ms, side='right')
+        hi = np.searchsorted(time, end, side='right')
+        return {'time': time[lo:hi], 'price': price[lo:hi], 'volume': volume[lo:hi], 'side': side[lo:hi]}
+
+    def volume_over(self, duration_ms: int, now_ms: int = None) -> float:
+        """
+        Traded volume over a window.
+
+        :param duration_ms: Window length in milliseconds
+        :type duration_ms: int
+
+        :param now_ms: Window end, defaults to the newest trade (optional)
+        :type now_ms: int
+
+        :return: Volume
+        :rtype: float
+        """
+
+        return float(self.window(duration_ms, now_ms)['volume'].sum())
+
+    def vwap_over(self, duration_ms: int, now_ms: int = None) -> float:
+        """
+        Volume-weighted average price over a window, ``nan`` when it holds no trades.
+
+        :param duration_ms: Window length in milliseconds
+        :type duration_ms: int
+
+        :param now_ms: Window end, defaults to the newest trade (optional)
+        :type now_ms: int
+
+        :return: VWAP
+        :rtype: float
+        """
+
+        trades = self.window(duration_ms, now_ms)
+        total = trades['volume'].sum()
+        if not total:
+            return float('nan')
+        return float(np.dot(trades['price'], trades['volume']) / total)
+
+    def __len__(self):
+        return self.__size
+
+    def __str__(self):
+        return f'{self.__class__.__name__} | (size={self.__size}, capacity={self.capacity})'
+
+    def __repr__(self):
+        return self.__str__()
+
+
+def _trade_fields(trade: t.Any) -> t.Tuple[int, float, float, str]:
+    # Trades are dicts, or models when the client returns typed models.
+    if isinstance(trade, dict):
+        return int(trade['time']), float(trade['price']), float(trade['volume']), trade.get('type')
+    return trade.time, trade.price, trade.volume, trade.type
+
+
+class _Dedup:
+    __slots__ = ('last_time', 'seen')
+
+    def __init__(self) -> None:
+        self.last_time = -1
+        self.seen: Counter = Counter()
+
+    def new_trades(self, trades: t.Iterable) -> t.List[t.Tuple[int, float, float, str]]:
+        """
+        Trades not seen before, oldest first; ``trades`` is newest first.
+
+        Scanning stops at the first trade older than the newest one already recorded, so the cost is
+        proportional to the new trades (plus the ones sharing the newest recorded timestamp).
+        """
+
+        fresh = []
+        tie = Counter()
+
+        for trade in trades:
+            fields = _trade_fields(trade)
+            if fields[0] < self.last_time:
+                break
+            if fields[0] == self.last_time:
+                tie[fields] += 1
+                if tie[fields] <= self.seen[fields]:
+                    continue
+            fresh.append(fields)
+
+        if fresh:
+            newest = fresh[0][0]
+            if newest > self.last_time:
+                self.last_time = newest
+                self.seen = Counter(fields for fields in fresh if fields[0] == newest)
+            else:
+                self.seen.update(fresh)
+
+        fresh.reverse()
+        return fresh
+
+
+class TradeTapeRecorder:
+    def __init__(
+            self, client, symbols: t.Iterable[str], capacity: int = 100_000,
+            interval: float = 1.0, spill_dir: str = None, max_workers: int = 8,
+    ) -> None:
+        """
+        Record a continuous trade tape for many symbols by polling ``trades``.
+
+        Overlap between consecutive responses is removed by time and trade fields, and new trades
+        are appended to one ``TradeRingBuffer`` per symbol.
+
+        :param client: Client (``Nobitex``)
+        :type client: Nobitex
+
+        :param symbols: Symbols
+        :type symbols: iterable
+
+        :param capacity: Trades kept in memory per symbol (optional)
+        :type capacity: int
+
+        :param interval: Seconds between polls when running in the background (optional)
+        :type interval: float
+
+        :param spill_dir: Directory receiving overwritten trades as ``<SYMBOL>.trades`` (optional)
+        :type spill_dir: str
+
+        :param max_workers: Maximum concurrent requests per poll (optional)
+        :type max_workers: int
+
+        :return: None
+        """
+
+        self.client = client
+        self.symbols = [symbol.upper() for symbol in symbols]
+        self.interval = interval
+        self.max_workers = max_workers
+
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+
+        self.buffers = {
+            symbol: TradeRingBuffer(
+                capacity, os.path.join(spill_dir, f'{symbol}.trades') if spill_dir else None,
+            )
+            for symbol in self.symbols
+        }
+        self.errors: t.Dict[str, NobitexExceptions] = {}
+
+        self.__dedup = {symbol: _Dedup() for symbol in self.symbols}
+        self.__stop = threading.Event()
+        self.__thread: t.Optional[threading.Thread] = None
+
+    def record(self, symbol: str, payload: t.Dict) -> int:
+        """
+        Append the new trades of a decoded ``trades`` response.
+
+        :param symbol: Symbol
+        :type symbol: str
+
+        :param payload: Decoded response body
+        :type payload: dict
+
+        :return: Number of new trades
+        :rtype: int
+        """
+
+        symbol = symbol.upper()
+        fresh = self.__dedup[symbol].new_trades(payload.get('trades') or [])
+        if not fresh:
+            return 0
+
+        time, price, volume, side = zip(*fresh)
+        self.buffers[symbol].extend(
+            np.asarray(time, dtype=np.int64),
+            np.asarray(price, dtype=np.float64),
+            np.asarray(volume, dtype=np.float64),
+            np.asarray([1 if value == Side.Buy else -1 for value in side], dtype=np.int8),
+        )
+        return len(fresh)
+
+    def poll(self) -> t.Dict[str, int]:
+        """
+        Fetch every symbol once and record the new trades.
+
+        Failed symbols are kept in ``errors`` and skipped until the next poll.
+
+        :return: Number of new trades by symbol
+        :rtype: dict
+        """
+
+        payloads = self.client.trades_many(self.symbols, self.max_workers, return_exceptions=True)
+
+        counts = {}
+        for symbol, payload in payloads.items():
+            if isinstance(payload, Exception):
+                self.errors[symbol] = payload
+                continue
+            self.errors.pop(symbol, None)
+            counts[symbol] = self.record(symbol, payload)
+        return counts
+
+    def _run(self) -> None:
+        while not self.__stop.is_set():
+            self.poll()
+            self.__stop.wait(self.interval)
+
+    def start(self) -> None:
+        """
+        Start polling on a background thread.
+
+        :return: None
+        """
+
+        if self.__thread is not None and self.__thread.is_alive():
+            return
+        self.__stop.clear()
+        self.__thread = threading.Thread(target=self._run, name='nobipy-trade-tape', daemon=True)
+        self.__thread.start()
+
+    def stop(self, timeout: float = None) -> None:
+        """
+        Stop the background thread.
+
+        :param timeout: Seconds to wait for the thread (optional)
+        :type timeout: float
+
+        :return: None
+        """
+
+        self.__stop.set()
+        if self.__thread is not None:
+            self.__thread.join(timeout)
+            self.__thread = None
+
+    def __getitem__(self, symbol: str) -> TradeRingBuffer:
+        return self.buffers[symbol.upper()]
+
+    def __str__(self):
+        return f'{self.__class__.__name__} | (symbols={len(self.symbols)})'
+
+    def __repr__(self):
+        return self.__str__()
@@ -0,0 +1,3 @@
+from .exchange import SimulatedExchange
+from .server import StandInBackend, StandInServer
+from .transport import InProcessTransport
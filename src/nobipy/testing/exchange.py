@@ -0,0 +1,674 @@
+import heapq
+import itertools
+import threading
+import time
+import typing as t
+from collections import deque
+
+from .server import _DEFAULT_TOKEN, StandInBackend, _split_symbol
+
+
+__all__ = [
+    'SimulatedExchange',
+]
+
+
+_EPSILON = 1e-12
+
+_EXECUTIONS = {
+    'market': 'Market',
+    'limit': 'Limit',
+    'stop_market': 'StopMarket',
+    'stop_limit': 'StopLimit',
+}
+
+_OPEN = ('Active', 'Inactive')
+
+
+def _fmt(value: float) -> str:
+    if value.is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    # 15 significant digits hide float noise such as 1000999999.9999998808.
+    text = f'{value:.15g}'
+    if 'e' in text:
+        text = f'{value:.12f}'
+    return text.rstrip('0').rstrip('.') if '.' in text else text
+
+
+_stamp: t.List = [None, '']
+
+
+def _timestamp(seconds: float) -> str:
+    # Orders are created in bursts; format each second once.
+    second = int(seconds)
+    if _stamp[0] != second:
+        _stamp[1] = time.strftime('%Y-%m-%dT%H:%M:%S+00:00', time.gmtime(second))
+        _stamp[0] = second
+    return _stamp[1]
+
+
+def _failed(code: str, message: str) -> t.Dict:
+    return {'status': 'failed', 'code': code, 'message': message}
+
+
+class _Order:
+    __slots__ = (
+        'id', 'account', 'side', 'execution', 'src', 'dst', 'price', 'stop_price', 'amount',
+        'matched', 'total', 'fee', 'status', 'blocked', 'created_at',
+    )
+
+    def __init__(
+            self, order_id: int, account: '_Account', side: str, execution: str, src: str, dst: str,
+            amount: float, price: t.Optional[float], stop_price: t.Optional[float],
+    ) -> None:
+        self.id = order_id
+        self.account = account
+        self.side = side
+        self.execution = execution
+        self.src = src
+        self.dst = dst
+        self.price = price
+        self.stop_price = stop_price
+        self.amount = amount
+        self.matched = 0.0
+        self.total = 0.0
+        self.fee = 0.0
+        self.status = 'Active'
+        # Funds still reserved for this order, in dst for buys and src for sells.
+        self.blocked = 0.0
+        self.created_at = time.time()
+
+    @property
+    def remaining(self) -> float:
+        return self.amount - self.matched
+
+    def to_dict(self) -> t.Dict:
+        order = {
+            'id': self.id,
+            'type': self.side,
+            'execution': _EXECUTIONS[self.execution],
+            'srcCurrency': self.src,
+            'dstCurrency': self.dst,
+            'market': f'{self.src.upper()}-{self.dst.upper()}',
+            'price': _fmt(self.price) if self.price is not None else 'market',
+            'amount': _fmt(self.amount),
+            'totalPrice': _fmt(self.total),
+            'matchedAmount': _fmt(self.matched),
+            'unmatchedAmount': _fmt(max(self.remaining, 0.0)),
+            'averagePrice': _fmt(self.total / self.matched) if self.matched else '0',
+            'fee': _fmt(self.fee),
+            'status': self.status,
+            'partial': 0 < self.matched < self.amount,
+            'created_at': _timestamp(self.created_at),
+        }
+        if self.stop_price is not None:
+            order['stopPrice'] = _fmt(self.stop_price)
+        return order
+
+
+class _Account:
+    __slots__ = ('name', 'balances', 'blocked', 'orders', 'open', 'unlimited')
+
+    def __init__(self, name: str, balances: t.Mapping[str, float] = None, unlimited: bool = False) -> None:
+        self.name = name
+        self.balances: t.Dict[str, float] = {currency.lower(): float(v) for currency, v in (balances or {}).items()}
+        self.blocked: t.Dict[str, float] = {}
+        self.orders: t.Dict[int, _Order] = {}
+        self.open: t.Dict[int, _Order] = {}
+        self.unlimited = unlimited
+
+    def available(self, currency: str) -> float:
+        return self.balances.get(currency, 0.0) - self.blocked.get(currency, 0.0)
+
+    def reserve(self, currency: str, amount: float) -> bool:
+        if self.unlimited:
+            return True
+        if amount > self.available(currency) + _EPSILON:
+            return False
+        self.blocked[currency] = self.blocked.get(currency, 0.0) + amount
+        return True
+
+    def release(self, currency: str, amount: float) -> None:
+        if not self.unlimited and amount:
+            self.blocked[currency] = self.blocked.get(currency, 0.0) - amount
+
+    def move(self, currency: str, amount: float) -> None:
+        if not self.unlimited:
+            self.balances[currency] = self.balances.get(currency, 0.0) + amount
+
+
+class _Book:
+    __slots__ = ('bids', 'asks', 'bid_prices', 'ask_prices', 'buy_stops', 'sell_stops', 'trades', 'last')
+
+    def __init__(self, trades: int) -> None:
+        # Price level -> resting orders in time priority. The heaps hold the level prices (bids negated)
+        # and may contain prices of levels that were emptied since; those are dropped when they surface.
+        self.bids: t.Dict[float, t.Deque[_Order]] = {}
+        self.asks: t.Dict[float, t.Deque[_Order]] = {}
+        self.bid_prices: t.List[float] = []
+        self.ask_prices: t.List[float] = []
+        # (trigger key, id, order); buy stops fire on last >= stop, sell stops on last <= stop.
+        self.buy_stops: t.List[t.Tuple[float, int, _Order]] = []
+        self.sell_stops: t.List[t.Tuple[float, int, _Order]] = []
+        self.trades: t.Deque[t.Tuple[int, float, float, str]] = deque(maxlen=trades)
+        self.last: t.Optional[float] = None
+
+    def best(self, side: str) -> t.Optional[float]:
+        levels, prices = (self.bids, self.bid_prices) if side == 'buy' else (self.asks, self.ask_prices)
+        while prices:
+            price = -prices[0] if side == 'buy' else prices[0]
+            if price in levels:
+                return price
+            heapq.heappop(prices)
+        return None
+
+    def depth(self, side: str, count: int) -> t.List[t.List[str]]:
+        levels = self.bids if side == 'buy' else self.asks
+        prices = sorted(levels, reverse=side == 'buy')[:count]
+        return [[_fmt(price), _fmt(sum(order.remaining for order in levels[price]))] for price in prices]
+
+
+class SimulatedExchange(StandInBackend):
+    def __init__(
+            self, balances: t.Mapping[str, float] = None, fee_rate: float = 0.0, token: str = _DEFAULT_TOKEN,
+            history: int = 100_000, levels: int = 50, trades: int = 100, seed: int = None,
+    ) -> None:
+        """
+        Stand-in backend running a price-time priority matching engine per market.
+
+        Orders placed through the order endpoints are matched against each other and against liquidity
+        seeded with ``seed_liquidity``; fills move funds between the accounts' wallets, which the wallet
+        endpoints report. All execution types are supported:
+
+        * ``limit`` orders match up to their price and rest in the book for the remainder.
+        * ``market`` orders are immediate-or-cancel. ``price``, when given, caps (buy) or floors (sell)
+          the prices they take.
+        * ``stop_market`` and ``stop_limit`` orders stay ``Inactive`` until the last trade price reaches
+          the stop price (at or above it for buys, at or below for sells), then execute as ``market`` or
+          ``limit`` orders. A stop that has already been reached when placed triggers at once.
+
+        Orders reserve their funds when placed: buys ``amount * price`` of the destination currency (or
+        the whole available balance for market buys without a price), sells ``amount`` of the source
+        currency. The fee is charged on the received currency. Markets without any order are answered
+        with the synthetic data of ``StandInBackend``. ``cancel_all_orders`` ignores ``execution``.
+
+        Use it through ``StandInServer`` or, without any socket, ``InProcessTransport``; ``place`` and
+        ``cancel`` reach the engine directly.
+
+        :param balances: Starting balances of the default account, e.g. ``{'rls': 1e10, 'btc': 1}`` (optional)
+        :type balances: dict
+
+        :param fee_rate: Fee as a fraction of the received amount (optional)
+        :type fee_rate: float
+
+        :param token: Token of the default account (optional)
+        :type token: str
+
+        :param history: Number of closed orders kept for status and list calls (optional)
+        :type history: int
+
+        :param levels: Order book levels per side in responses (optional)
+        :type levels: int
+
+        :param trades: Trades kept per market and returned by ``trades`` (optional)
+        :type trades: int
+
+        :param seed: Random seed of the synthetic data (optional)
+        :type seed: int
+
+        :return: None
+        """
+
+        super().__init__(levels, trades, token, seed)
+
+        self.fee_rate = fee_rate
+        self.history = history
+
+        self.__lock = threading.RLock()
+        self.__ids = itertools.count(1)
+        self.__books: t.Dict[t.Tuple[str, str], _Book] = {}
+        self.__orders: t.Dict[int, _Order] = {}
+        self.__closed: t.Deque[int] = deque()
+        self.__accounts: t.Dict[str, _Account] = {'liquidity': _Account('liquidity', unlimited=True)}
+        self.__tokens: t.Dict[str, str] = {}
+
+        self.add_account('default', token, balances)
+
+    def add_account(self, name: str, token: str, balances: t.Mapping[str, float] = None) -> None:
+        """
+        Add an account reachable with ``Authorization: Token <token>``.
+
+        :param name: Account name, as used by ``place``, ``cancel`` and ``deposit``
+        :type name: str
+
+        :param token: Token
+        :type token: str
+
+        :param balances: Starting balances (optional)
+        :type balances: dict
+
+        :return: None
+        """
+
+        with self.__lock:
+            self.__accounts[name] = _Account(name, balances)
+            self.__tokens[token] = name
+
+    def deposit(self, account: str, currency: str, amount: float) -> None:
+        """
+        Add funds to an account (negative amounts withdraw).
+
+        :param account: Account name
+        :type account: str
+
+        :param currency: Currency
+        :type currency: str
+
+        :param amount: Amount
+        :type amount: float
+
+        :return: None
+        """
+
+        with self.__lock:
+            self.__accounts[account].move(currency.lower(), float(amount))
+
+    def _account(self, authorization: t.Optional[str]) -> t.Optional[str]:
+        if not authorization or not authorization.startswith('Token '):
+            return None
+        return self.__tokens.get(authorization[6:])
+
+    def seed_liquidity(
+            self, src_currency: str, dst_currency: str, mid: float, levels: int = 20, step: float = 0.001,
+            amount: float = 1.0,
+    ) -> None:
+        """
+        Rest ``levels`` sell orders above and buy orders below ``mid``, from an account with unlimited
+        funds.
+
+        :param src_currency: Source currency
+        :type src_currency: str
+
+        :param dst_currency: Destination currency
+        :type dst_currency: str
+
+        :param mid: Mid price
+        :type mid: float
+
+        :param levels: Levels per side (optional)
+        :type levels: int
+
+        :param step: Relative distance between levels (optional)
+        :type step: float
+
+        :param amount: Amount per level (optional)
+        :type amount: float
+
+        :return: None
+        """
+
+        for i in range(1, levels + 1):
+            self.place('liquidity', 'sell', 'limit', src_currency, dst_currency, amount, mid * (1 + i * step))
+            self.place('liquidity', 'buy', 'limit', src_currency, dst_currency, amount, mid * (1 - i * step))
+
+    def place(
+            self, account: str, side: str, execution: str, src_currency: str, dst_currency: str,
+            amount: t.Union[str, float], price: t.Union[str, float] = None, stop_price: t.Union[str, float] = None,
+    ) -> t.Dict:
+        """
+        Place an order directly, without building a request.
+
+        :param account: Account name
+        :type account: str
+
+        :param side: Side ('buy', 'sell')
+        :type side: str
+
+        :param execution: Execution type ('market', 'limit', 'stop_market', 'stop_limit')
+        :type execution: str
+
+        :param src_currency: Source currency
+        :type src_currency: str
+
+        :param dst_currency: Destination currency
+        :type dst_currency: str
+
+        :param amount: Amount
+        :type amount: str | float
+
+        :param price: Price, optional for market orders
+        :type price: str | float
+
+        :param stop_price: Stop price, required for stop orders
+        :type stop_price: str | float
+
+        :return: Payload of ``/market/orders/add``
+        :rtype: dict
+        """
+
+        side = str(side).lower()
+        execution = str(execution).lower()
+        if side not in ('buy', 'sell'):
+            return _failed('InvalidOrderType', f'Invalid order type: {side}')
+        if execution not in _EXECUTIONS:
+            return _failed('InvalidExecutionType', f'Invalid execution type: {execution}')
+
+        try:
+            amount = float(amount)
+            price = float(price) if price not in (None, '', 0, '0') else None
+            stop_price = float(stop_price) if stop_price not in (None, '') else None
+        except (TypeError, ValueError):
+            return _failed('InvalidOrderPrice', 'Amount and prices must be numbers')
+
+        if amount <= 0:
+            return _failed('SmallOrder', 'Amount must be positive')
+        if (price is None and execution != 'market') or (price is not None and price <= 0):
+            return _failed('InvalidOrderPrice', 'Price must be positive')
+        if execution.startswith('stop'):
+            if stop_price is None or stop_price <= 0:
+                return _failed('InvalidOrderPrice', 'Stop price must be positive')
+        else:
+            stop_price = None
+
+        src, dst = str(src_currency).lower(), str(dst_currency).lower()
+        with self.__lock:
+            owner = self.__accounts[account]
+            order = _Order(next(self.__ids), owner, side, execution, src, dst, amount, price, stop_price)
+
+            if side == 'sell':
+                reserve, currency = amount, src
+            elif price is not None:
+                reserve, currency = amount * price, dst
+            elif owner.unlimited:
+                reserve, currency = float('inf'), dst
+            else:
+                reserve, currency = max(owner.available(dst), 0.0), dst
+            if reserve <= 0 or not owner.reserve(currency, reserve):
+                return _failed('OverValueOrder', f'Insufficient {currency} balance')
+            order.blocked = reserve
+
+            self.__orders[order.id] = order
+            owner.orders[order.id] = order
+            owner.open[order.id] = order
+
+            book = self.__books.get((src, dst))
+            if book is None:
+                book = self.__books[(src, dst)] = _Book(self.trades)
+
+            if stop_price is not None and not self._reached(book, order):
+                order.status = 'Inactive'
+                if side == 'buy':
+                    heapq.heappush(book.buy_stops, (stop_price, order.id, order))
+                else:
+                    heapq.heappush(book.sell_stops, (-stop_price, order.id, order))
+            else:
+                self._execute(book, order)
+                self._trigger(book)
+
+            return {'status': 'ok', 'order': order.to_dict()}
+
+    def cancel(self, account: str, order_id: int) -> t.Dict:
+        """
+        Cancel an open order directly.
+
+        :param account: Account name
+        :type account: str
+
+        :param order_id: Order ID
+        :type order_id: int
+
+        :return: Payload of ``/market/orders/update-status``
+        :rtype: dict
+        """
+
+        with self.__lock:
+            order = self.__accounts[account].orders.get(int(order_id))
+            if order is None:
+                return _failed('NotFound', 'Order not found')
+            if order.status not in _OPEN:
+                return _failed('InvalidOrderStatus', f'Order is {order.status}')
+            self._cancel(order)
+            return {'status': 'ok', 'updatedStatus': order.status}
+
+    @staticmethod
+    def _reached(book: _Book, order: _Order) -> bool:
+        if book.last is None:
+            return False
+        return book.last >= order.stop_price if order.side == 'buy' else book.last <= order.stop_price
+
+    def _execute(self, book: _Book, order: _Order) -> None:
+        # Match an incoming (or just triggered) order, then rest or close it.
+        order.status = 'Active'
+        self._match(book, order)
+
+        if order.remaining <= _EPSILON:
+            self._close(order, 'Done')
+        elif order.execution in ('market', 'stop_market'):
+            self._close(order, 'Done' if order.matched else 'Canceled')
+        else:
+            if order.side == 'buy':
+                # Fills below the limit price leave more reserved than the rest of the order needs.
+                excess = order.blocked - order.remaining * order.price
+                if excess > 0:
+                    order.account.release(order.dst, excess)
+                    order.blocked -= excess
+                levels, prices, key = book.bids, book.bid_prices, -order.price
+            else:
+                levels, prices, key = book.asks, book.ask_prices, order.price
+            level = levels.get(order.price)
+            if level is None:
+                level = levels[order.price] = deque()
+                heapq.heappush(prices, key)
+            level.append(order)
+
+    def _match(self, book: _Book, taker: _Order) -> None:
+        buy = taker.side == 'buy'
+        levels, prices = (book.asks, book.ask_prices) if buy else (book.bids, book.bid_prices)
+        limit = taker.price
+
+        while taker.remaining > _EPSILON and prices:
+            price = prices[0] if buy else -prices[0]
+            level = levels.get(price)
+            if level is None:
+                heapq.heappop(prices)
+                continue
+            if limit is not None and (price > limit if buy else price < limit):
+                break
+
+            while level and taker.remaining > _EPSILON:
+                maker = level[0]
+                volume = min(taker.remaining, maker.remaining)
+                if buy and limit is None:
+                    # A market buy without a price is bounded by what it reserved.
+                    volume = min(volume, taker.blocked / price)
+                    if volume <= _EPSILON:
+                        return
+                self._fill(book, taker, maker, price, volume)
+                if maker.remaining <= _EPSILON:
+                    level.popleft()
+                    self._close(maker, 'Done')
+
+            if not level:
+                del levels[price]
+                heapq.heappop(prices)
+            if buy and limit is None and taker.blocked <= _EPSILON:
+                break
+
+    def _fill(self, book: _Book, taker: _Order, maker: _Order, price: float, volume: float) -> None:
+        value = price * volume
+        buyer, seller = (taker, maker) if taker.side == 'buy' else (maker, taker)
+
+        buyer.blocked -= value
+        buyer.account.release(buyer.dst, value)
+        buyer.account.move(buyer.dst, -value)
+        buyer.account.move(buyer.src, volume * (1 - self.fee_rate))
+        buyer.fee += volume * self.fee_rate
+
+        seller.blocked -= volume
+        seller.account.release(seller.src, volume)
+        seller.account.move(seller.src, -volume)
+        seller.account.move(seller.dst, value * (1 - self.fee_rate))
+        seller.fee += value * self.fee_rate
+
+        for order in (taker, maker):
+            order.matched += volume
+            order.total += value
+
+        book.last = price
+        book.trades.append((int(time.time() * 1000), price, volume, taker.side))
+
+    def _trigger(self, book: _Book) -> None:
+        # Fire stops reached by the last price; their trades may in turn reach further stops.
+        while book.last is not None:
+            if book.buy_stops and book.buy_stops[0][0] <= book.last:
+                order = heapq.heappop(book.buy_stops)[2]
+            elif book.sell_stops and -book.sell_stops[0][0] >= book.last:
+                order = heapq.heappop(book.sell_stops)[2]
+            else:
+                return
+            if order.status == 'Inactive':
+                self._execute(book, order)
+
+    def _cancel(self, order: _Order) -> None:
+        if order.status == 'Active':
+            book = self.__books[(order.src, order.dst)]
+            levels = book.bids if order.side == 'buy' else book.asks
+            level = levels.get(order.price)
+            if level is not None and order in level:
+                level.remove(order)
+                if not level:
+                    del levels[order.price]
+        # Untriggered stops stay in their heap and are skipped when they surface.
+        self._close(order, 'Canceled')
+
+    def _close(self, order: _Order, status: str) -> None:
+        order.status = status
+        if order.blocked > 0:
+            order.account.release(order.dst if order.side == 'buy' else order.src, order.blocked)
+        order.blocked = 0.0
+        order.account.open.pop(order.id, None)
+
+        self.__closed.append(order.id)
+        while len(self.__closed) > self.history:
+            dropped = self.__orders.pop(self.__closed.popleft(), None)
+            if dropped is not None:
+                dropped.account.orders.pop(dropped.id, None)
+
+    def _market_stats(self, params: t.Dict, body: t.Dict) -> t.Dict:
+        payload = super()._market_stats(params, body)
+        with self.__lock:
+            for key, stats in payload['stats'].items():
+                book = self.__books.get(tuple(key.split('-', 1)))
+                if book is None:
+                    continue
+                bid, ask = book.best('buy'), book.best('sell')
+                stats['bestBuy'] = _fmt(bid) if bid is not None else '0'
+                stats['bestSell'] = _fmt(ask) if ask is not None else '0'
+                stats['latest'] = _fmt(book.last) if book.last is not None else '0'
+        return payload
+
+    def _orderbook(self, symbol: str) -> t.Dict:
+        with self.__lock:
+            book = self.__books.get(_split_symbol(symbol))
+            if book is None:
+                return super()._orderbook(symbol)
+            return {
+                'status': 'ok',
+                'lastUpdate': int(time.time() * 1000),
+                'asks': book.depth('sell', self.levels),
+                'bids': book.depth('buy', self.levels),
+            }
+
+    def _trades(self, symbol: str) -> t.Dict:
+        with self.__lock:
+            book = self.__books.get(_split_symbol(symbol))
+            if book is None:
+                return super()._trades(symbol)
+            trades = [
+                {'time': time_ms, 'price': _fmt(price), 'volume': _fmt(volume), 'type': side}
+                for time_ms, price, volume, side in reversed(book.trades)
+            ]
+        return {'status': 'ok', 'trades': trades}
+
+    def _create_order(self, params: t.Dict, body: t.Dict, account: str) -> t.Dict:
+        return self.place(
+            account, body.get('type'), body.get('execution', 'limit'), body.get('srcCurrency'),
+            body.get('dstCurrency'), body.get('amount'), body.get('price'), body.get('stopPrice'),
+        )
+
+    def _order_status(self, params: t.Dict, body: t.Dict, account: str) -> t.Dict:
+        with self.__lock:
+            order = self.__accounts[account].orders.get(int(body.get('id') or 0))
+            if order is None:
+                return _failed('NotFound', 'Order not found')
+            return {'status': 'ok', 'order': order.to_dict()}
+
+    def _open_orders(self, params: t.Dict, body: t.Dict, account: str) -> t.Dict:
+        status = body.get('status', 'open')
+        src, dst = body.get('srcCurrency'), body.get('dstCurrency')
+        with self.__lock:
+            owner = self.__accounts[account]
+            orders = owner.open if status == 'open' else owner.orders
+            orders = [
+                order.to_dict() for order in reversed(list(orders.values()))
+                if (src is None or order.src == src) and (dst is None or order.dst == dst)
+                and (status not in ('done', 'close') or order.status not in _OPEN)
+            ]
+        chunk, has_next = self._page(orders, body)
+        return {'status': 'ok', 'orders': chunk, 'hasNext': has_next}
+
+    def _update_status(self, params: t.Dict, body: t.Dict, account: str) -> t.Dict:
+        status = body.get('status', 'cancel')
+        if status != 'cancel':
+            return _failed('InvalidOrderStatus', f'Unsupported status: {status}')
+        return self.cancel(account, body.get('order', body.get('id')) or 0)
+
+    def _cancel_all(self, params: t.Dict, body: t.Dict, account: str) -> t.Dict:
+        src, dst = body.get('srcCurrency'), body.get('dstCurrency')
+        since = time.time() - float(body['hours']) * 3600 if body.get('hours') else None
+        with self.__lock:
+            for order in list(self.__accounts[account].open.values()):
+                if (src is None or order.src == src) and (dst is None or order.dst == dst) \
+                        and (since is None or order.created_at >= since):
+                    self._cancel(order)
+        return {'status': 'ok'}
+
+    def _account_wallet(self, owner: _Account, index: int, currency: str) -> t.Dict:
+        balance = owner.balances.get(currency, 0.0)
+        blocked = owner.blocked.get(currency, 0.0)
+        return {
+            'id': index + 1, 'currency': currency, 'balance': _fmt(balance), 'activeBalance': _fmt(balance - blocked),
+            'blockedBalance': _fmt(blocked), 'rialBalance': 0, 'depositAddress': None,
+        }
+
+    def _wallets(self, params: t.Dict, body: t.Dict, account: str) -> t.Dict:
+        with self.__lock:
+            owner = self.__accounts[account]
+            currencies = sorted(set(owner.balances) | {'rls'})
+            return {
+                'status': 'ok',
+                'wallets': [self._account_wallet(owner, i, currency) for i, currency in enumerate(currencies)],
+            }
+
+    def _wallets_v2(self, params: t.Dict, body: t.Dict, account: str) -> t.Dict:
+        currencies = [currency.strip().lower() for currency in str(body.get('currencies', 'rls')).split(',')]
+        with self.__lock:
+            owner = self.__accounts[account]
+            wallets = {}
+            for i, currency in enumerate(currencies):
+                wallet = self._account_wallet(owner, i, currency)
+                wallets[currency.upper()] = {
+                    'id': wallet['id'], 'balance': wallet['balance'], 'blocked': wallet['blockedBalance'],
+                }
+        return {'status': 'ok', 'wallets': wallets}
+
+    def _balance(self, params: t.Dict, body: t.Dict, account: str) -> t.Dict:
+        with self.__lock:
+            balance = self.__accounts[account].balances.get(str(body.get('currency', 'rls')).lower(), 0.0)
+        return {'status': 'ok', 'balance': _fmt(balance)}
+
+    def __str__(self):
+        return f'{self.__class__.__name__} | (markets={len(self.__books)}, orders={len(self.__orders)})'
+
+    def __repr__(self):
+        return self.__str__()
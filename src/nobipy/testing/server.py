@@ -0,0 +1,606 @@
+"""
+Local stand-in for the Nobitex HTTP API, for benchmarks and network-free runs.
+
+    python -m nobipy.testing --port 8000 --latency 0.02 --error-rate 0.01
+"""
+
+import argparse
+import itertools
+import json
+import random
+import threading
+import time
+import typing as t
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from urllib.parse import parse_qs, urlsplit
+
+
+__all__ = [
+    'StandInBackend',
+    'StandInServer',
+]
+
+
+_DEFAULT_TOKEN = 'stand-in-token'
+
+_CURRENCIES = ('btc', 'eth', 'ltc', 'xrp', 'bch', 'bnb', 'eos', 'xlm', 'etc', 'trx', 'doge', 'usdt')
+
+
+def _split_symbol(symbol: str) -> t.Tuple[str, str]:
+    symbol = symbol.lower()
+    for quote, dst in (('irt', 'rls'), ('rls', 'rls'), ('usdt', 'usdt')):
+        if symbol.endswith(quote) and len(symbol) > len(quote):
+            return symbol[:-len(quote)], dst
+    return symbol, 'rls'
+
+
+def _resolution_seconds(resolution: str) -> int:
+    resolution = str(resolution).upper()
+    if resolution.endswith('D'):
+        return int(resolution[:-1] or 1) * 86400
+    return int(resolution) * 60
+
+
+class StandInBackend:
+    def __init__(self, levels: int = 50, trades: int = 100, token: str = _DEFAULT_TOKEN, seed: int = None) -> None:
+        """
+        Request handler serving realistic, randomly generated Nobitex payloads.
+
+        Public market data is generated per symbol around a stable price. Orders placed through
+        ``/market/orders/add`` are kept so that status, list and update calls see them, but they are
+        never matched. Authenticated paths require ``Authorization: Token <token>``.
+
+        :param levels: Order book levels per side (optional)
+        :type levels: int
+
+        :param trades: Trades per ``trades`` response (optional)
+        :type trades: int
+
+        :param token: Accepted token (optional)
+        :type token: str
+
+        :param seed: Random seed (optional)
+        :type seed: int
+
+        :return: None
+        """
+
+        self.levels = levels
+        self.trades = trades
+        self.token = token
+
+        self.__random = random.Random(seed)
+        self.__lock = threading.Lock()
+        self.__ids = itertools.count(1)
+        self.__orders: t.Dict[int, t.Dict] = {}
+
+        self.__public: t.Dict[str, t.Callable] = {
+            '/market/stats': self._market_stats,
+            '/market/udf/history': self._ohlc,
+            '/market/global-stats': self._global_stats,
+        }
+        self.__private: t.Dict[str, t.Callable] = {
+            '/market/orders/add': self._create_order,
+            '/market/orders/status': self._order_status,
+            '/market/orders/list': self._open_orders,
+            '/market/orders/update-status': self._update_status,
+            '/market/orders/cancel-all': self._cancel_all,
+            '/users/profile': self._profile,
+            '/users/limitations': self._limitations,
+            '/users/wallets/list': self._wallets,
+            '/v2/wallets': self._wallets_v2,
+            '/users/wallets/balance': self._balance,
+            '/users/wallets/transactions/list': self._transactions,
+            '/users/wallets/deposits/list': self._deposits,
+            '/users/wallets/generate-address': self._generate_address,
+            '/users/cards-add': self._ok,
+        }
+
+    def _account(self, authorization: t.Optional[str]) -> t.Optional[str]:
+        # Account name of an ``Authorization`` header, or None when it is not accepted.
+        return 'default' if authorization == f'Token {self.token}' else None
+
+    @staticmethod
+    def _price(symbol: str) -> float:
+        src, dst = _split_symbol(symbol)
+        base = random.Random(src).uniform(1, 5) * 10 ** random.Random(src + 'e').randint(2, 6)
+        return round(base * (1 if dst == 'usdt' else 300_000))
+
+    def handle(
+            self, method: str, path: str, params: t.Dict[str, str], body: t.Dict, headers: t.Mapping[str, str],
+    ) -> t.Tuple[int, t.Dict]:
+        """
+        Answer one request.
+
+        :param method: HTTP method
+        :type method: str
+
+        :param path: URL path
+        :type path: str
+
+        :param params: Query parameters
+        :type params: dict
+
+        :param body: Decoded JSON body (empty when there is none)
+        :type body: dict
+
+        :param headers: Request headers
+        :type headers: mapping
+
+        :return: Status code and payload
+        :rtype: tuple
+        """
+
+        path = path.rstrip('/') or '/'
+
+        if path.startswith('/v2/orderbook/'):
+            return 200, self._orderbook(path.rsplit('/', 1)[-1])
+        if path.startswith('/v2/trades/'):
+            return 200, self._trades(path.rsplit('/', 1)[-1])
+        if path == '/auth/login':
+            return 200, {'status': 'success', 'key': self.token, 'result': {'token': self.token}}
+        if path in self.__public:
+            return 200, self.__public[path](params, body)
+
+        if path in self.__private:
+            account = self._account(headers.get('Authorization'))
+            if account is None:
+                return 401, {'detail': 'Invalid token.'}
+            return 200, self.__private[path](params, body, account)
+
+        return 404, {'status': 'failed', 'message': f'Not found: {path}'}
+
+    def _orderbook(self, symbol: str) -> t.Dict:
+        rng = self.__random
+        mid = self._price(symbol) * rng.uniform(0.999, 1.001)
+        tick = max(mid * 0.0002, 1)
+        return {
+            'status': 'ok',
+            'lastUpdate': int(time.time() * 1000),
+            'asks': [[f'{mid + (i + 1) * tick:.0f}', f'{rng.uniform(0.001, 2):.6f}'] for i in range(self.levels)],
+            'bids': [[f'{mid - (i + 1) * tick:.0f}', f'{rng.uniform(0.001, 2):.6f}'] for i in range(self.levels)],
+        }
+
+    def _trades(self, symbol: str) -> t.Dict:
+        rng = self.__random
+        price = self._price(symbol)
+        now = int(time.time() * 1000)
+        return {
+            'status': 'ok',
+            'trades': [
+                {
+                    'time': now - i * 750,
+                    'price': f'{price * rng.uniform(0.998, 1.002):.0f}',
+                    'volume': f'{rng.uniform(0.0001, 1):.6f}',
+                    'type': rng.choice(('buy', 'sell')),
+                }
+                for i in range(self.trades)
+            ],
+        }
+
+    def _market_stats(self, params: t.Dict, body: t.Dict) -> t.Dict:
+        rng = self.__random
+        src_list = str(body.get('srcCurrency') or params.get('srcCurrency') or 'btc').split(',')
+        dst_list = str(body.get('dstCurrency') or params.get('dstCurrency') or 'rls').split(',')
+
+        stats = {}
+        for src in src_list:
+            for dst in dst_list:
+                latest = self._price(src + ('irt' if dst == 'rls' else dst))
+                low, high = latest * 0.97, latest * 1.03
+                stats[f'{src}-{dst}'] = {
+                    'isClosed': False,
+                    'bestSell': f'{latest * 1.0005:.0f}',
+                    'bestBuy': f'{latest * 0.9995:.0f}',
+                    'volumeSrc': f'{rng.uniform(10, 1000):.4f}',
+                    'volumeDst': f'{rng.uniform(10, 1000) * latest:.0f}',
+                    'latest': f'{latest * rng.uniform(0.999, 1.001):.0f}',
+                    'mark': f'{latest:.0f}',
+                    'dayLow': f'{low:.0f}',
+                    'dayHigh': f'{high:.0f}',
+                    'dayOpen': f'{latest * 0.99:.0f}',
+                    'dayClose': f'{latest:.0f}',
+                    'dayChange': f'{rng.uniform(-5, 5):.2f}',
+                }
+        return {'status': 'ok', 'stats': stats}
+
+    def _ohlc(self, params: t.Dict, body: t.Dict) -> t.Dict:
+        step = _resolution_seconds(params.get('resolution', '60'))
+        start = int(params.get('from', 0))
+        end = int(params.get('to', start))
+        times = list(range(start - start % step, end + 1, step))[:500]
+        if not times:
+            return {'s': 'no_data'}
+
+        # Deterministic per symbol and timestamp, so overlapping requests agree.
+        price = self._price(params.get('symbol', 'BTCIRT'))
+        columns = {'t': times, 'o': [], 'h': [], 'l': [], 'c': [], 'v': []}
+        for timestamp in times:
+            rng = random.Random(timestamp)
+            o = price * rng.uniform(0.98, 1.02)
+            c = price * rng.uniform(0.98, 1.02)
+            columns['o'].append(round(o))
+            columns['c'].append(round(c))
+            columns['h'].append(round(max(o, c) * rng.uniform(1, 1.01)))
+            columns['l'].append(round(min(o, c) * rng.uniform(0.99, 1)))
+            columns['v'].append(round(rng.uniform(0, 50), 6))
+        return dict(columns, s='ok')
+
+    def _global_stats(self, params: t.Dict, body: t.Dict) -> t.Dict:
+        rng = self.__random
+        return {
+            'status': 'ok',
+            'markets': {
+                exchange: {
+                    currency: round(self._price(currency + 'usdt') * rng.uniform(0.995, 1.005), 4)
+                    for currency in _CURRENCIES
+                }
+                for exchange in ('binance', 'kraken')
+            },
+        }
+
+    def _create_order(self, params: t.Dict, body: t.Dict, account: str) -> t.Dict:
+        with self.__lock:
+            order_id = next(self.__ids)
+            amount = str(body.get('amount', '0'))
+            order = {
+                'id': order_id,
+                'type': body.get('type'),
+                'execution': body.get('execution', 'limit').title().replace('_', ''),
+                'srcCurrency': body.get('srcCurrency'),
+                'dstCurrency': body.get('dstCurrency'),
+                'market': f'{str(body.get("srcCurrency")).upper()}-{str(body.get("dstCurrency")).upper()}',
+                'price': str(body.get('price', '0')),
+                'amount': amount,
+                'totalPrice': '0',
+                'matchedAmount': '0',
+                'unmatchedAmount': amount,
+                'averagePrice': '0',
+                'fee': '0',
+                'status': 'Active',
+                'partial': False,
+                'created_at': time.strftime('%Y-%m-%dT%H:%M:%S+00:00', time.gmtime()),
+            }
+            self.__orders[order_id] = order
+        return {'status': 'ok', 'order': dict(order)}
+
+    def _order_status(self, params: t.Dict, body: t.Dict, account: str) -> t.Dict:
+        with self.__lock:
+            order = self.__orders.get(body.get('id'))
+        if order is None:
+            return {'status': 'failed', 'code': 'NotFound', 'message': 'Order not found'}
+        return {'status': 'ok', 'order': dict(order)}
+
+    @staticmethod
+    def _page(items: t.List, body: t.Dict) -> t.Tuple[t.List, bool]:
+        page = int(body.get('page') or 1)
+        size = int(body.get('pageSize') or 50)
+        chunk = items[(page - 1) * size:page * size]
+        return chunk, page * size < len(items)
+
+    def _open_orders(self, params: t.Dict, body: t.Dict, account: str) -> t.Dict:
+        with self.__lock:
+            orders = [dict(order) for order in reversed(list(self.__orders.values()))]
+        status = body.get('status')
+        if status == 'open':
+            orders = [order for order in orders if order['status'] == 'Active']
+        elif status in ('done', 'close'):
+            orders = [order for order in orders if order['status'] != 'Active']
+        chunk, has_next = self._page(orders, body)
+        return {'status': 'ok', 'orders': chunk, 'hasNext': has_next}
+
+    def _update_status(self, params: t.Dict, body: t.Dict, account: str) -> t.Dict:
+        status = body.get('status', 'cancel')
+        with self.__lock:
+            order = self.__orders.get(body.get('order', body.get('id')))
+            if order is None:
+                return {'status': 'failed', 'code': 'NotFound', 'message': 'Order not found'}
+            order['status'] = 'Canceled' if status == 'cancel' else status.title()
+        return {'status': 'ok', 'updatedStatus': order['status']}
+
+    def _cancel_all(self, params: t.Dict, body: t.Dict, account: str) -> t.Dict:
+        with self.__lock:
+            for order in self.__orders.values():
+                if order['status'] == 'Active':
+                    order['status'] = 'Canceled'
+        return {'status': 'ok'}
+
+    def _profile(self, params: t.Dict, body: t.Dict, account: str) -> t.Dict:
+        return {
+            'status': 'ok',
+            'profile': {
+                'firstName': 'Stand', 'lastName': 'In', 'email': 'stand-in@example.com', 'username': 'stand-in',
+                'level': 2, 'bankCards': [], 'bankAccounts': [],
+                'verifications': {'email': True, 'phone': True, 'mobile': True, 'identity': True},
+            },
+            'tradeStats': {'monthTradesTotal': '0', 'monthTradesCount': 0},
+        }
+
+    def _limitations(self, params: t.Dict, body: t.Dict, account: str) -> t.Dict:
+        return {
+            'status': 'ok',
+            'limitations': {
+                'userLevel': 'level2',
+                'features': {'crypto_trade': False, 'rial_trade': False},
+                'limits': {'withdrawRialDaily': {'used': '0', 'limit': '1000000000'}},
+            },
+        }
+
+    def _wallet(self, index: int, currency: str) -> t.Dict:
+        balance = f'{random.Random(currency).uniform(0, 10):.8f}'
+        return {
+            'id': index + 1, 'currency': currency, 'balance': balance, 'activeBalance': balance,
+            'blockedBalance': '0', 'rialBalance': 0, 'depositAddress': None,
+        }
+
+    def _wallets(self, params: t.Dict, body: t.Dict, account: str) -> t.Dict:
+        currencies = _CURRENCIES + ('rls',)
+        return {'status': 'ok', 'wallets': [self._wallet(i, currency) for i, currency in enumerate(currencies)]}
+
+    def _wallets_v2(self, params: t.Dict, body: t.Dict, account: str) -> t.Dict:
+        currencies = [currency.strip().lower() for currency in str(body.get('currencies', 'rls')).split(',')]
+        wallets = {}
+        for i, currency in enumerate(currencies):
+            wallet = self._wallet(i, currency)
+            wallets[currency.upper()] = {'id': wallet['id'], 'balance': wallet['balance'], 'blocked': '0'}
+        return {'status': 'ok', 'wallets': wallets}
+
+    def _balance(self, params: t.Dict, body: t.Dict, account: str) -> t.Dict:
+        return {'status': 'ok', 'balance': self._wallet(0, str(body.get('currency', 'rls')).lower())['balance']}
+
+    def _history(self, body: t.Dict, key: str, count: int) -> t.Dict:
+        now = time.time()
+        items = [
+            {
+                'id': count - i,
+                'currency': 'rls',
+                'amount': f'{(i % 7 + 1) * 1_000_000}',
+                'description': key,
+                'created_at': time.strftime('%Y-%m-%dT%H:%M:%S+00:00', time.gmtime(now - i * 3600)),
+            }
+            for i in range(count)
+        ]
+        chunk, has_next = self._page(items, body)
+        return {'status': 'ok', key: chunk, 'hasNext': has_next}
+
+    def _transactions(self, params: t.Dict, body: t.Dict, account: str) -> t.Dict:
+        return self._history(body, 'transactions', 240)
+
+    def _deposits(self, params: t.Dict, body: t.Dict, account: str) -> t.Dict:
+        return self._history(body, 'deposits', 60)
+
+    def _generate_address(self, params: t.Dict, body: t.Dict, account: str) -> t.Dict:
+        return {'status': 'ok', 'address': '0x' + ''.join(self.__random.choices('0123456789abcdef', k=40))}
+
+    @staticmethod
+    def _ok(params: t.Dict, body: t.Dict, account: str) -> t.Dict:
+        return {'status': 'ok'}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    server: '_HTTPServer'
+
+    def _serve(self) -> None:
+        stand_in = self.server.stand_in
+        url = urlsplit(self.path)
+
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length) if length else b''
+        try:
+            body = json.loads(raw) if raw else {}
+        except ValueError:
+            body = {}
+        if not isinstance(body, dict):
+            body = {}
+
+        stand_in._delay()
+        if stand_in._inject_error(url.path):
+            status, payload = stand_in.error_status, {'status': 'failed', 'message': 'Injected error'}
+        else:
+            params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            status, payload = stand_in.backend.handle(self.command, url.path, params, body, self.headers)
+
+        content = json.dumps(payload, separators=(',', ':')).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        if self.close_connection:
+            self.send_header('Connection', 'close')
+        self.end_headers()
+        self.wfile.write(content)
+
+    do_GET = _serve
+    do_POST = _serve
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+class _HTTPServer(ThreadingMixIn, HTTPServer):
+    # What ``http.server.ThreadingHTTPServer`` is; that class needs Python 3.7+.
+    daemon_threads = True
+    request_queue_size = 1024
+    stand_in: 'StandInServer'
+
+
+class StandInServer:
+    def __init__(
+            self, backend: StandInBackend = None, host: str = '127.0.0.1', port: int = 0,
+            latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0, error_status: int = 500,
+            error_paths: t.Iterable[str] = None, seed: int = None,
+    ) -> None:
+        """
+        Threaded local HTTP server answering Nobitex API paths through a backend.
+
+        Pass ``server.url`` as ``base_url`` to ``Nobitex``/``AsyncNobitex``. Every response is delayed by
+        ``latency`` plus up to ``jitter`` seconds, and a share ``error_rate`` of requests (optionally only
+        paths starting with one of ``error_paths``) fails with ``error_status``.
+
+        :param backend: Request handler (optional)
+        :type backend: StandInBackend
+
+        :param host: Bind address (optional)
+        :type host: str
+
+        :param port: Port, 0 for any free port (optional)
+        :type port: int
+
+        :param latency: Fixed delay per response in seconds (optional)
+        :type latency: float
+
+        :param jitter: Maximum extra random delay in seconds (optional)
+        :type jitter: float
+
+        :param error_rate: Share of requests answered with ``error_status`` (optional)
+        :type error_rate: float
+
+        :param error_status: Status code of injected errors (optional)
+        :type error_status: int
+
+        :param error_paths: Path prefixes subject to error injection, all paths by default (optional)
+        :type error_paths: iterable
+
+        :param seed: Random seed of the injection (optional)
+        :type seed: int
+
+        :return: None
+        """
+
+        self.backend = backend if backend is not None else StandInBackend(seed=seed)
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.error_paths = tuple(error_paths) if error_paths else None
+
+        self.__random = random.Random(seed)
+        self.__lock = threading.Lock()
+        self.__server: t.Optional[_HTTPServer] = None
+        self.__thread: t.Optional[threading.Thread] = None
+
+    def _delay(self) -> None:
+        delay = self.latency
+        if self.jitter:
+            with self.__lock:
+                delay += self.__random.uniform(0, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+    def _inject_error(self, path: str) -> bool:
+        if not self.error_rate:
+            return False
+        if self.error_paths is not None and not path.startswith(self.error_paths):
+            return False
+        with self.__lock:
+            return self.__random.random() < self.error_rate
+
+    @property
+    def url(self) -> str:
+        """
+        Base URL of the running server.
+
+        :return: URL
+        :rtype: str
+        """
+
+        return f'http://{self.host}:{self.port}'
+
+    def _bind(self) -> None:
+        self.__server = _HTTPServer((self.host, self.port), _Handler)
+        self.__server.stand_in = self
+        self.port = self.__server.server_address[1]
+
+    def start(self) -> 'StandInServer':
+        """
+        Start serving on a background thread.
+
+        :return: Server
+        :rtype: StandInServer
+        """
+
+        if self.__server is not None:
+            return self
+        self._bind()
+        self.__thread = threading.Thread(target=self.__server.serve_forever, name='nobipy-stand-in', daemon=True)
+        self.__thread.start()
+        return self
+
+    def serve_forever(self, ready: t.Callable[[str], None] = None) -> None:
+        """
+        Serve on the calling thread until interrupted.
+
+        :param ready: Called with ``url`` once the socket is bound (optional)
+        :type ready: callable
+
+        :return: None
+        """
+
+        self._bind()
+        if ready is not None:
+            ready(self.url)
+        try:
+            self.__server.serve_forever()
+        finally:
+            self.__server.server_close()
+            self.__server = None
+
+    def stop(self) -> None:
+        """
+        Stop the server.
+
+        :return: None
+        """
+
+        if self.__server is None:
+            return
+        self.__server.shutdown()
+        self.__server.server_close()
+        self.__thread.join()
+        self.__server = None
+        self.__thread = None
+
+    def __enter__(self) -> 'StandInServer':
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+    def __str__(self):
+        return f'{self.__class__.__name__} | (url={self.url}, latency={self.latency}, error_rate={self.error_rate})'
+
+    def __repr__(self):
+        return self.__str__()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Local stand-in for the Nobitex API')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--latency', type=float, default=0.0, help='fixed delay per response in seconds')
+    parser.add_argument('--jitter', type=float, default=0.0, help='maximum extra random delay in seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='share of requests failing')
+    parser.add_argument('--error-status', type=int, default=500)
+    parser.add_argument('--levels', type=int, default=50, help='order book levels per side')
+    parser.add_argument('--trades', type=int, default=100, help='trades per response')
+    parser.add_argument('--token', default=_DEFAULT_TOKEN)
+    parser.add_argument('--seed', type=int)
+    args = parser.parse_args()
+
+    server = StandInServer(
+        StandInBackend(args.levels, args.trades, args.token, args.seed), args.host, args.port,
+        args.latency, args.jitter, args.error_rate, args.error_status, seed=args.seed,
+    )
+    try:
+        # The URL goes to stdout first, for callers starting the server as a subprocess with --port 0.
+        server.serve_forever(ready=lambda url: print(url, flush=True))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
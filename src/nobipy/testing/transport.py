@@ -0,0 +1,81 @@
+import json
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+
+
+__all__ = [
+    'InProcessTransport',
+]
+
+
+class InProcessTransport:
+    def __init__(self, backend) -> None:
+        """
+        Transport answering requests with a backend in the same process, without any socket.
+
+        Any object with the ``handle`` method of ``StandInBackend`` works as backend, e.g.
+        ``SimulatedExchange``. Pass it as ``transport`` to ``Nobitex``; the host part of the URL is
+        ignored.
+
+        :param backend: Request handler
+        :type backend: StandInBackend
+
+        :return: None
+        """
+
+        self.backend = backend
+
+    def send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Answer a request with the backend.
+
+        :param method: HTTP method
+        :type method: str
+
+        :param url: Absolute URL
+        :type url: str
+
+        :param kwargs: Keyword arguments of ``requests.Session.request`` (``headers``, ``params``, ``json``, ``data``)
+        :type kwargs: dict
+
+        :return: Response
+        :rtype: requests.Response
+        """
+
+        parts = urlsplit(url)
+
+        params = dict(parse_qsl(parts.query))
+        extra = kwargs.get('params') or ()
+        for key, value in (extra.items() if isinstance(extra, dict) else extra):
+            if value is not None:
+                params[key] = str(value)
+
+        body = kwargs.get('json')
+        if body is None and kwargs.get('data'):
+            data = kwargs['data']
+            try:
+                body = json.loads(data) if isinstance(data, (bytes, str)) else dict(data)
+            except ValueError:
+                body = None
+
+        status, payload = self.backend.handle(
+            method.upper(), parts.path, params, body if isinstance(body, dict) else {}, kwargs.get('headers') or {},
+        )
+
+        response = requests.Response()
+        response.status_code = status
+        response.url = url
+        response.encoding = 'utf-8'
+        response.headers['Content-Type'] = 'application/json'
+        response._content = json.dumps(payload, separators=(',', ':')).encode()
+        return response
+
+    def close(self) -> None:
+        pass
+
+    def __str__(self):
+        return f'{self.__class__.__name__} | (backend={self.backend.__class__.__name__})'
+
+    def __repr__(self):
+        return self.__str__()
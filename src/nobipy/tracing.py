@@ -0,0 +1,362 @@
+import threading
+import time
+import typing as t
+from collections import deque
+from contextlib import contextmanager
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None
+
+
+__all__ = [
+    'PHASES',
+    'RequestTrace',
+    'Tracer',
+    'TracingHTTPAdapter',
+    'activate',
+    'current_trace',
+]
+
+
+# Phases in request order. 'tls' is only measured by the sync client; aiohttp reports it inside 'connect'.
+PHASES = ('rate_limit', 'pool', 'connect', 'tls', 'send', 'ttfb', 'download', 'decode', 'validation')
+
+
+class RequestTrace:
+    __slots__ = ('endpoint', 'method', 'url', 'started_at', 'phases', 'status_code', 'error', 'total', '_started')
+
+    def __init__(self, endpoint: str, method: str, url: str) -> None:
+        """
+        Timing of one request attempt, split into phases (see ``PHASES``).
+
+        :param endpoint: Endpoint name, e.g. ``'create_order'``
+        :type endpoint: str
+
+        :param method: HTTP method
+        :type method: str
+
+        :param url: URL path
+        :type url: str
+
+        :return: None
+        """
+
+        self.endpoint = endpoint
+        self.method = method
+        self.url = url
+        self.started_at = time.time()
+        self.phases: t.Dict[str, float] = {}
+        self.status_code: t.Optional[int] = None
+        self.error: t.Optional[BaseException] = None
+        self.total: t.Optional[float] = None
+        self._started = time.perf_counter()
+
+    def add(self, phase: str, seconds: float) -> None:
+        """
+        Add time to a phase.
+
+        :param phase: Phase name
+        :type phase: str
+
+        :param seconds: Duration
+        :type seconds: float
+
+        :return: None
+        """
+
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def _end(self) -> None:
+        self.total = time.perf_counter() - self._started
+
+    def to_dict(self) -> t.Dict[str, t.Any]:
+        return {
+            'endpoint': self.endpoint,
+            'method': self.method,
+            'url': self.url,
+            'started_at': self.started_at,
+            'status_code': self.status_code,
+            'error': None if self.error is None else repr(self.error),
+            'total': self.total,
+            'phases': {phase: self.phases[phase] for phase in PHASES if phase in self.phases},
+        }
+
+    def __str__(self):
+        phases = ', '.join(f'{phase}={self.phases[phase] * 1000:.1f}ms' for phase in PHASES if phase in self.phases)
+        total = 'running' if self.total is None else f'{self.total * 1000:.1f}ms'
+        return f'{self.__class__.__name__} | ({self.endpoint}, total={total}, {phases})'
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class Tracer:
+    def __init__(
+            self,
+            on_request_start: t.Callable[[RequestTrace], None] = None,
+            on_response: t.Callable[[RequestTrace], None] = None,
+            on_error: t.Callable[[RequestTrace], None] = None,
+            slow_threshold: float = 0.5, max_slow: int = 100,
+    ) -> None:
+        """
+        Per-request phase tracing.
+
+        Every attempt of a call gets a ``RequestTrace``. Hooks are called with it when the attempt
+        starts, when it returns a valid response, and when it fails (``trace.error`` is set). Hooks run
+        on the calling thread or event loop, and exceptions they raise propagate to the caller. Attempts
+        slower than ``slow_threshold`` are kept in a bounded buffer.
+
+        :param on_request_start: Called when an attempt starts (optional)
+        :type on_request_start: callable
+
+        :param on_response: Called when an attempt succeeds (optional)
+        :type on_response: callable
+
+        :param on_error: Called when an attempt fails (optional)
+        :type on_error: callable
+
+        :param slow_threshold: Seconds from which an attempt is kept as slow (optional)
+        :type slow_threshold: float
+
+        :param max_slow: Number of slow attempts kept (optional)
+        :type max_slow: int
+
+        :return: None
+        """
+
+        self.on_request_start = on_request_start
+        self.on_response = on_response
+        self.on_error = on_error
+        self.slow_threshold = slow_threshold
+
+        self.__slow: t.Deque[RequestTrace] = deque(maxlen=max_slow)
+        self.__lock = threading.Lock()
+
+    def start(self, endpoint: str, method: str, url: str) -> RequestTrace:
+        trace = RequestTrace(endpoint, method, url)
+        if self.on_request_start is not None:
+            self.on_request_start(trace)
+        return trace
+
+    def _keep(self, trace: RequestTrace) -> None:
+        if trace.total >= self.slow_threshold:
+            with self.__lock:
+                self.__slow.append(trace)
+
+    def finish(self, trace: RequestTrace) -> None:
+        trace._end()
+        self._keep(trace)
+        if self.on_response is not None:
+            self.on_response(trace)
+
+    def fail(self, trace: RequestTrace, error: BaseException) -> None:
+        trace.error = error
+        trace._end()
+        self._keep(trace)
+        if self.on_error is not None:
+            self.on_error(trace)
+
+    def slow_requests(self) -> t.List[RequestTrace]:
+        """
+        Recent attempts slower than ``slow_threshold``, oldest first.
+
+        :return: Traces
+        :rtype: list
+        """
+
+        with self.__lock:
+            return list(self.__slow)
+
+    def clear(self) -> None:
+        """
+        Drop the kept slow attempts.
+
+        :return: None
+        """
+
+        with self.__lock:
+            self.__slow.clear()
+
+    def trace_config(self) -> 'aiohttp.TraceConfig':
+        """
+        ``aiohttp`` trace config feeding the network phases of the trace passed as ``trace_request_ctx``.
+
+        :return: Trace config
+        :rtype: aiohttp.TraceConfig
+        """
+
+        return _aiohttp_trace_config()
+
+    def __str__(self):
+        return f'{self.__class__.__name__} | (slow_threshold={self.slow_threshold}, slow={len(self.__slow)})'
+
+    def __repr__(self):
+        return self.__str__()
+
+
+_local = threading.local()
+
+
+def current_trace() -> t.Optional[RequestTrace]:
+    """
+    Trace of the request being sent on the current thread, if any.
+
+    :return: Trace
+    :rtype: RequestTrace | None
+    """
+
+    return getattr(_local, 'trace', None)
+
+
+@contextmanager
+def activate(trace: t.Optional[RequestTrace]):
+    """
+    Make ``trace`` the current trace of this thread while sending a request.
+    """
+
+    previous = getattr(_local, 'trace', None)
+    _local.trace = trace
+    try:
+        yield trace
+    finally:
+        _local.trace = previous
+
+
+class _TracedConnectionMixin:
+    def _new_conn(self):
+        trace = current_trace()
+        if trace is None:
+            return super()._new_conn()
+
+        started = time.perf_counter()
+        try:
+            return super()._new_conn()
+        finally:
+            trace.add('connect', time.perf_counter() - started)
+
+    def connect(self):
+        trace = current_trace()
+        if trace is None:
+            return super().connect()
+
+        started = time.perf_counter()
+        connected = trace.phases.get('connect', 0.0)
+        try:
+            return super().connect()
+        finally:
+            # Whatever connect() spent beyond opening the socket is the TLS handshake.
+            if isinstance(self, HTTPSConnection):
+                trace.add('tls', time.perf_counter() - started - (trace.phases.get('connect', 0.0) - connected))
+
+    def request(self, *args, **kwargs):
+        trace = current_trace()
+        if trace is None:
+            return super().request(*args, **kwargs)
+
+        # Plain HTTP connections connect lazily inside request(); keep that out of 'send'.
+        started = time.perf_counter()
+        before = trace.phases.get('connect', 0.0) + trace.phases.get('tls', 0.0)
+        try:
+            return super().request(*args, **kwargs)
+        finally:
+            connecting = trace.phases.get('connect', 0.0) + trace.phases.get('tls', 0.0) - before
+            trace.add('send', time.perf_counter() - started - connecting)
+
+    def getresponse(self, *args, **kwargs):
+        trace = current_trace()
+        if trace is None:
+            return super().getresponse(*args, **kwargs)
+
+        started = time.perf_counter()
+        try:
+            return super().getresponse(*args, **kwargs)
+        finally:
+            trace.add('ttfb', time.perf_counter() - started)
+
+
+class _TracedHTTPConnection(_TracedConnectionMixin, HTTPConnection):
+    pass
+
+
+class _TracedHTTPSConnection(_TracedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _TracedPoolMixin:
+    def _get_conn(self, timeout=None):
+        trace = current_trace()
+        if trace is None:
+            return super()._get_conn(timeout)
+
+        started = time.perf_counter()
+        try:
+            return super()._get_conn(timeout)
+        finally:
+            trace.add('pool', time.perf_counter() - started)
+
+
+class _TracedHTTPConnectionPool(_TracedPoolMixin, HTTPConnectionPool):
+    ConnectionCls = _TracedHTTPConnection
+
+
+class _TracedHTTPSConnectionPool(_TracedPoolMixin, HTTPSConnectionPool):
+    ConnectionCls = _TracedHTTPSConnection
+
+
+class TracingHTTPAdapter(HTTPAdapter):
+    """
+    ``HTTPAdapter`` whose pools time connection checkout, connect, TLS, send, time-to-first-byte and
+    body download into the current thread's trace (see ``activate``). Without a current trace it
+    behaves like ``HTTPAdapter``.
+    """
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _TracedHTTPConnectionPool,
+            'https': _TracedHTTPSConnectionPool,
+        }
+
+    def send(self, request, stream=False, **kwargs):
+        response = super().send(request, stream=stream, **kwargs)
+
+        trace = current_trace()
+        if trace is not None and not stream:
+            started = time.perf_counter()
+            response.content
+            trace.add('download', time.perf_counter() - started)
+
+        return response
+
+
+def _aiohttp_trace_config() -> 'aiohttp.TraceConfig':
+    if aiohttp is None:
+        raise ImportError('aiohttp tracing requires aiohttp | Try "pip install nobipy[async]"')
+
+    # Each callback closes the phase that started at the previous event of the same request.
+    def phase(name: t.Optional[str]):
+        async def callback(session, context, params):
+            trace = context.trace_request_ctx
+            if not isinstance(trace, RequestTrace):
+                return
+            now = time.perf_counter()
+            mark = getattr(context, 'mark', None)
+            if name is not None and mark is not None:
+                trace.add(name, now - mark)
+            context.mark = now
+        return callback
+
+    config = aiohttp.TraceConfig()
+    config.on_request_start.append(phase(None))
+    config.on_connection_queued_end.append(phase('pool'))
+    config.on_connection_reuseconn.append(phase('pool'))
+    config.on_connection_create_end.append(phase('connect'))
+    config.on_request_headers_sent.append(phase('send'))
+    config.on_request_end.append(phase('ttfb'))
+    return config
@@ -0,0 +1,140 @@
+import os
+import threading
+import typing as t
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .tracing import TracingHTTPAdapter
+
+
+__all__ = [
+    'HTTPTransport',
+]
+
+
+class HTTPTransport:
+    def __init__(
+            self, pool_connections: int = 10, pool_maxsize: int = 10,
+            keep_alive: bool = True, pool_block: bool = False, tracing: bool = False,
+    ) -> None:
+        """
+        Persistent HTTP transport backed by a pooled ``requests.Session``.
+
+        The session is created lazily and re-created whenever the transport is used from a
+        process other than the one that created it, so a client survives ``os.fork()``
+        without sharing sockets with its parent.
+
+        :param pool_connections: Number of per-host connection pools to cache (optional)
+        :type pool_connections: int
+
+        :param pool_maxsize: Maximum number of connections kept per host (optional)
+        :type pool_maxsize: int
+
+        :param keep_alive: Whether to reuse connections between requests (optional)
+        :type keep_alive: bool
+
+        :param pool_block: Block instead of opening extra connections when a pool is exhausted (optional)
+        :type pool_block: bool
+
+        :param tracing: Time connection phases into the current request trace (optional)
+        :type tracing: bool
+
+        :return: None
+        """
+
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.keep_alive = keep_alive
+        self.pool_block = pool_block
+        self.tracing = tracing
+
+        self.__lock = threading.Lock()
+        self.__session: t.Optional[requests.Session] = None
+        self.__pid: t.Optional[int] = None
+
+    def _create_session(self) -> requests.Session:
+        """
+        Create a new session with mounted pooled adapters.
+
+        :return: Session
+        :rtype: requests.Session
+        """
+
+        session = requests.Session()
+
+        adapter_class = TracingHTTPAdapter if self.tracing else HTTPAdapter
+        adapter = adapter_class(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block,
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+
+        if not self.keep_alive:
+            session.headers['Connection'] = 'close'
+
+        return session
+
+    @property
+    def session(self) -> requests.Session:
+        """
+        Session owned by the current process.
+
+        :return: Session
+        :rtype: requests.Session
+        """
+
+        pid = os.getpid()
+
+        if self.__session is None or self.__pid != pid:
+            with self.__lock:
+                if self.__session is None or self.__pid != pid:
+                    # Never close a session inherited from the parent process: its sockets are
+                    # still in use there.
+                    self.__session = self._create_session()
+                    self.__pid = pid
+
+        return self.__session
+
+    def send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send a request through the pooled session.
+
+        :param method: HTTP method
+        :type method: str
+
+        :param url: Absolute URL
+        :type url: str
+
+        :param kwargs: Keyword arguments passed to ``requests.Session.request``
+        :type kwargs: dict
+
+        :return: Response
+        :rtype: requests.Response
+        """
+
+        return self.session.request(method, url, **kwargs)
+
+    def close(self) -> None:
+        """
+        Close pooled connections owned by the current process.
+
+        :return: None
+        """
+
+        with self.__lock:
+            if self.__session is not None and self.__pid == os.getpid():
+                self.__session.close()
+            self.__session = None
+            self.__pid = None
+
+    def __str__(self):
+        return (
+            f'{self.__class__.__name__} | (pool_connections={self.pool_connections}, '
+            f'pool_maxsize={self.pool_maxsize}, keep_alive={self.keep_alive})'
+        )
+
+    def __repr__(self):
+        return self.__str__()